@@ -0,0 +1,470 @@
+# Copyright (c) 2024 Snowflake Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Prints query results fetched as Arrow batches as CSV or JSON, and results in the
+columnar PARQUET and ARROW formats.
+
+For CSV and JSON, values are converted a whole column at a time, with a conversion
+chosen once per column, instead of building a dictionary per row. The printed text
+is the same as the one printed from rows, so only columns whose Arrow values match
+the values of rows are supported; other results are printed from rows.
+
+PARQUET and ARROW (IPC stream) outputs are written batch by batch to the binary
+standard output, from the Arrow batches of query results where possible and from
+rows otherwise.
+"""
+
+from __future__ import annotations
+
+import csv
+import json
+import sys
+from decimal import Decimal
+from itertools import starmap
+from json.encoder import encode_basestring_ascii
+from pathlib import Path
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+from snowflake.cli._app.printing import StreamingJSONEncoder, _csv_value
+from snowflake.cli.api.exceptions import CliError
+from snowflake.cli.api.output.formats import OutputFormat
+from snowflake.cli.api.output.types import (
+    CollectionResult,
+    CommandResult,
+    MessageResult,
+    MultipleResults,
+    ObjectResult,
+    QueryResult,
+    SnowflakeColumnType,
+    StreamResult,
+)
+from snowflake.cli.api.sanitizers import sanitize_for_terminal
+from snowflake.connector.constants import FIELD_NAME_TO_ID
+from snowflake.connector.cursor import ResultMetadata
+
+if TYPE_CHECKING:
+    from pyarrow import ChunkedArray, DataType, Schema, Table
+
+FIXED = FIELD_NAME_TO_ID["FIXED"]
+# Largest NUMBER precisions whose values Arrow batches hold exactly as integers
+# and floats, when they are not fetched as decimals.
+MAX_INTEGER_PRECISION = 18
+MAX_FLOAT_PRECISION = 15
+# Largest scale of decimals always printed in fixed-point notation, see Decimal.__str__.
+MAX_PLAIN_DECIMAL_SCALE = 6
+SUPPORTED_TYPES = frozenset(
+    FIELD_NAME_TO_ID[name]
+    for name in (
+        "FIXED",
+        "REAL",
+        "TEXT",
+        "DATE",
+        "TIMESTAMP_NTZ",
+        "VARIANT",
+        "BINARY",
+        "BOOLEAN",
+    )
+)
+
+# Number of rows of results without Arrow batches written together.
+ROWS_PER_BATCH = 10_000
+# Every terminal escape sequence removed by sanitize_for_terminal starts with it.
+ESCAPE = "\x1b"
+
+Converter = Callable[[Any], Any]
+
+
+def _supports_column(
+    column: ResultMetadata, output_format: OutputFormat, number_to_decimal: bool
+) -> bool:
+    if column.type_code not in SUPPORTED_TYPES:
+        return False
+    if column.type_code == SnowflakeColumnType.VARIANT:
+        # JSON_EXT parses VARIANT values of each row
+        return output_format != OutputFormat.JSON_EXT
+    if column.type_code == FIXED and not number_to_decimal:
+        if column.scale:
+            return (column.precision or 0) <= MAX_FLOAT_PRECISION
+        return (column.precision or 0) <= MAX_INTEGER_PRECISION
+    return True
+
+
+def arrow_batches_to_print(
+    result: CollectionResult, output_format: OutputFormat
+) -> Optional[Iterator[Table]]:
+    """Returns the Arrow batches of a query result if they can be printed in
+    ``output_format`` a column at a time, otherwise None."""
+    if not isinstance(result, QueryResult) or not result.description:
+        return None
+    number_to_decimal = result.arrow_number_to_decimal
+    if not all(
+        _supports_column(column, output_format, number_to_decimal)
+        for column in result.description
+    ):
+        return None
+    return result.arrow_batches()
+
+
+def _float_to_json(value: float) -> str:
+    if value != value:
+        return "NaN"
+    if value in (float("inf"), float("-inf")):
+        return "Infinity" if value > 0 else "-Infinity"
+    return float.__repr__(value)
+
+
+def _scaled_float_to_str(scale: int) -> Converter:
+    """Converts a float holding a NUMBER with ``scale`` to the text of the decimal
+    of rows."""
+    to_fixed_point = f"{{:.{scale}f}}".format
+    if scale <= MAX_PLAIN_DECIMAL_SCALE:
+        return to_fixed_point
+    return lambda value: str(Decimal(to_fixed_point(value)))
+
+
+def _converters(
+    data_type: DataType, column: ResultMetadata
+) -> tuple[Optional[Converter], Optional[Converter]]:
+    """
+    Returns the conversions of non-null values of an Arrow type to CSV and to JSON
+    text, the same as those of the values of rows. None means no conversion.
+    """
+    import pyarrow.types as pa_types
+
+    if pa_types.is_integer(data_type):
+        return None, int.__repr__
+    if pa_types.is_floating(data_type):
+        if column.type_code == FIXED and column.scale:
+            to_str = _scaled_float_to_str(column.scale)
+            return to_str, lambda value: '"' + to_str(value) + '"'
+        return float.__repr__, _float_to_json
+    if pa_types.is_decimal(data_type):
+        if column.type_code == FIXED and not column.scale:
+            return str, lambda value: int.__repr__(int(value))
+        return str, lambda value: '"' + str(value) + '"'
+    if pa_types.is_string(data_type) or pa_types.is_large_string(data_type):
+        return sanitize_for_terminal, encode_basestring_ascii
+    if pa_types.is_boolean(data_type):
+        return str, lambda value: "true" if value else "false"
+    if pa_types.is_date(data_type) or pa_types.is_timestamp(data_type):
+        return (
+            lambda value: value.isoformat(),
+            lambda value: '"' + value.isoformat() + '"',
+        )
+    if pa_types.is_binary(data_type) or pa_types.is_large_binary(data_type):
+        return lambda value: value.hex(), lambda value: '"' + value.hex() + '"'
+    return _csv_value, lambda value: json.dumps(value, cls=StreamingJSONEncoder)
+
+
+def _convert(
+    values: ChunkedArray, converter: Optional[Converter], null: Any
+) -> List[Any]:
+    python_values = values.to_pylist()
+    if values.null_count == 0:
+        return (
+            python_values if converter is None else list(map(converter, python_values))
+        )
+    if converter is None:
+        if null is None:
+            return python_values
+        return [null if value is None else value for value in python_values]
+    return [null if value is None else converter(value) for value in python_values]
+
+
+def _arrow_conversion(values: ChunkedArray, for_json: bool) -> Optional[ChunkedArray]:
+    """Does the conversion of a whole column with Arrow, where it gives the same text
+    as the conversions of values."""
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.types as pa_types
+
+    if pa_types.is_date32(values.type):
+        dates = values.cast(pa.string())
+        return pc.binary_join_element_wise("", dates, "", '"') if for_json else dates
+    if (
+        not for_json
+        and pa_types.is_string(values.type)
+        and not pc.any(pc.match_substring(values, ESCAPE)).as_py()
+    ):
+        # nothing to sanitize
+        return values
+    return None
+
+
+def _columns(
+    batch: Table, description: Sequence[ResultMetadata], for_json: bool
+) -> List[List[Any]]:
+    columns = []
+    for values, column in zip(batch.columns, description):
+        null = "null" if for_json else None
+        converted = _arrow_conversion(values, for_json)
+        if converted is not None:
+            columns.append(_convert(converted, None, null))
+            continue
+        to_csv, to_json = _converters(values.type, column)
+        columns.append(_convert(values, to_json if for_json else to_csv, null))
+    return columns
+
+
+def stream_arrow_batches_as_csv(result: QueryResult, batches: Iterator[Table]):
+    """Prints Arrow batches as ``_stream_collection_as_csv`` prints rows."""
+    writer = csv.writer(sys.stdout, lineterminator="\n")
+    header_written = False
+    for batch in batches:
+        if not batch.num_rows:
+            continue
+        if not header_written:
+            writer.writerow(result.column_names)
+            header_written = True
+        writer.writerows(zip(*_columns(batch, result.description, for_json=False)))
+
+
+def _json_item_template(column_names: Sequence[str], indent: int) -> str:
+    keys = [
+        encode_basestring_ascii(name).replace("{", "{{").replace("}", "}}")
+        for name in column_names
+    ]
+    if not indent:
+        return "{{" + ",".join(f"{key}:{{}}" for key in keys) + "}}"
+    item_indent = " " * indent
+    value_indent = " " * (2 * indent)
+    return (
+        item_indent
+        + "{{\n"
+        + ",\n".join(f"{value_indent}{key}: {{}}" for key in keys)
+        + "\n"
+        + item_indent
+        + "}}"
+    )
+
+
+def stream_arrow_batches_as_json(
+    result: QueryResult, batches: Iterator[Table], indent: int = 4
+):
+    """Prints Arrow batches as ``_stream_collection_as_json`` prints rows."""
+    template = _json_item_template(result.column_names, indent)
+    first = True
+    for batch in batches:
+        if not batch.num_rows:
+            continue
+        items = starmap(
+            template.format, zip(*_columns(batch, result.description, for_json=True))
+        )
+        sys.stdout.write("[\n" if first else ",\n")
+        sys.stdout.write(",\n".join(items))
+        first = False
+    sys.stdout.write("[]" if first else "\n]")
+
+
+def _arrow_value(value: Any) -> Any:
+    if isinstance(value, bytearray):
+        return bytes(value)
+    if isinstance(value, Path):
+        return value.as_posix()
+    return value
+
+
+Description = Optional[Sequence[ResultMetadata]]
+
+
+def _result_parts(
+    result: CommandResult | None,
+) -> Iterator[Tuple[Union[Table, Dict], Description]]:
+    """Yields the Arrow batches of query results, and the rows of other results,
+    with the description of the columns of query results."""
+    if isinstance(result, QueryResult):
+        batches = result.arrow_batches()
+        if batches is not None:
+            for batch in batches:
+                yield batch.rename_columns(result.column_names), result.description
+            return
+    if isinstance(result, (MultipleResults, StreamResult)):
+        for element in result.result:
+            yield from _result_parts(element)
+    elif isinstance(result, CollectionResult):
+        description = result.description if isinstance(result, QueryResult) else None
+        for row in result.result:
+            yield row, description
+    elif isinstance(result, (ObjectResult, MessageResult)) and result.result:
+        yield result.result, None
+
+
+def _result_tables(result: CommandResult | None) -> Iterator[Tuple[Table, Description]]:
+    """Yields the Arrow batches of a result, with consecutive rows with the same
+    columns gathered into tables of up to ``ROWS_PER_BATCH`` rows."""
+    import pyarrow as pa
+
+    rows: List[Dict] = []
+    rows_description: Description = None
+    for part, description in _result_parts(result):
+        if isinstance(part, pa.Table):
+            if rows:
+                yield pa.Table.from_pylist(rows), rows_description
+                rows = []
+            yield part, description
+            continue
+        row = {key: _arrow_value(value) for key, value in part.items()}
+        if rows and row.keys() != rows[0].keys():
+            yield pa.Table.from_pylist(rows), rows_description
+            rows = []
+        rows.append(row)
+        rows_description = description
+        if len(rows) >= ROWS_PER_BATCH:
+            yield pa.Table.from_pylist(rows), rows_description
+            rows = []
+    if rows:
+        yield pa.Table.from_pylist(rows), rows_description
+
+
+def _empty_schema(result: CommandResult | None) -> Schema:
+    import pyarrow as pa
+
+    names = result.column_names if isinstance(result, QueryResult) else []
+    return pa.schema([(name, pa.null()) for name in names])
+
+
+def _column_type(column: ResultMetadata) -> Optional[DataType]:
+    """Returns the Arrow type of the values of rows of a column, if it is known."""
+    import pyarrow as pa
+
+    if column.type_code == FIXED:
+        if not column.scale and (column.precision or 0) <= MAX_INTEGER_PRECISION:
+            return pa.int64()
+        return pa.decimal128(column.precision or 38, column.scale or 0)
+    return {
+        FIELD_NAME_TO_ID["REAL"]: pa.float64(),
+        FIELD_NAME_TO_ID["TEXT"]: pa.string(),
+        FIELD_NAME_TO_ID["DATE"]: pa.date32(),
+        FIELD_NAME_TO_ID["TIMESTAMP_NTZ"]: pa.timestamp("us"),
+        FIELD_NAME_TO_ID["VARIANT"]: pa.string(),
+        FIELD_NAME_TO_ID["OBJECT"]: pa.string(),
+        FIELD_NAME_TO_ID["ARRAY"]: pa.string(),
+        FIELD_NAME_TO_ID["BINARY"]: pa.binary(),
+        FIELD_NAME_TO_ID["BOOLEAN"]: pa.bool_(),
+    }.get(column.type_code)
+
+
+def _widest_type(data_type: DataType, column: Optional[ResultMetadata]) -> DataType:
+    """
+    Returns the type of a column in the written schema, which holds the values of
+    every batch, not only those of the first one: Snowflake sends integers in the
+    narrowest type fitting the values of each batch, and types of rows are inferred
+    from the values of each batch, with a null type for columns without values.
+    """
+    import pyarrow as pa
+    import pyarrow.types as pa_types
+
+    declared = _column_type(column) if column is not None else None
+    if pa_types.is_null(data_type):
+        # columns without a known type are written as text
+        return declared or pa.string()
+    if pa_types.is_integer(data_type):
+        if declared is not None and column is not None and column.type_code == FIXED:
+            return declared
+        return pa.int64()
+    if pa_types.is_decimal(data_type):
+        if declared is not None and pa_types.is_decimal(declared):
+            return declared
+        return pa.decimal128(38, data_type.scale)
+    if pa_types.is_floating(data_type):
+        return pa.float64()
+    return data_type
+
+
+def _written_schema(schema: Schema, description: Description) -> Schema:
+    import pyarrow as pa
+
+    columns: Sequence[Optional[ResultMetadata]] = description or [None] * len(schema)
+    return pa.schema(
+        [
+            field.with_type(_widest_type(field.type, column))
+            for field, column in zip(schema, columns)
+        ]
+    )
+
+
+def _conform(table: Table, schema: Schema, output_format: OutputFormat) -> Table:
+    """Casts a table to the written schema."""
+    import pyarrow as pa
+
+    if table.schema.equals(schema):
+        return table
+    if table.schema.names != schema.names:
+        raise CliError(
+            f"Results with different columns cannot be written to one "
+            f"{output_format.value} output. Execute each query separately."
+        )
+    try:
+        return table.cast(schema)
+    except (pa.ArrowInvalid, pa.ArrowNotImplementedError) as err:
+        raise CliError(
+            f"Column types of the result changed between batches, which is not "
+            f"supported by {output_format.value} output: {err}"
+        )
+
+
+def _new_writer(sink, schema: Schema, output_format: OutputFormat):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    if output_format == OutputFormat.PARQUET:
+        return pq.ParquetWriter(sink, schema)
+    return pa.ipc.new_stream(sink, schema)
+
+
+def print_columnar(result: CommandResult | None, output_format: OutputFormat):
+    """
+    Writes a result to the standard output as a Parquet file or an Arrow IPC stream,
+    one batch at a time. All results of multiple results go to the same output, so
+    they need to have the same columns.
+    """
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        raise CliError(
+            f"{output_format.value} output requires pyarrow. "
+            "Install it with `pip install pyarrow`."
+        )
+    if sys.stdout.isatty():
+        raise CliError(
+            f"{output_format.value} output is binary and cannot be written to a "
+            "terminal. Redirect the standard output to a file."
+        )
+
+    sys.stdout.flush()
+    sink = sys.stdout.buffer
+    writer, schema = None, None
+    for table, description in _result_tables(result):
+        if writer is None:
+            schema = _written_schema(table.schema, description)
+            writer = _new_writer(sink, schema, output_format)
+        writer.write_table(_conform(table, schema, output_format))
+    if writer is None:
+        writer = _new_writer(sink, _empty_schema(result), output_format)
+    # an output interrupted by an error is left without its end, so that readers
+    # do not take it for a complete one
+    writer.close()
+    sink.flush()
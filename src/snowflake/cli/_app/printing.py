@@ -19,15 +19,16 @@ import json
 import sys
 from datetime import date, datetime, time
 from decimal import Decimal
+from itertools import islice
 from json import JSONEncoder
 from pathlib import Path
 from textwrap import indent
-from typing import Any, Dict, TextIO
+from typing import Any, Dict, List, Optional, TextIO
 
 from rich import box, get_console
 from rich import print as rich_print
+from rich.cells import cell_len
 from rich.console import Console
-from rich.live import Live
 from rich.table import Table
 from snowflake.cli.api.cli_global_context import get_cli_context
 from snowflake.cli.api.output.formats import OutputFormat
@@ -111,6 +112,16 @@ def _print_json_item_with_array_indentation(item: Any, indent: int):
 
 def _stream_collection_as_json(result: CollectionResult, indent: int = 4):
     """Stream a CollectionResult as a JSON array without loading all data into memory"""
+    from snowflake.cli._app.arrow_printing import (
+        arrow_batches_to_print,
+        stream_arrow_batches_as_json,
+    )
+
+    batches = arrow_batches_to_print(result, _get_format_type())
+    if batches is not None:
+        stream_arrow_batches_as_json(result, batches, indent)  # type: ignore
+        return
+
     items = iter(result.result)
     try:
         first_item = next(items)
@@ -131,6 +142,16 @@ def _stream_collection_as_json(result: CollectionResult, indent: int = 4):
 
 def _stream_collection_as_csv(result: CollectionResult):
     """Stream a CollectionResult as CSV without loading all data into memory"""
+    from snowflake.cli._app.arrow_printing import (
+        arrow_batches_to_print,
+        stream_arrow_batches_as_csv,
+    )
+
+    batches = arrow_batches_to_print(result, OutputFormat.CSV)
+    if batches is not None:
+        stream_arrow_batches_as_csv(result, batches)  # type: ignore
+        return
+
     items = iter(result.result)
     try:
         first_item = next(items)
@@ -151,26 +172,26 @@ def _stream_collection_as_csv(result: CollectionResult):
 
 def _write_csv_row(writer: csv.DictWriter, row_data: Dict[str, Any]):
     """Write a single CSV row, handling special data types"""
-    processed_row = {}
-    for key, value in row_data.items():
-        if isinstance(value, str):
-            processed_row[key] = sanitize_for_terminal(value)
-        elif isinstance(value, (date, datetime, time)):
-            processed_row[key] = value.isoformat()
-        elif isinstance(value, Path):
-            processed_row[key] = value.as_posix()
-        elif isinstance(value, Decimal):
-            processed_row[key] = str(value)
-        elif isinstance(value, bytearray):
-            processed_row[key] = value.hex()
-        elif value is None:
-            processed_row[key] = ""
-        else:
-            processed_row[key] = str(value)
-
+    processed_row = {key: _csv_value(value) for key, value in row_data.items()}
     writer.writerow(processed_row)
 
 
+def _csv_value(value: Any) -> Optional[str]:
+    if isinstance(value, str):
+        return sanitize_for_terminal(value)
+    if isinstance(value, (date, datetime, time)):
+        return value.isoformat()
+    if isinstance(value, Path):
+        return value.as_posix()
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, bytearray):
+        return value.hex()
+    if value is None:
+        return ""
+    return str(value)
+
+
 def _get_format_type() -> OutputFormat:
     output_format = get_cli_context().output_format
     if output_format:
@@ -199,25 +220,92 @@ def _render_console_for_table() -> Console:
     return Console(width=width, soft_wrap=True, markup=False)
 
 
+# Rows of a table are rendered in windows of this size, so printing a large
+# result takes a fixed amount of memory and rows appear as they are fetched.
+TABLE_WINDOW_ROWS = 1000
+
+
 def _print_multiple_table_results(obj: CollectionResult):
     items = obj.result
-    try:
-        first_item = next(items)
-    except StopIteration:
+    window = list(islice(items, TABLE_WINDOW_ROWS + 1))
+    if not window:
         rich_print(NO_ITEMS_FOUND, end="\n\n")
         return
-    table = _get_table()
-    for column in first_item.keys():
-        table.add_column(column, overflow="fold")
+    columns = list(window[0].keys())
+    rows = _table_rows(window)
     console = _render_console_for_table()
-    with Live(table, console=console, refresh_per_second=4):
-        table.add_row(*[__to_str(i) for i in first_item.values()])
-        for item in items:
-            table.add_row(*[__to_str(i) for i in item.values()])
+    # Column widths of a larger result are fixed from its first window so that
+    # all windows line up as one table.
+    widths: Optional[List[int]] = (
+        _column_widths(columns, rows) if len(rows) > TABLE_WINDOW_ROWS else None
+    )
+    show_header = True
+    bottom_border = ""
+    while rows:
+        # Only a larger result has more windows, and fixed widths.
+        if widths is not None and not show_header:
+            wider = list(map(max, widths, _column_widths(columns, rows)))
+            if wider != widths and _table_width(wider) <= console.width:
+                # Start a new table rather than fold values that outgrew their
+                # columns; values that would not fit the console fold anyway.
+                console.file.write(bottom_border)
+                widths, show_header = wider, True
+        lines = _render_table_lines(
+            console, _get_window_table(columns, rows, widths, show_header)
+        )
+        # Each window continues the table below the previous one, so only the
+        # first one keeps its top border and only the last one its bottom one.
+        console.file.write("".join(lines[0 if show_header else 1 : -1]))
+        console.file.flush()
+        bottom_border = lines[-1]
+        show_header = False
+        rows = _table_rows(islice(items, TABLE_WINDOW_ROWS))
+    console.file.write(bottom_border.rstrip("\n"))
     # Add separator between tables
     rich_print(flush=True)
 
 
+def _table_rows(items) -> List[List[str]]:
+    return [[__to_str(value) for value in item.values()] for item in items]
+
+
+def _column_widths(columns: List[str], rows: List[List[str]]) -> List[int]:
+    widths = [cell_len(column) for column in columns]
+    for row in rows:
+        for index, value in enumerate(row):
+            for line in value.splitlines():
+                widths[index] = max(widths[index], cell_len(line))
+    return widths
+
+
+def _table_width(widths: List[int]) -> int:
+    # each column is padded by one space on both sides and separated by "|"
+    return sum(widths) + 3 * len(widths) + 1
+
+
+def _get_window_table(
+    columns: List[str],
+    rows: List[List[str]],
+    widths: List[int] | None = None,
+    show_header: bool = True,
+) -> Table:
+    table = _get_table()
+    table.show_header = show_header
+    for index, column in enumerate(columns):
+        table.add_column(
+            column, overflow="fold", width=widths[index] if widths else None
+        )
+    for row in rows:
+        table.add_row(*row)
+    return table
+
+
+def _render_table_lines(console: Console, table: Table) -> List[str]:
+    with console.capture() as capture:
+        console.print(table)
+    return capture.get().splitlines(keepends=True)
+
+
 def __to_str(val):
     if isinstance(val, bytearray):
         return val.hex()
@@ -232,6 +320,10 @@ def print_structured(
     result: CommandResult, output_format: OutputFormat = OutputFormat.JSON
 ):
     """Handles outputs like json, csv and other structured and parsable formats with streaming."""
+    if output_format == OutputFormat.NDJSON:
+        _print_ndjson(result)
+        return
+
     printed_end_line = False
 
     if isinstance(result, MultipleResults):
@@ -274,6 +366,35 @@ def _print_json_result_streaming(result: CommandResult):
         json.dump(result, sys.stdout, cls=StreamingJSONEncoder, indent=4)
 
 
+def _print_ndjson(result: CommandResult | None, **fields):
+    """Print every row or object of a result as a JSON object on its own line.
+
+    Rows of a multi-statement result also carry the index of their statement in
+    a ``statement_index`` field, unless they have a column of that name.
+    """
+    if isinstance(result, MultipleResults):
+        for index, command_result in enumerate(result.result):
+            _print_ndjson(command_result, statement_index=index)
+    elif isinstance(result, StreamResult):
+        for command_result in result.result:
+            _print_ndjson(command_result, **fields)
+    elif isinstance(result, CollectionResult):
+        for row in result.result:
+            _print_ndjson_line({**fields, **row})
+    elif isinstance(result, (ObjectResult, MessageResult)) and isinstance(
+        result.result, dict
+    ):
+        _print_ndjson_line({**fields, **result.result})
+    else:
+        _print_ndjson_line(result)
+
+
+def _print_ndjson_line(item: Any):
+    json.dump(item, sys.stdout, cls=StreamingJSONEncoder)
+    # Flush every line, so that a consumer down the pipe can process it at once
+    print(flush=True)
+
+
 def _print_object_result_as_csv(result: ObjectResult):
     """Print an ObjectResult as a single-row CSV.
 
@@ -365,6 +486,10 @@ def print_result(cmd_result: CommandResult, output_format: OutputFormat | None =
     match cmd_result:
         case EmptyResult():
             return
+        case _ if output_format.is_columnar:
+            from snowflake.cli._app.arrow_printing import print_columnar
+
+            print_columnar(cmd_result, output_format)
         case _ if is_structured_format(output_format):
             print_structured(cmd_result, output_format)
         case MultipleResults() | StreamResult():
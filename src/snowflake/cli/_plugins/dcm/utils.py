@@ -14,6 +14,7 @@
 import json
 import logging
 import os
+from collections import deque
 from contextlib import contextmanager
 from functools import wraps
 from pathlib import Path
@@ -169,9 +170,13 @@ def _collect_output(
             effective_output_path.absolute_path(),
             output_dir.path.resolve(),
         )
-        stage_manager.get_recursive(
-            stage_path=effective_output_path.absolute_path(),
-            dest_path=output_dir.path,
+        # the cursors of the downloaded directories are not needed
+        deque(
+            stage_manager.get_recursive(
+                stage_path=effective_output_path.absolute_path(),
+                dest_path=output_dir.path,
+            ),
+            maxlen=0,
         )
 
     try:
@@ -0,0 +1,475 @@
+# Copyright (c) 2024 Snowflake Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Runs independent statements of a script concurrently.
+
+Each statement is analyzed for the objects it changes (writes) and the names it
+mentions (reads). A statement starts only after every earlier statement it conflicts
+with finished, so statements touching the same objects keep their order. Queries and
+DML can also read objects they don't name, through views, functions and procedures,
+so they wait for all earlier changes, and changes wait for all earlier queries and
+DML. Statements whose effects cannot be told from their text act as barriers:
+everything before them finishes first, and they run alone.
+
+So that a failure leaves the changes of a serial execution, only queries, which
+change nothing, run ahead of earlier statements that have not succeeded yet; they
+are cancelled when an earlier statement fails. In effect, consecutive queries run
+concurrently, and other statements one at a time.
+"""
+
+from __future__ import annotations
+
+import logging
+import re
+import time
+from dataclasses import dataclass
+from typing import (
+    Dict,
+    FrozenSet,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+)
+
+from snowflake.connector import SnowflakeConnection
+from snowflake.connector.cursor import SnowflakeCursor
+from snowflake.connector.errors import ProgrammingError
+
+log = logging.getLogger(__name__)
+
+# Maximum number of statements running at the same time.
+AUTO_PARALLEL_MAX_RUNNING = 8
+# Maximum number of statements read after the first one whose result is not shown.
+AUTO_PARALLEL_WINDOW = 1000
+# Bounds of the interval between checks of the running statements, in seconds.
+MIN_POLL_INTERVAL = 0.05
+MAX_POLL_INTERVAL = 1.0
+
+# Object types whose statements are ordered by name. Databases and schemas are not
+# included: creating or dropping them changes the current database or schema.
+OBJECT_TYPES = tuple(
+    tuple(object_type.split())
+    for object_type in (
+        "ALERT",
+        "API INTEGRATION",
+        "APPLICATION",
+        "APPLICATION PACKAGE",
+        "COMPUTE POOL",
+        "DATABASE ROLE",
+        "DYNAMIC TABLE",
+        "EVENT TABLE",
+        "EXTERNAL ACCESS INTEGRATION",
+        "EXTERNAL FUNCTION",
+        "EXTERNAL TABLE",
+        "FILE FORMAT",
+        "FUNCTION",
+        "GIT REPOSITORY",
+        "HYBRID TABLE",
+        "ICEBERG TABLE",
+        "IMAGE REPOSITORY",
+        "MASKING POLICY",
+        "MATERIALIZED VIEW",
+        "NETWORK RULE",
+        "NOTIFICATION INTEGRATION",
+        "PIPE",
+        "PROCEDURE",
+        "ROLE",
+        "ROW ACCESS POLICY",
+        "SECRET",
+        "SECURITY INTEGRATION",
+        "SEQUENCE",
+        "SERVICE",
+        "STAGE",
+        "STORAGE INTEGRATION",
+        "STREAM",
+        "STREAMLIT",
+        "TABLE",
+        "TAG",
+        "TASK",
+        "USER",
+        "VIEW",
+        "WAREHOUSE",
+    )
+)
+CREATE_MODIFIERS = frozenset(
+    (
+        "GLOBAL",
+        "LOCAL",
+        "RECURSIVE",
+        "SECURE",
+        "TEMP",
+        "TEMPORARY",
+        "TRANSIENT",
+        "VOLATILE",
+    )
+)
+# First words of queries and DML, which may read objects they don't name.
+QUERY_WORDS = frozenset(
+    ("COPY", "DELETE", "INSERT", "MERGE", "SELECT", "UPDATE", "WITH")
+)
+# Words whose statements depend on other statements in ways their names don't show.
+BARRIER_WORDS = frozenset(
+    (
+        "ACCOUNT_USAGE",
+        "INFORMATION_SCHEMA",
+        "LAST_QUERY_ID",
+        "NEXTVAL",
+        "OWNERSHIP",
+        "RENAME",
+        "RESULT_SCAN",
+        "SWAP",
+    )
+)
+
+_TOKEN_RE = re.compile(
+    r"""
+      (?P<comment> --[^\n]* | //[^\n]* | /\*.*?(?:\*/|$) )
+    | (?P<string> '(?:[^'\\]|\\.|'')*'? | \$\$.*?(?:\$\$|$) )
+    | (?P<quoted> "(?:[^"]|"")*"? )
+    | (?P<word> [A-Za-z_][\w$]* )
+    | (?P<other> \S )
+    """,
+    re.VERBOSE | re.DOTALL,
+)
+_WORD_RE = re.compile(r"[A-Za-z_][\w$]*")
+
+Token = Tuple[str, str]
+
+
+@dataclass(frozen=True)
+class StatementAccess:
+    """Names of the objects a statement changes and of all the names it mentions.
+    ``indirect`` statements may also read objects they don't mention."""
+
+    writes: FrozenSet[str] = frozenset()
+    reads: FrozenSet[str] = frozenset()
+    indirect: bool = False
+    barrier: bool = False
+
+
+BARRIER = StatementAccess(barrier=True)
+
+
+def _tokenize(statement: str) -> Tuple[List[Token], Set[str]]:
+    """Returns the tokens of a statement, without comments, and all the names in it,
+    including words inside strings and comments."""
+    tokens: List[Token] = []
+    names: Set[str] = set()
+    for match in _TOKEN_RE.finditer(statement):
+        kind, text = match.lastgroup or "other", match.group()
+        if kind in ("comment", "string"):
+            names.update(word.upper() for word in _WORD_RE.findall(text))
+            if kind == "string":
+                tokens.append((kind, text))
+            continue
+        if kind == "word":
+            names.add(text.upper())
+        elif kind == "quoted":
+            names.add(_unquote(text))
+        tokens.append((kind, text))
+    return tokens, names
+
+
+def _unquote(quoted: str) -> str:
+    return quoted[1:-1].replace('""', '"') if quoted.endswith('"') else quoted[1:]
+
+
+def _word(tokens: Sequence[Token], i: int) -> Optional[str]:
+    if i < len(tokens) and tokens[i][0] == "word":
+        return tokens[i][1].upper()
+    return None
+
+
+def _skip_words(tokens: Sequence[Token], i: int, *words: str) -> int:
+    """Returns the position after ``words`` if they are at ``i``, otherwise ``i``."""
+    for offset, word in enumerate(words):
+        if _word(tokens, i + offset) != word:
+            return i
+    return i + len(words)
+
+
+def _object_type_end(tokens: Sequence[Token], i: int) -> Optional[int]:
+    """Returns the position after a known object type at ``i``."""
+    for object_type in sorted(OBJECT_TYPES, key=len, reverse=True):
+        if all(_word(tokens, i + k) == w for k, w in enumerate(object_type)):
+            return i + len(object_type)
+    return None
+
+
+def _object_name(tokens: Sequence[Token], i: int) -> Optional[str]:
+    """Returns the last part of the (qualified) object name at ``i``."""
+    name = None
+    while i < len(tokens) and tokens[i][0] in ("word", "quoted"):
+        kind, text = tokens[i]
+        if kind == "word" and text.upper() == "IDENTIFIER":
+            return None
+        name = text.upper() if kind == "word" else _unquote(text)
+        if i + 1 < len(tokens) and tokens[i + 1][1] == ".":
+            i += 2
+        else:
+            break
+    return name
+
+
+def _object_statement_target(tokens: Sequence[Token], i: int) -> Optional[str]:
+    """Parses ``<object type> [IF [NOT] EXISTS] <name>`` at ``i``."""
+    end = _object_type_end(tokens, i)
+    if end is None:
+        return None
+    i = _skip_words(tokens, end, "IF", "NOT", "EXISTS")
+    i = _skip_words(tokens, i, "IF", "EXISTS")
+    return _object_name(tokens, i)
+
+
+def _grant_target(tokens: Sequence[Token], grantee_word: str) -> Optional[str]:
+    """Returns the last part of the name just before ``TO`` (or ``FROM``), which is
+    the object of ``ON ...``, the schema or database of ``ON ALL ... IN ...``, or the
+    granted role."""
+    for i, (kind, text) in enumerate(tokens):
+        if kind == "word" and text.upper() == grantee_word:
+            if i > 1 and tokens[i - 1][0] in ("word", "quoted"):
+                kind, text = tokens[i - 1]
+                return text.upper() if kind == "word" else _unquote(text)
+            return None
+    return None
+
+
+def _statement_target(tokens: Sequence[Token]) -> Tuple[bool, Optional[str]]:
+    """
+    Returns whether the statement can run concurrently with independent ones, and
+    the object it changes, if any.
+    """
+    first = _word(tokens, 0)
+    if first in ("SELECT", "WITH"):
+        return True, None
+    if first in ("GRANT", "REVOKE"):
+        target = _grant_target(tokens, "TO" if first == "GRANT" else "FROM")
+    elif first == "CREATE":
+        i = _skip_words(tokens, 1, "OR", "REPLACE")
+        i = _skip_words(tokens, i, "OR", "ALTER")
+        while _word(tokens, i) in CREATE_MODIFIERS:
+            i += 1
+        target = _object_statement_target(tokens, i)
+    elif first in ("ALTER", "DROP", "UNDROP"):
+        target = _object_statement_target(tokens, 1)
+    elif first == "COMMENT":
+        i = _skip_words(tokens, 1, "IF", "EXISTS")
+        i = _skip_words(tokens, i, "ON")
+        target = _object_statement_target(tokens, i) if i > 1 else None
+    elif first == "INSERT":
+        i = _skip_words(tokens, 1, "OVERWRITE")
+        i = _skip_words(tokens, i, "INTO")
+        target = _object_name(tokens, i) if _word(tokens, i - 1) == "INTO" else None
+    elif first in ("MERGE", "COPY"):
+        i = _skip_words(tokens, 1, "INTO")
+        target = _object_name(tokens, i) if i > 1 else None
+    elif first == "DELETE":
+        i = _skip_words(tokens, 1, "FROM")
+        target = _object_name(tokens, i) if i > 1 else None
+    elif first == "UPDATE":
+        target = _object_name(tokens, 1)
+    elif first == "TRUNCATE":
+        i = _skip_words(tokens, 1, "TABLE")
+        i = _skip_words(tokens, i, "IF", "EXISTS")
+        target = _object_name(tokens, i)
+    else:
+        target = None
+    return target is not None, target
+
+
+def analyze_statement(statement: str) -> StatementAccess:
+    """
+    Returns the objects a statement changes and the names it mentions. Statements
+    that cannot be analyzed, or that change or depend on the session, are barriers.
+    """
+    tokens, names = _tokenize(statement)
+    if names & BARRIER_WORDS or any(name.startswith("SYSTEM$") for name in names):
+        return BARRIER
+    independent, target = _statement_target(tokens)
+    if not independent:
+        return BARRIER
+    return StatementAccess(
+        writes=frozenset((target,)) if target is not None else frozenset(),
+        reads=frozenset(names),
+        # also DDL with a query, e.g. CREATE VIEW ... AS SELECT
+        indirect=bool(names & QUERY_WORDS),
+    )
+
+
+class _Dependencies:
+    """
+    Tells, for each statement added, the earlier statements it must wait for: the
+    last earlier statement changing a name it mentions, and for the object it
+    changes, also the statements mentioning it since then. Indirect statements wait
+    for the last statement changing each object, and statements changing an object
+    wait for all earlier indirect ones.
+    """
+
+    def __init__(self) -> None:
+        self._last_writer: Dict[str, int] = {}
+        self._readers: Dict[str, List[int]] = {}
+        self._indirect_readers: List[int] = []
+        self._count = 0
+
+    def add(self, access: StatementAccess) -> Set[int]:
+        i = self._count
+        self._count += 1
+        deps: Set[int] = set()
+        if access.indirect:
+            deps.update(self._last_writer.values())
+        for name in access.reads | access.writes:
+            if name in self._last_writer:
+                deps.add(self._last_writer[name])
+        if access.writes:
+            deps.update(self._indirect_readers)
+        for name in access.writes:
+            deps.update(self._readers.get(name, ()))
+        if access.indirect:
+            self._indirect_readers.append(i)
+        for name in access.reads:
+            self._readers.setdefault(name, []).append(i)
+        for name in access.writes:
+            self._last_writer[name] = i
+            self._readers[name] = []
+        deps.discard(i)
+        return deps
+
+
+def dependencies(accesses: Sequence[StatementAccess]) -> List[Set[int]]:
+    """
+    Returns, for each statement, the earlier statements it must wait for.
+    """
+    tracker = _Dependencies()
+    return [tracker.add(access) for access in accesses]
+
+
+def _query_id(cursor: SnowflakeCursor) -> str:
+    # set by execute_async
+    assert cursor.sfqid is not None  # satisfy mypy
+    return cursor.sfqid
+
+
+def _cancel(cursor: SnowflakeCursor) -> None:
+    sfqid = _query_id(cursor)
+    log.debug("Cancelling statement %s", sfqid)
+    try:
+        cursor.abort_query(sfqid)
+    except Exception:
+        log.debug("Could not cancel statement %s", sfqid, exc_info=True)
+
+
+def execute_concurrently(
+    connection: SnowflakeConnection,
+    statements: Iterable[Tuple[str, StatementAccess]],
+    max_running: int = AUTO_PARALLEL_MAX_RUNNING,
+    window: int = AUTO_PARALLEL_WINDOW,
+) -> Iterator[Tuple[str, SnowflakeCursor]]:
+    """
+    Executes statements asynchronously, each as soon as the statements it depends on
+    finished, and yields them with their cursors in the order of ``statements``.
+    Statements are read as they are scheduled, up to ``window`` statements after
+    the first one not yielded yet.
+
+    Only queries, which change nothing, start before all earlier statements
+    succeeded; other statements wait for them. If a statement fails, no later
+    statement is started and the running later ones are cancelled; the earlier ones
+    still run, and the error is raised after their results, so the changes made are
+    those of a serial execution. Running statements are also cancelled when the
+    results are abandoned.
+    """
+    source = iter(statements)
+    tracker = _Dependencies()
+    # statements read and not started yet, in order, with their dependencies
+    waiting: Dict[int, Tuple[str, StatementAccess, Set[int]]] = {}
+    running: Dict[int, Tuple[str, SnowflakeCursor]] = {}
+    finished: Dict[int, Tuple[str, SnowflakeCursor]] = {}
+    errors: Dict[int, SnowflakeCursor] = {}
+    failed: Optional[int] = None
+    read = 0
+    exhausted = False
+    next_result = 0
+    poll_interval = MIN_POLL_INTERVAL
+
+    def succeeded(i: int) -> bool:
+        # results are yielded as soon as all earlier ones are
+        return i < next_result or i in finished
+
+    try:
+        while True:
+            while not exhausted and failed is None and read - next_result < window:
+                item = next(source, None)
+                if item is None:
+                    exhausted = True
+                    break
+                statement, access = item
+                waiting[read] = (statement, access, tracker.add(access))
+                read += 1
+            if exhausted and next_result == read:
+                return
+
+            for i, (statement, access, deps) in list(waiting.items()):
+                if len(running) >= max_running or (failed is not None and i > failed):
+                    break
+                if access.writes and i != next_result:
+                    # changes are not made before all earlier statements succeeded
+                    continue
+                if all(succeeded(dep) for dep in deps):
+                    del waiting[i]
+                    cursor = connection.cursor()
+                    cursor.execute_async(statement)
+                    log.debug("Started statement %d as %s", i, cursor.sfqid)
+                    running[i] = (statement, cursor)
+
+            progressed = False
+            for i, (statement, cursor) in list(running.items()):
+                status = connection.get_query_status(_query_id(cursor))
+                if connection.is_still_running(status):
+                    continue
+                progressed = True
+                del running[i]
+                if connection.is_an_error(status):
+                    errors[i] = cursor
+                    failed = i if failed is None else min(failed, i)
+                else:
+                    finished[i] = (statement, cursor)
+
+            if failed is not None:
+                for i in [i for i in running if i > failed]:
+                    _cancel(running.pop(i)[1])
+
+            while next_result in finished:
+                statement, cursor = finished.pop(next_result)
+                cursor.get_results_from_sfqid(_query_id(cursor))
+                next_result += 1
+                progressed = True
+                yield statement, cursor
+
+            if failed is not None and next_result == failed:
+                sfqid = _query_id(errors[failed])
+                connection.get_query_status_throw_if_error(sfqid)
+                raise ProgrammingError(f"Statement {sfqid} failed.")
+
+            if progressed:
+                poll_interval = MIN_POLL_INTERVAL
+            else:
+                time.sleep(poll_interval)
+                poll_interval = min(poll_interval * 2, MAX_POLL_INTERVAL)
+    finally:
+        for _, cursor in running.values():
+            _cancel(cursor)
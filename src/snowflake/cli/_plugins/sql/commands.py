@@ -144,6 +144,32 @@ def execute_sql(
         ),
         is_flag=True,
     ),
+    parallel_files: int = typer.Option(
+        1,
+        "--parallel-files",
+        min=1,
+        help=(
+            "Number of files executed at the same time, each on its own connection. "
+            "Statements of a file run in order and an error stops only that file. "
+            "Results are shown grouped by file, in the order of the files. Files "
+            "cannot contain REPL commands."
+        ),
+    ),
+    auto_parallel: bool = typer.Option(
+        False,
+        "--auto-parallel",
+        help=(
+            "Executes independent statements at the same time. Statements that "
+            "reference objects changed by earlier statements wait for them. Queries "
+            "and DML, which can read objects through views and functions, wait for "
+            "all earlier changes, and changes wait for all earlier statements to "
+            "succeed, so that a failure leaves the changes of a serial execution. "
+            "Queries started ahead of a failed statement are cancelled. Statements "
+            "that use or change the session (for example USE, SET, ALTER SESSION or "
+            "transactions) run alone."
+        ),
+        is_flag=True,
+    ),
     no_prompt_exit_repl: Optional[bool] = typer.Option(
         None,
         "--no-prompt-exit-repl",
@@ -203,6 +229,35 @@ def execute_sql(
 
     manager = SqlManager()
 
+    if auto_parallel:
+        if single_transaction:
+            raise CliArgumentError(
+                "--auto-parallel cannot be used with --single-transaction."
+            )
+        if parallel_files > 1:
+            raise CliArgumentError(
+                "--auto-parallel cannot be used with --parallel-files."
+            )
+
+    if parallel_files > 1:
+        if not files:
+            raise CliArgumentError("--parallel-files can only be used with --filename.")
+        if single_transaction:
+            raise CliArgumentError(
+                "--parallel-files cannot be used with --single-transaction."
+            )
+        if len(files) > 1:
+            return MultipleResults(
+                manager.execute_files_in_parallel(
+                    files,
+                    parallel_files,
+                    data=data,
+                    retain_comments=retain_comments,
+                    template_syntax_config=template_syntax_config,
+                    local_only=local_only,
+                )
+            )
+
     expected_results_cnt, cursors = manager.execute(
         query,
         files,
@@ -212,6 +267,7 @@ def execute_sql(
         single_transaction=single_transaction,
         template_syntax_config=template_syntax_config,
         local_only=local_only,
+        auto_parallel=auto_parallel,
     )
     if expected_results_cnt == 0:
         # case expected if input only scheduled async queries
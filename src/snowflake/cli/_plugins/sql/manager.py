@@ -14,37 +14,237 @@
 
 from __future__ import annotations
 
+import itertools
 import logging
+import queue
 import sys
-from functools import partial
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextvars import copy_context
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Dict, Iterable, List, Tuple
+from typing import Dict, Iterable, Iterator, List, Tuple, Union
 
 from snowflake.cli._app.printing import print_result
+from snowflake.cli._plugins.sql.auto_parallel import (
+    StatementAccess,
+    analyze_statement,
+    execute_concurrently,
+)
 from snowflake.cli._plugins.sql.snowsql_templating import transpile_snowsql_templates
 from snowflake.cli._plugins.sql.statement_reader import (
     CompiledStatement,
+    CompiledStatements,
+    RecursiveStatementReader,
+    SqlTransformFunc,
     _protect_sql_comments,
-    compile_statements,
+    check_statements,
     files_reader,
+    iter_compiled_statements,
     query_reader,
 )
 from snowflake.cli.api.cli_global_context import get_cli_context
+from snowflake.cli.api.config import get_config_value, get_env_value
+from snowflake.cli.api.connections import ConnectionContext
 from snowflake.cli.api.console import cli_console
 from snowflake.cli.api.exceptions import CliArgumentError, CliSqlError
-from snowflake.cli.api.output.types import CollectionResult
+from snowflake.cli.api.output.types import (
+    CollectionResult,
+    CommandResult,
+    QueryResult,
+)
 from snowflake.cli.api.rendering.sql_templates import (
+    SqlTemplateRenderer,
     SQLTemplateSyntaxConfig,
-    snowflake_sql_jinja_render,
 )
 from snowflake.cli.api.secure_path import SecurePath
 from snowflake.cli.api.sql_execution import SqlExecutionMixin, VerboseCursor
+from snowflake.connector import SnowflakeConnection
 from snowflake.connector.cursor import SnowflakeCursor
 
 ExpectedResultsCount = int
 
 logger = logging.getLogger(__name__)
 
+# Number of statements compiled ahead of the one being executed.
+READ_AHEAD_STATEMENTS = 32
+
+_END_OF_STATEMENTS = CompiledStatement()
+
+# Authenticators that ask the user for every connection.
+INTERACTIVE_AUTHENTICATORS = frozenset(
+    {"EXTERNALBROWSER", "USERNAME_PASSWORD_MFA", "OAUTH_AUTHORIZATION_CODE"}
+)
+
+
+def _template_cache_dir() -> Path | None:
+    """Directory of the on-disk cache of compiled SQL templates, if configured."""
+    cache_dir = get_config_value("cli", key="sql_template_cache_dir", default=None)
+    if not cache_dir:
+        return None
+    cache_dir = SecurePath(Path(cache_dir).expanduser())
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    return cache_dir.path
+
+
+def _read_ahead(source: CompiledStatements, size: int) -> CompiledStatements:
+    """Yields the statements of source, compiled by a background thread up to size
+    statements ahead, so the next statements are read and parsed while one executes.
+    """
+    compiled: queue.Queue = queue.Queue(maxsize=size)
+    stopped = threading.Event()
+
+    def put(item) -> bool:
+        # gives up once the consumer is gone, instead of blocking on a full queue
+        while not stopped.is_set():
+            try:
+                compiled.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def produce():
+        try:
+            for statement in source:
+                if not put((statement, None)):
+                    return
+            put((_END_OF_STATEMENTS, None))
+        except BaseException as err:
+            put((_END_OF_STATEMENTS, err))
+        finally:
+            source.close()
+
+    # The CLI context (e.g. template variables) lives in ContextVars, so the
+    # thread runs in a copy of the calling thread's context.
+    thread = threading.Thread(target=copy_context().run, args=(produce,), daemon=True)
+    thread.start()
+    try:
+        while True:
+            statement, err = compiled.get()
+            if statement is _END_OF_STATEMENTS:
+                if err is not None:
+                    raise err
+                return
+            yield statement
+    finally:
+        stopped.set()
+        thread.join()
+
+
+def _statement_transforms(
+    template_syntax_config: SQLTemplateSyntaxConfig, data: Dict | None
+) -> Tuple[List[SqlTransformFunc], SqlTransformFunc | None]:
+    """Returns the per-statement operators and the pre-render function of the input."""
+    stmt_operators: List[SqlTransformFunc] = []
+
+    # Jinja block rendering ({% if %}, {% for %}, etc.) must happen on the
+    # whole content BEFORE split_statements, because split_statements splits
+    # on `;` which breaks Jinja blocks containing SQL statements.
+    # When Jinja is enabled, ALL rendering (legacy transpile, standard/<% %>
+    # variables, Jinja blocks) is unified into a single pre-render pass so
+    # that the correct order (standard → Jinja) is preserved and sourced
+    # files (!source) receive the same treatment.
+    # See: https://github.com/snowflakedb/snowflake-cli/issues/2650
+    bytecode_cache_dir = _template_cache_dir()
+    jinja_pre_render = None
+    if template_syntax_config.enable_jinja_syntax:
+        renderer = SqlTemplateRenderer(
+            SQLTemplateSyntaxConfig(
+                enable_legacy_syntax=template_syntax_config.enable_legacy_syntax,
+                enable_standard_syntax=template_syntax_config.enable_standard_syntax,
+                enable_jinja_syntax=True,
+            ),
+            data=data,
+            bytecode_cache_dir=bytecode_cache_dir,
+        )
+
+        def _jinja_pre_render(content: str) -> str:
+            # Replace comments with inert placeholders before Jinja runs
+            # so that template-like syntax inside comments (e.g. -- {{ v }})
+            # is never evaluated.  Placeholders are restored afterwards;
+            # split_statements(remove_comments=…) then handles the actual
+            # comment stripping or retention decision.
+            content, _saved = _protect_sql_comments(content)
+            if template_syntax_config.enable_legacy_syntax:
+                content = transpile_snowsql_templates(content)
+            content = renderer.render(content)
+            return _saved.restore(content)
+
+        jinja_pre_render = _jinja_pre_render
+        # No per-statement operators needed — everything is done in pre-render.
+    else:
+        if template_syntax_config.enable_legacy_syntax:
+            stmt_operators.append(transpile_snowsql_templates)
+
+        per_stmt_config = SQLTemplateSyntaxConfig(
+            enable_legacy_syntax=template_syntax_config.enable_legacy_syntax,
+            enable_standard_syntax=template_syntax_config.enable_standard_syntax,
+            enable_jinja_syntax=False,
+        )
+        # one renderer for all statements, so that each distinct statement
+        # is compiled only once
+        stmt_operators.append(
+            SqlTemplateRenderer(
+                per_stmt_config,
+                data=data,
+                bytecode_cache_dir=bytecode_cache_dir,
+            ).render
+        )
+    return stmt_operators, jinja_pre_render
+
+
+def _interactive_authentication(connection_context: ConnectionContext) -> str | None:
+    """Returns the interactive authentication of a connection, if it uses one."""
+    if connection_context.mfa_passcode:
+        return "an MFA passcode"
+    authenticator = (
+        connection_context.clone().update_from_config().authenticator
+        or get_env_value(key="authenticator")
+        or ""
+    )
+    if authenticator.upper() in INTERACTIVE_AUTHENTICATORS:
+        return f"the {authenticator} authenticator"
+    return None
+
+
+def _serialized(
+    stmt_operators: List[SqlTransformFunc], pre_render: SqlTransformFunc | None
+) -> Tuple[List[SqlTransformFunc], SqlTransformFunc | None]:
+    """Makes transforms shared by threads run one at a time, as the template
+    renderers they use are not thread-safe."""
+    lock = threading.Lock()
+
+    def serialized(transform: SqlTransformFunc) -> SqlTransformFunc:
+        def run(content: str) -> str:
+            with lock:
+                return transform(content)
+
+        return run
+
+    return [serialized(operator) for operator in stmt_operators], (
+        serialized(pre_render) if pre_render is not None else None
+    )
+
+
+@dataclass
+class _FileExecution:
+    """Outputs of a file executed on its own connection, in the order of the file."""
+
+    path: Path
+    connection: SnowflakeConnection | None = None
+    outputs: List[Union[SnowflakeCursor, CommandResult]] = field(default_factory=list)
+    error: str | None = None
+
+    def close(self) -> None:
+        if self.connection is not None:
+            self.connection.close()
+
+
+def _close_file_execution(future: Future) -> None:
+    if not future.cancelled() and future.exception() is None:
+        future.result().close()
+
 
 class SqlManager(SqlExecutionMixin):
     def execute(
@@ -57,131 +257,304 @@ class SqlManager(SqlExecutionMixin):
         single_transaction: bool = False,
         template_syntax_config: SQLTemplateSyntaxConfig = SQLTemplateSyntaxConfig(),
         local_only: bool = False,
+        auto_parallel: bool = False,
     ) -> Tuple[ExpectedResultsCount, Iterable[SnowflakeCursor]]:
         """Reads, transforms and execute statements from input.
 
         Only one input can be consumed at a time.
-        When no compilation errors are detected, the sequence on queries
-        in executed and returned as tuple.
+        The whole input is compiled once to check it and count the expected
+        results; any compilation error stops the execution before any statement
+        runs, and all errors of the input are reported. Statements are then read,
+        compiled and executed as a stream, so the input is never held in memory as
+        a whole.
+        With ``auto_parallel``, independent statements are executed concurrently;
+        see ``auto_parallel.py``.
 
         Throws an exception ff multiple inputs are provided.
         """
         query = sys.stdin.read() if std_in else query
 
-        stmt_operators = []
-
-        # Jinja block rendering ({% if %}, {% for %}, etc.) must happen on the
-        # whole content BEFORE split_statements, because split_statements splits
-        # on `;` which breaks Jinja blocks containing SQL statements.
-        # When Jinja is enabled, ALL rendering (legacy transpile, standard/<% %>
-        # variables, Jinja blocks) is unified into a single pre-render pass so
-        # that the correct order (standard → Jinja) is preserved and sourced
-        # files (!source) receive the same treatment.
-        # See: https://github.com/snowflakedb/snowflake-cli/issues/2650
-        jinja_pre_render = None
-        if template_syntax_config.enable_jinja_syntax:
-
-            def _jinja_pre_render(content: str) -> str:
-                # Replace comments with inert placeholders before Jinja runs
-                # so that template-like syntax inside comments (e.g. -- {{ v }})
-                # is never evaluated.  Placeholders are restored afterwards;
-                # split_statements(remove_comments=…) then handles the actual
-                # comment stripping or retention decision.
-                content, _saved = _protect_sql_comments(content)
-                if template_syntax_config.enable_legacy_syntax:
-                    content = transpile_snowsql_templates(content)
-                content = snowflake_sql_jinja_render(
-                    content,
-                    template_syntax_config=SQLTemplateSyntaxConfig(
-                        enable_legacy_syntax=template_syntax_config.enable_legacy_syntax,
-                        enable_standard_syntax=template_syntax_config.enable_standard_syntax,
-                        enable_jinja_syntax=True,
-                    ),
-                    data=data,
-                )
-                return _saved.restore(content)
+        stmt_operators, jinja_pre_render = _statement_transforms(
+            template_syntax_config, data
+        )
+        remove_comments = not retain_comments
 
-            jinja_pre_render = _jinja_pre_render
-            # No per-statement operators needed — everything is done in pre-render.
-        else:
-            if template_syntax_config.enable_legacy_syntax:
-                stmt_operators.append(transpile_snowsql_templates)
+        if not query and not files:
+            raise CliArgumentError("Use either query, filename or input option.")
+        secured_files = [SecurePath(f) for f in files or []]
 
-            per_stmt_config = SQLTemplateSyntaxConfig(
-                enable_legacy_syntax=template_syntax_config.enable_legacy_syntax,
-                enable_standard_syntax=template_syntax_config.enable_standard_syntax,
-                enable_jinja_syntax=False,
-            )
-            stmt_operators.append(
-                partial(
-                    snowflake_sql_jinja_render,
-                    template_syntax_config=per_stmt_config,
-                    data=data,
+        def read(paths: List[SecurePath]) -> RecursiveStatementReader:
+            if query:
+                return query_reader(
+                    query,
+                    stmt_operators,
+                    remove_comments,
+                    jinja_pre_render,
+                    disable_url_sources=local_only,
                 )
-            )
-        remove_comments = not retain_comments
-
-        if query:
-            stmt_reader = query_reader(
-                query,
-                stmt_operators,
-                remove_comments,
-                jinja_pre_render,
-                disable_url_sources=local_only,
-            )
-        elif files:
-            secured_files = [SecurePath(f) for f in files]
-            stmt_reader = files_reader(
-                secured_files,
+            return files_reader(
+                paths,
                 stmt_operators,
                 remove_comments,
                 jinja_pre_render,
                 disable_url_sources=local_only,
             )
-        else:
-            raise CliArgumentError("Use either query, filename or input option.")
 
-        errors, expected_results_cnt, compiled_statements = compile_statements(
-            stmt_reader
+        # The whole input is checked before anything is executed, so an error
+        # leaves nothing half-applied. Only the statements to execute are held in
+        # memory, as they are read again while executed.
+        errors: List[str] = []
+        expected_results_cnt = 0
+        statements_cnt = 0
+        checked = (
+            [("query", read([]))]
+            if query
+            else [(str(f.path), read([f])) for f in secured_files]
         )
-        if not any((errors, expected_results_cnt, compiled_statements)):
-            raise CliArgumentError("No SQL statements found to execute.")
-
+        for location, stmt_reader in checked:
+            file_errors, file_results_cnt, file_statements_cnt = check_statements(
+                stmt_reader, location
+            )
+            errors.extend(file_errors)
+            expected_results_cnt += file_results_cnt
+            statements_cnt += file_statements_cnt
         if errors:
-            for error in errors:
-                logger.info("Statement compilation error: %s", error)
-                cli_console.warning(error)
-            raise CliSqlError("SQL rendering error")
+            _raise_compilation_errors(errors)
+        if not statements_cnt:
+            raise CliArgumentError("No SQL statements found to execute.")
 
+        compiled_statements: Iterable[CompiledStatement] = _read_ahead(
+            iter_compiled_statements(read(secured_files)), READ_AHEAD_STATEMENTS
+        )
         if single_transaction:
             logger.info("disabling AUTOCOMMIT")
             self.disable_autocommit()
-            compiled_statements = [
-                CompiledStatement(statement="BEGIN;"),
-                *compiled_statements,
-                CompiledStatement(statement="COMMIT;"),
-            ]
-            expected_results_cnt = len(compiled_statements)
+            compiled_statements = itertools.chain(
+                [CompiledStatement(statement="BEGIN;")],
+                compiled_statements,
+                [CompiledStatement(statement="COMMIT;")],
+            )
+            expected_results_cnt += 2
 
         cursor_class = SnowflakeCursor if get_cli_context().is_repl else VerboseCursor
         return expected_results_cnt, self._execute_compiled_statements(
             compiled_statements,
             cursor_class=cursor_class,
+            auto_parallel=auto_parallel,
         )
 
+    def execute_files_in_parallel(
+        self,
+        files: List[Path],
+        parallel: int,
+        data: Dict | None = None,
+        retain_comments: bool = False,
+        template_syntax_config: SQLTemplateSyntaxConfig = SQLTemplateSyntaxConfig(),
+        local_only: bool = False,
+    ) -> Iterable[CommandResult]:
+        """Executes up to ``parallel`` files at a time, each on its own connection.
+
+        All files are compiled before any of them is executed, and compilation errors
+        or REPL commands in any file stop the execution before it starts. Statements
+        of a file are executed in order, and an error only stops the file it occurs
+        in. Results are yielded grouped by file, in the order of the files, as soon
+        as the file is done. Throws an exception after all results if any file
+        failed.
+
+        Throws an exception right away if the connection authenticates interactively,
+        as every connection would ask for it.
+        """
+        connection_context = get_cli_context().connection_context
+        interactive = _interactive_authentication(connection_context)
+        if interactive:
+            raise CliArgumentError(
+                f"--parallel-files cannot be used with {interactive}, which would be "
+                "required for the connection of every file."
+            )
+        return self._execute_files_in_parallel(
+            files,
+            parallel,
+            connection_context,
+            data=data,
+            retain_comments=retain_comments,
+            template_syntax_config=template_syntax_config,
+            local_only=local_only,
+        )
+
+    def _execute_files_in_parallel(
+        self,
+        files: List[Path],
+        parallel: int,
+        connection_context: ConnectionContext,
+        data: Dict | None,
+        retain_comments: bool,
+        template_syntax_config: SQLTemplateSyntaxConfig,
+        local_only: bool,
+    ) -> Iterable[CommandResult]:
+        stmt_operators, jinja_pre_render = _serialized(
+            *_statement_transforms(template_syntax_config, data)
+        )
+        remove_comments = not retain_comments
+
+        def read(path: Path) -> RecursiveStatementReader:
+            return files_reader(
+                [SecurePath(path)],
+                stmt_operators,
+                remove_comments,
+                jinja_pre_render,
+                disable_url_sources=local_only,
+            )
+
+        # All files are checked before any of them is executed. REPL commands
+        # would not run in order with the statements around them, so they are
+        # refused.
+        errors: List[str] = []
+        for path in files:
+            file_errors, _, _ = check_statements(
+                read(path),
+                str(path),
+                command_error="REPL commands cannot be used with --parallel-files",
+            )
+            errors.extend(file_errors)
+        if errors:
+            _raise_compilation_errors(errors)
+
+        def execute_file(path: Path) -> _FileExecution:
+            execution = _FileExecution(path)
+            try:
+                connection = connection_context.build_connection()
+                execution.connection = connection
+                _execute_file(
+                    iter_compiled_statements(read(path)), connection, execution
+                )
+            except Exception as err:
+                execution.error = str(err)
+            return execution
+
+        failed = []
+        with ThreadPoolExecutor(max_workers=parallel) as pool:
+            # every thread runs in its own copy of the CLI context
+            futures = [
+                pool.submit(copy_context().run, execute_file, path) for path in files
+            ]
+            pending = iter(futures)
+            try:
+                for future in pending:
+                    execution = future.result()
+                    try:
+                        yield from _file_results(execution)
+                    finally:
+                        execution.close()
+                    if execution.error:
+                        failed.append(execution.path)
+            finally:
+                # files not shown yet, when the results are abandoned
+                for future in pending:
+                    if not future.cancel():
+                        future.add_done_callback(_close_file_execution)
+        if failed:
+            raise CliSqlError(
+                f"Execution failed for {len(failed)} of {len(files)} files: "
+                + ", ".join(str(path) for path in failed)
+            )
+
     def _execute_compiled_statements(
-        self, compiled_statements: List[CompiledStatement], cursor_class
+        self,
+        compiled_statements: Iterable[CompiledStatement],
+        cursor_class,
+        auto_parallel: bool = False,
     ) -> Iterable[SnowflakeCursor]:
+        if auto_parallel:
+            yield from self._execute_auto_parallel(compiled_statements, cursor_class)
+            return
         for stmt in compiled_statements:
-            if stmt.execute_async:
-                cursor = self._conn.cursor(cursor_class=cursor_class)
-                cursor.execute_async(stmt.statement)
-                # only log query ID for consistency with SnowSQL
-                logger.info("Async execution id: %s", cursor.sfqid)
-                print_result(CollectionResult([{"scheduled query ID": cursor.sfqid}]))
-            elif stmt.statement:
-                yield from self.execute_string(
-                    stmt.statement, cursor_class=cursor_class
-                )
-            if stmt.command:
-                stmt.command.execute(self._conn)
+            yield from self._execute_compiled_statement(stmt, cursor_class)
+
+    def _execute_compiled_statement(
+        self, stmt: CompiledStatement, cursor_class
+    ) -> Iterable[SnowflakeCursor]:
+        if stmt.error:
+            _raise_compilation_errors([stmt.error])
+        if stmt.execute_async:
+            cursor = self._conn.cursor(cursor_class=cursor_class)
+            cursor.execute_async(stmt.statement)
+            # only log query ID for consistency with SnowSQL
+            logger.info("Async execution id: %s", cursor.sfqid)
+            print_result(CollectionResult([{"scheduled query ID": cursor.sfqid}]))
+        elif stmt.statement:
+            yield from self.execute_string(stmt.statement, cursor_class=cursor_class)
+        if stmt.command:
+            stmt.command.execute(self._conn)
+
+    def _execute_auto_parallel(
+        self, compiled_statements: Iterable[CompiledStatement], cursor_class
+    ) -> Iterable[SnowflakeCursor]:
+        """Executes runs of independent statements concurrently, and statements that
+        are barriers (or not plain statements) on their own, in order. Statements of
+        a run are scheduled as they are read."""
+        statements = iter(compiled_statements)
+        # the statement ending the run being executed, if any
+        run_end: List[CompiledStatement] = []
+
+        def read_run() -> Iterator[Tuple[str, StatementAccess]]:
+            for stmt in statements:
+                if stmt.statement and not (
+                    stmt.error or stmt.execute_async or stmt.command
+                ):
+                    access = analyze_statement(stmt.statement)
+                    if not access.barrier:
+                        yield stmt.statement, access
+                        continue
+                run_end.append(stmt)
+                return
+
+        while True:
+            for statement, cursor in execute_concurrently(self._conn, read_run()):
+                if issubclass(cursor_class, VerboseCursor):
+                    cli_console.message(statement)
+                yield cursor
+            if not run_end:
+                return
+            yield from self._execute_compiled_statement(run_end.pop(), cursor_class)
+
+
+def _execute_file(
+    compiled_statements: CompiledStatements,
+    connection: SnowflakeConnection,
+    execution: _FileExecution,
+) -> None:
+    manager = SqlManager(connection=connection)
+    for stmt in compiled_statements:
+        if stmt.error:
+            execution.error = stmt.error
+            return
+        if stmt.execute_async:
+            cursor = connection.cursor()
+            cursor.execute_async(stmt.statement)
+            logger.info("Async execution id: %s", cursor.sfqid)
+            execution.outputs.append(
+                CollectionResult([{"scheduled query ID": cursor.sfqid}])
+            )
+        elif stmt.statement:
+            execution.outputs.extend(manager.execute_string(stmt.statement))
+
+
+def _file_results(execution: _FileExecution) -> Iterable[CommandResult]:
+    for output in execution.outputs:
+        if isinstance(output, SnowflakeCursor):
+            # the query is shown with its result, as VerboseCursor does
+            if output.query:
+                cli_console.message(output.query)
+            yield QueryResult(output)
+        else:
+            yield output
+    if execution.error:
+        logger.info("Execution of %s failed: %s", execution.path, execution.error)
+        cli_console.warning(f"{execution.path}: {execution.error}")
+
+
+def _raise_compilation_errors(errors: List[str]):
+    for error in errors:
+        logger.info("Statement compilation error: %s", error)
+        cli_console.warning(error)
+    raise CliSqlError("SQL rendering error")
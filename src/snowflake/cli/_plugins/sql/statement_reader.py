@@ -3,6 +3,7 @@ import io
 import re
 import urllib.error
 import uuid
+from contextlib import contextmanager
 from dataclasses import dataclass, field
 from typing import Any, Callable, Generator, List, Literal, Sequence, Tuple
 from urllib.request import urlopen
@@ -13,8 +14,8 @@ from snowflake.cli._plugins.sql.repl_commands import (
     UnknownCommandError,
     compile_repl_command,
 )
+from snowflake.cli._plugins.sql.statement_splitter import split_statements
 from snowflake.cli.api.secure_path import UNLIMITED, SecurePath
-from snowflake.connector.util_text import split_statements
 
 COMMAND_PATTERN = re.compile(
     r"^!(\w+)\s*[\"']?(.*?)[\"']?\s*(?:;|$)",
@@ -218,13 +219,18 @@ class ParsedStatement:
         return cls(path_part, StatementType.URL, raw_source, error)
 
     @classmethod
-    def from_file(cls, path_part: str, raw_source: str) -> "ParsedStatement":
-        """Constructor for loading from file."""
+    def from_file(
+        cls, path_part: str, raw_source: str, read: bool = True
+    ) -> "ParsedStatement":
+        """Constructor for loading from file.
+
+        With ``read=False`` the content is left to be streamed from ``source_path``.
+        """
         stripped_comments_path_part = cls.drop_comments_from_path_parts(path_part)
         path = SecurePath(stripped_comments_path_part)
 
         if path.is_file():
-            payload = path.read_text(file_size_limit_mb=UNLIMITED)
+            payload = path.read_text(file_size_limit_mb=UNLIMITED) if read else ""
             return cls(payload, StatementType.FILE, path.as_posix())
 
         error_msg = f"Could not read: {path_part}"
@@ -243,10 +249,12 @@ def parse_statement(
     source: str,
     operators: OperatorFunctions,
     disable_url_sources: bool = False,
+    read_files: bool = True,
 ) -> ParsedStatement:
     """Evaluates templating and source commands.
 
-    Returns parsed source according to origin."""
+    Returns parsed source according to origin. With ``read_files=False`` sourced
+    files are not read, see ``ParsedStatement.from_file``."""
     try:
         statement = source
         for operator in operators:
@@ -273,7 +281,7 @@ def parse_statement(
 
         # load content from a local file
         case "source" | "load", (str(),):
-            return ParsedStatement.from_file(command_args, statement)
+            return ParsedStatement.from_file(command_args, statement, read_files)
 
         case "source" | "load", _:
             return ParsedStatement(
@@ -303,34 +311,39 @@ def recursive_statement_reader(
     pre_render: SqlTransformFunc | None = None,
     disable_url_sources: bool = False,
 ) -> RecursiveStatementReader:
-    """Based on detected source command reads content of the source and tracks for recursion cycles."""
+    """Based on detected source command reads content of the source and tracks for recursion cycles.
+
+    Statements are parsed as they are consumed. Without ``pre_render``, which needs
+    the whole content, sourced files are split while they are read."""
     for stmt, _ in source:
         if not stmt:
             continue
-        parsed_source = parse_statement(stmt, operators, disable_url_sources)
+        parsed_source = parse_statement(
+            stmt, operators, disable_url_sources, read_files=pre_render is not None
+        )
 
         match parsed_source:
             case ParsedStatement(StatementType.FILE | StatementType.URL, None):
                 if parsed_source.source_path in seen_files:
-                    error = f"Recursion detected: {' -> '.join(seen_files)}"
-                    parsed_source.error = error
+                    parsed_source.error = (
+                        f"Recursion detected: {' -> '.join(seen_files)}"
+                    )
                     yield parsed_source
                     continue
 
                 seen_files.append(parsed_source.source_path)
 
-                content = parsed_source.statement.read()
-                if pre_render:
-                    content = pre_render(content)
-
-                yield from recursive_statement_reader(
-                    split_statements(io.StringIO(content), remove_comments),
-                    seen_files,
-                    operators,
-                    remove_comments,
-                    pre_render,
-                    disable_url_sources,
-                )
+                with _statements_of(
+                    parsed_source, remove_comments, pre_render
+                ) as statements:
+                    yield from recursive_statement_reader(
+                        statements,
+                        seen_files,
+                        operators,
+                        remove_comments,
+                        pre_render,
+                        disable_url_sources,
+                    )
 
                 seen_files.pop()
 
@@ -342,6 +355,30 @@ def recursive_statement_reader(
     return
 
 
+@contextmanager
+def _statements_of(
+    parsed_source: ParsedStatement,
+    remove_comments: bool,
+    pre_render: SqlTransformFunc | None,
+) -> Generator[SplitedStatements, None, None]:
+    """Splits the content of a sourced file or URL into statements."""
+    source_path = parsed_source.source_path
+    if (
+        parsed_source.statement_type == StatementType.FILE
+        and source_path
+        and not pre_render
+    ):
+        path = SecurePath(source_path)
+        with path.open(read_file_limit_mb=UNLIMITED) as f:
+            yield split_statements(f, remove_comments)
+        return
+
+    content = parsed_source.statement.read()
+    if pre_render:
+        content = pre_render(content)
+    yield split_statements(io.StringIO(content), remove_comments)
+
+
 def files_reader(
     paths: Sequence[SecurePath],
     operators: OperatorFunctions,
@@ -351,13 +388,16 @@ def files_reader(
 ) -> RecursiveStatementReader:
     """Entry point for reading statements from files.
 
-    Returns a generator with statements."""
+    Returns a generator with statements. Without ``pre_render``, which needs the
+    whole content, files are split into statements while they are read."""
     for path in paths:
         with path.open(read_file_limit_mb=UNLIMITED) as f:
-            content = f.read()
             if pre_render:
-                content = pre_render(content)
-            stmts = split_statements(io.StringIO(content), remove_comments)
+                stmts = split_statements(
+                    io.StringIO(pre_render(f.read())), remove_comments
+                )
+            else:
+                stmts = split_statements(f, remove_comments)
             yield from recursive_statement_reader(
                 stmts,
                 [path.as_posix()],
@@ -396,6 +436,7 @@ class CompiledStatement:
     statement: str | None = None
     execute_async: bool = False
     command: ReplCommand | None = None
+    error: str | None = None
 
 
 def _is_empty_statement(statement: str) -> bool:
@@ -407,27 +448,22 @@ def _is_empty_statement(statement: str) -> bool:
     return True
 
 
-def compile_statements(
-    source: RecursiveStatementReader,
-) -> Tuple[List[str], int, List[CompiledStatement]]:
-    """Tracks statements evaluation and collects errors."""
-    errors = []
-    expected_results_cnt = 0
-    compiled = []
+CompiledStatements = Generator[CompiledStatement, Any, None]
+
 
+def iter_compiled_statements(source: RecursiveStatementReader) -> CompiledStatements:
+    """Compiles statements as they are read.
+
+    Errors are yielded in place, as statements with only ``error`` set."""
     for stmt in source:
         if stmt.statement_type == StatementType.QUERY:
             statement = stmt.statement.read()
             if not stmt.error and not _is_empty_statement(statement):
                 is_async = statement.endswith(ASYNC_SUFFIX)
-                compiled.append(
-                    CompiledStatement(
-                        statement=statement.removesuffix(ASYNC_SUFFIX),
-                        execute_async=is_async,
-                    )
+                yield CompiledStatement(
+                    statement=statement.removesuffix(ASYNC_SUFFIX),
+                    execute_async=is_async,
                 )
-                if not is_async:
-                    expected_results_cnt += 1
 
         if stmt.statement_type == StatementType.REPL_COMMAND:
             if not stmt.error:
@@ -440,17 +476,62 @@ def compile_statements(
                 try:
                     parsed_command = compile_repl_command(command_text)
                     if parsed_command.error_message:
-                        errors.append(parsed_command.error_message)
+                        yield CompiledStatement(error=parsed_command.error_message)
                     else:
-                        compiled.append(
-                            CompiledStatement(command=parsed_command.command)
-                        )
+                        yield CompiledStatement(command=parsed_command.command)
                 except UnknownCommandError as e:
-                    errors.append(str(e))
+                    yield CompiledStatement(error=str(e))
                 except Exception as e:
-                    errors.append(f"Error parsing command: {e}")
+                    yield CompiledStatement(error=f"Error parsing command: {e}")
+
+        if stmt.error:
+            yield CompiledStatement(error=stmt.error)
+
+
+def expects_result(statement: CompiledStatement) -> bool:
+    return bool(statement.statement) and not statement.execute_async
+
+
+def check_statements(
+    source: RecursiveStatementReader,
+    location: str,
+    command_error: str | None = None,
+) -> Tuple[List[str], int, int]:
+    """Compiles the statements of source only to check them, without keeping them.
+
+    Returns the errors, pointing to the statement in ``location``, the number of
+    expected results and the number of statements. With ``command_error``, REPL
+    commands are reported as errors with this message."""
+    errors = []
+    expected_results_cnt = 0
+    statements_cnt = 0
+
+    for number, stmt in enumerate(iter_compiled_statements(source), start=1):
+        error = stmt.error or (command_error if stmt.command else None)
+        if error:
+            errors.append(f"{error} ({location}, statement {number})")
+            continue
+        statements_cnt += 1
+        if expects_result(stmt):
+            expected_results_cnt += 1
+
+    return errors, expected_results_cnt, statements_cnt
+
+
+def compile_statements(
+    source: RecursiveStatementReader,
+) -> Tuple[List[str], int, List[CompiledStatement]]:
+    """Tracks statements evaluation and collects errors."""
+    errors = []
+    expected_results_cnt = 0
+    compiled = []
 
+    for stmt in iter_compiled_statements(source):
         if stmt.error:
             errors.append(stmt.error)
+            continue
+        compiled.append(stmt)
+        if expects_result(stmt):
+            expected_results_cnt += 1
 
     return errors, expected_results_cnt, compiled
@@ -0,0 +1,203 @@
+# Copyright (c) 2024 Snowflake Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import annotations
+
+import re
+from typing import IO, Generator, List, Optional, Tuple
+
+from snowflake.connector.util_text import COMMENT_PATTERN_RE, EMPTY_LINE_RE
+
+SQL_DELIMITER = ";"
+ASYNC_MARKER = ">"
+PUT_OR_GET = ("PUT", "GET")
+
+# Positions where the state of the scan can change outside of quotes and comments.
+# Blanks only matter until it is known whether the statement is a PUT or a GET.
+_NEXT_TOKEN_RE = re.compile(r"""['" \t;]|--|/\*|\$\$""")
+_NEXT_TOKEN_NO_BLANKS_RE = re.compile(r"""['";]|--|/\*|\$\$""")
+_QUOTE_END_RE = {
+    "'": re.compile(r"['\\]"),
+    '"': re.compile(r'["\\]'),
+}
+
+
+class _Statement:
+    """Text of the statement being read, with its PUT or GET classification."""
+
+    __slots__ = ("parts", "is_put_or_get")
+
+    def __init__(self):
+        self.parts: List[str] = []
+        self.is_put_or_get: Optional[bool] = None
+
+    def add(self, text: str, is_statement: bool) -> None:
+        self.parts.append(text)
+        if self.is_put_or_get is None and is_statement and len(text.strip()) >= 3:
+            self.is_put_or_get = text[:3].upper() in PUT_OR_GET
+
+    def concatenate(self) -> Tuple[str, Optional[bool]]:
+        return "".join(self.parts).strip(), self.is_put_or_get
+
+
+def split_statements(
+    buf: IO[str], remove_comments: bool = False
+) -> Generator[Tuple[str, Optional[bool]], None, None]:
+    """
+    Splits a stream into SQL statements (ending with a semicolon) or commands (!...).
+
+    Yields exactly what ``snowflake.connector.util_text.split_statements`` yields
+    for the default delimiter, comment and quoting rules included, but jumps between
+    the characters that can change the state of the scan with compiled regexes
+    instead of inspecting every character.
+    """
+    in_quote = False
+    ch_quote = ""
+    in_comment = False
+    in_double_dollars = False
+
+    line = buf.readline()
+    if isinstance(line, bytes):
+        raise TypeError("Input data must not be binary type.")
+
+    statement = _Statement()
+    while line != "":
+        col = 0
+        col0 = 0
+        len_line = len(line)
+        while True:
+            if col >= len_line:
+                if col0 < len_line:
+                    if not in_comment:
+                        statement.add(line[col0:], True)
+                    elif not remove_comments:
+                        statement.add(line[col0:], False)
+                break
+
+            if in_comment:
+                end = line.find("*/", col)
+                if end < 0:
+                    col = len_line
+                    continue
+                in_comment = False
+                if not remove_comments:
+                    statement.add(line[col0 : end + 2], False)
+                col = col0 = end + 2
+
+            elif in_double_dollars:
+                end = line.find("$$", col)
+                if end < 0:
+                    col = len_line
+                    continue
+                in_double_dollars = False
+                statement.add(line[col0 : end + 2], False)
+                col = col0 = end + 2
+
+            elif in_quote:
+                match = _QUOTE_END_RE[ch_quote].search(line, col)
+                if match is None:
+                    col = len_line
+                    continue
+                col = match.start()
+                if line[col] == "\\":
+                    if col < len_line - 1 and line[col + 1] in (ch_quote, "\\"):
+                        col += 2
+                    else:
+                        col += 1
+                elif col == len_line - 1 or line[col + 1] != ch_quote:
+                    in_quote = False
+                    statement.add(line[col0 : col + 1], True)
+                    col = col0 = col + 1
+                else:
+                    # escaped quote and still in quote
+                    col += 2
+
+            else:
+                if col == 0 and line[0] == "!":  # command
+                    if statement.parts:
+                        yield statement.concatenate()
+                        statement = _Statement()
+                    command = line.strip()
+                    if command.endswith(SQL_DELIMITER):
+                        command = command[: -len(SQL_DELIMITER)]
+                    yield command.strip(), False
+                    break
+
+                token_re = (
+                    _NEXT_TOKEN_RE
+                    if statement.is_put_or_get is None
+                    else _NEXT_TOKEN_NO_BLANKS_RE
+                )
+                match = token_re.search(line, col)
+                if match is None:
+                    col = len_line
+                    continue
+                col = match.start()
+                token = match.group()
+                if token in ("'", '"'):
+                    in_quote = True
+                    ch_quote = token
+                    col += 1
+                elif token in (" ", "\t"):
+                    statement.add(line[col0 : col + 1], True)
+                    col = col0 = col + 1
+                elif token == "--":
+                    statement.add(line[col0:col], True)
+                    if not remove_comments:
+                        # keep the comment
+                        statement.add(line[col:], False)
+                    else:
+                        statement.add("\n", True)
+                    break
+                elif token == "/*":
+                    # the word before the comment starts after the last blank,
+                    # which may have been skipped
+                    word = max(
+                        col0,
+                        line.rfind(" ", col0, col) + 1,
+                        line.rfind("\t", col0, col) + 1,
+                    )
+                    if line.startswith("file://", word):
+                        col += 1
+                        continue
+                    if not remove_comments:
+                        statement.add(line[col0 : col + 2], False)
+                    else:
+                        statement.add(line[col0:col], False)
+                    col = col0 = col + 2
+                    in_comment = True
+                elif token == "$$":
+                    statement.add(line[col0 : col + 2], True)
+                    col = col0 = col + 2
+                    in_double_dollars = True
+                else:  # delimiter
+                    col += len(SQL_DELIMITER)
+                    if line.startswith(ASYNC_MARKER, col):
+                        col += len(ASYNC_MARKER)
+                    statement.add(line[col0:col], True)
+                    rest = line[col:]
+                    if COMMENT_PATTERN_RE.match(rest) or EMPTY_LINE_RE.match(rest):
+                        if not remove_comments:
+                            # keep the comment
+                            statement.add(rest, False)
+                        col = len_line
+                    while col < len_line and line[col] in (" ", "\t"):
+                        col += 1
+                    yield statement.concatenate()
+                    statement = _Statement()
+                    col0 = col
+        line = buf.readline()
+
+    if statement.parts:
+        yield statement.concatenate()
@@ -28,18 +28,28 @@ from snowflake.cli._plugins.object.command_aliases import (
 from snowflake.cli._plugins.stage.diff import (
     DiffResult,
     compute_stage_diff,
+    compute_stage_to_stage_diff,
+    mirror_stage_diff,
+    sync_local_diff_with_stage,
 )
 from snowflake.cli._plugins.stage.manager import (
     InternalStageEncryptionType,
     StageManager,
 )
+from snowflake.cli._plugins.stage.upload_journal import UploadJournal
+from snowflake.cli._plugins.stage.usage import compute_stage_usage
 from snowflake.cli._plugins.stage.utils import print_diff_to_console
+from snowflake.cli._plugins.stage.watch import (
+    LocalChangeWatcher,
+    sync_changes_with_stage,
+)
 from snowflake.cli.api.cli_global_context import get_cli_context
 from snowflake.cli.api.commands.common import OnErrorType
 from snowflake.cli.api.commands.flags import (
     ExecuteVariablesOption,
     OnErrorOption,
     PatternOption,
+    PruneOption,
     identifier_stage_argument,
     identifier_stage_path_argument,
     like_option,
@@ -51,10 +61,12 @@ from snowflake.cli.api.identifiers import FQN
 from snowflake.cli.api.output.types import (
     CollectionResult,
     CommandResult,
+    MessageResult,
     ObjectResult,
     QueryResult,
     SingleQueryResult,
 )
+from snowflake.cli.api.stage_path import StagePath
 from snowflake.cli.api.utils.path_utils import is_stage_path
 
 app = SnowTyperFactory(
@@ -90,6 +102,38 @@ def stage_list_files(
     return QueryResult(cursor)
 
 
+@app.command("du", requires_connection=True)
+def stage_disk_usage(
+    stage_name: StagePath = StagePathArgument,
+    depth: int = typer.Option(
+        1,
+        "--depth",
+        help="Number of directory levels to group files by. Use 0 to show only the total.",
+        min=0,
+    ),
+    top: int = typer.Option(
+        20,
+        "--top",
+        help="Number of largest directories to show.",
+        min=1,
+    ),
+    **options,
+) -> CommandResult:
+    """
+    Shows the total size and number of files in the largest directories of a stage.
+    """
+    usage = compute_stage_usage(
+        stage_path=StageManager.stage_path_parts_from_str(  # noqa: SLF001
+            stage_name.absolute_path()
+        ),
+        depth=depth,
+    )
+    cli_console.message(
+        f"{usage.files} files, {usage.size} bytes in {len(usage.prefixes)} directories."
+    )
+    return CollectionResult(usage.top(top))
+
+
 @app.command("copy", requires_connection=True)
 def copy(
     source_path: str = typer.Argument(
@@ -120,6 +164,10 @@ def copy(
         default=False,
         help="Specifies whether ALTER STAGE {name} REFRESH should be executed after uploading.",
     ),
+    resume: bool = typer.Option(
+        default=False,
+        help="Keeps a journal of uploaded directories, so that running the upload again with `--resume` after an interruption skips directories it already uploaded. An upload run without `--resume` keeps no journal and cannot be resumed. Only works with `--recursive` uploads.",
+    ),
     **options,
 ) -> CommandResult:
     """
@@ -139,6 +187,11 @@ def copy(
             "Both source and target path are local. This operation is not supported."
         )
 
+    if resume and (is_get or not recursive):
+        raise click.ClickException(
+            "Option --resume can only be used with recursive uploads."
+        )
+
     if is_get:
         return get(
             recursive=recursive,
@@ -154,6 +207,7 @@ def copy(
         overwrite=overwrite,
         auto_compress=auto_compress,
         refresh=refresh,
+        resume=resume,
     )
 
 
@@ -225,6 +279,119 @@ def stage_diff(
         return None  # don't print any output
 
 
+@app.command("sync", requires_connection=True)
+def stage_sync(
+    folder_name: str = typer.Argument(
+        help="Path to local folder",
+        show_default=False,
+    ),
+    stage_name: str = typer.Argument(
+        help="Stage path to upload the folder to. For example `@stage/app`.",
+        show_default=False,
+    ),
+    prune: bool = PruneOption(),
+    watch: bool = typer.Option(
+        False,
+        "--watch",
+        help="Keep running and upload files as they change in the local folder, until interrupted with Ctrl+C. Changes made on the stage are not watched.",
+    ),
+    **options,
+) -> CommandResult:
+    """
+    Uploads new and modified files of a local folder to a stage, one way only.
+    """
+    local_root = Path(folder_name)
+    if not local_root.is_dir():
+        raise click.ClickException(f"{folder_name} is not a directory.")
+    stage_path = StageManager.stage_path_parts_from_str(stage_name)  # noqa: SLF001
+
+    if watch:
+        # snapshot the folder before the initial sync, so no change is missed
+        watcher = LocalChangeWatcher(local_root)
+
+    diff = compute_stage_diff(local_root=local_root, stage_path=stage_path)
+    if not prune:
+        diff.only_on_stage = []
+    print_diff_to_console(diff)
+    if diff.has_changes():
+        sync_local_diff_with_stage(
+            role=None,
+            deploy_root_path=local_root,
+            diff_result=diff,
+            stage_full_path=stage_path.full_path,
+        )
+
+    if not watch:
+        return MessageResult(f"Folder {folder_name} uploaded to {stage_name}.")
+
+    cli_console.message(
+        f"Watching {folder_name} for changes{'' if watcher.uses_notifications else ' (polling)'}. Press Ctrl+C to stop."
+    )
+    try:
+        while True:
+            changed, deleted = watcher.wait_for_changes()
+            diff = sync_changes_with_stage(
+                local_root=local_root,
+                stage_path=stage_path,
+                changed=changed,
+                deleted=deleted,
+                prune=prune,
+            )
+            print_diff_to_console(diff)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        watcher.close()
+    return MessageResult("Stopped watching for changes.")
+
+
+@app.command("mirror", requires_connection=True)
+def stage_mirror(
+    source_path: str = typer.Argument(
+        help="Stage path to copy files from. For example `@dev_stage/app`.",
+        show_default=False,
+    ),
+    destination_path: str = typer.Argument(
+        help="Stage path to copy files to. For example `@prod_stage/app`.",
+        show_default=False,
+    ),
+    prune: bool = PruneOption(
+        help="Delete files that exist in the destination, but not in the source."
+    ),
+    **options,
+) -> CommandResult:
+    """
+    Copies new and modified files from one stage path to another. Files with the same
+    size and md5sum on both stages are not copied again.
+    """
+    if not is_stage_path(source_path) or not is_stage_path(destination_path):
+        raise click.ClickException("Both source and destination must be stage paths.")
+    if StagePath.from_stage_str(destination_path).is_user_stage():
+        raise click.ClickException(
+            "Destination path cannot be a user stage. Please provide a named stage."
+        )
+    source = StageManager.stage_path_parts_from_str(source_path)  # noqa: SLF001
+    destination = StageManager.stage_path_parts_from_str(  # noqa: SLF001
+        destination_path
+    )
+
+    diff = compute_stage_to_stage_diff(source=source, destination=destination)
+    if not prune:
+        diff.only_on_stage = []
+    if diff.has_changes():
+        mirror_stage_diff(
+            diff_result=diff,
+            source_full_path=source.full_path,
+            destination_full_path=destination.full_path,
+        )
+    cli_console.message(f"{diff.identical} files are already up to date.")
+    return CollectionResult(
+        [{"file": str(p), "status": "ADDED"} for p in diff.only_local]
+        + [{"file": str(p), "status": "MODIFIED"} for p in diff.different]
+        + [{"file": str(p), "status": "DELETED"} for p in diff.only_on_stage]
+    )
+
+
 @app.command("execute", requires_connection=True)
 def execute(
     stage_path: str = typer.Argument(
@@ -234,6 +401,11 @@ def execute(
     ),
     on_error: OnErrorType = OnErrorOption,
     variables: Optional[List[str]] = ExecuteVariablesOption,
+    parallel: int = typer.Option(
+        1,
+        help="Number of files to execute at the same time. Use it only for files that do not depend on each other. Results are listed in the usual order.",
+        min=1,
+    ),
     **options,
 ):
     """
@@ -241,7 +413,10 @@ def execute(
     e.g. `@stage/*.sql`, `@stage/dev/*`. Only files with `.sql` extension will be executed.
     """
     results = StageManager().execute(
-        stage_path_str=stage_path, on_error=on_error, variables=variables
+        stage_path_str=stage_path,
+        on_error=on_error,
+        variables=variables,
+        parallel=parallel,
     )
     return CollectionResult(results)
 
@@ -257,10 +432,16 @@ def get(recursive: bool, source_path: str, destination_path: str, parallel: int)
         )
         return QueryResult(cursor)
 
-    cursors = StageManager().get_recursive(
-        stage_path=source_path, dest_path=target, parallel=parallel
+    downloads = StageManager().get_recursive(
+        stage_path=source_path,
+        dest_path=target,
+        parallel=parallel,
+        skip_identical=True,
     )
-    results = [list(QueryResult(c).result) for c in cursors]
+    # skipped files are yielded as rows, downloaded directories as cursors
+    results = [
+        [r] if isinstance(r, dict) else list(QueryResult(r).result) for r in downloads
+    ]
     flattened_results = list(itertools.chain.from_iterable(results))
     sorted_results = sorted(
         flattened_results,
@@ -277,14 +458,27 @@ def _put(
     overwrite: bool,
     auto_compress: bool,
     refresh: bool,
+    resume: bool = False,
 ):
     if recursive and not source_path.is_file():
+        # only resumable uploads keep a journal
+        journal = (
+            UploadJournal(
+                local_path=source_path,
+                stage_path=destination_path,
+                auto_compress=auto_compress,
+                resume=True,
+            )
+            if resume
+            else None
+        )
         cursor_generator = StageManager().put_recursive(
             local_path=source_path,
             stage_path=destination_path,
             overwrite=overwrite,
             parallel=parallel,
             auto_compress=auto_compress,
+            journal=journal,
         )
         output = CollectionResult(cursor_generator)
     else:
@@ -15,33 +15,52 @@
 from __future__ import annotations
 
 import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
 from dataclasses import dataclass, field
+from operator import itemgetter
 from pathlib import Path, PurePosixPath
-from typing import Collection, Dict, List, Optional, Tuple
+from typing import Collection, Dict, Iterator, List, Optional, Tuple, Union
 
 from snowflake.cli.api.artifacts.bundle_map import BundleMap
 from snowflake.cli.api.exceptions import (
     SnowflakeSQLExecutionError,
 )
 from snowflake.cli.api.project.util import unquote_identifier
-from snowflake.connector.cursor import DictCursor
+from snowflake.connector.cursor import DictCursor, SnowflakeCursor
 
 from .manager import StageManager, StagePathParts
-from .md5 import UnknownMD5FormatError, file_matches_md5sum
+from .md5 import (
+    LocalMD5Cache,
+    UnknownMD5FormatError,
+    file_matches_md5sum,
+    is_md5sum,
+)
 
 log = logging.getLogger(__name__)
 
+# Files are hashed in worker threads; hashlib releases the GIL while digesting,
+# so hashing scales with cores as long as reads are large (READ_BUFFER_BYTES).
+MAX_HASH_WORKERS = 16
+# Files matched against the stage are hashed in batches of this size, which
+# bounds the number of pending comparisons held in memory.
+HASH_BATCH_SIZE = 1024
+# COPY FILES accepts at most this many paths in its FILES list.
+COPY_FILES_BATCH_SIZE = 1000
+
 StagePathType = PurePosixPath  # alias PurePosixPath as StagePath for clarity
 
 
 @dataclass
 class DiffResult:
     """
-    Each collection is a list of stage paths ('/'-separated, regardless of the platform), relative to the stage root.
+    Each collection except identical holds stage paths ('/'-separated, regardless of the platform), relative to the
+    stage root. Identical files are only counted.
     """
 
-    identical: List[StagePathType] = field(default_factory=list)
-    "Files with matching md5sums"
+    identical: int = 0
+    "Number of files with matching md5sums; their paths are not kept"
 
     different: List[StagePathType] = field(default_factory=list)
     "Files that may be different between the stage and the local directory"
@@ -52,6 +71,9 @@ class DiffResult:
     only_on_stage: List[StagePathType] = field(default_factory=list)
     "Files that only exist on the stage"
 
+    moved: Dict[StagePathType, StagePathType] = field(default_factory=dict)
+    "Files from only_local with the same name and md5sum as a file from only_on_stage, mapped to that file"
+
     def has_changes(self) -> bool:
         return (
             len(self.different) > 0
@@ -67,6 +89,24 @@ class DiffResult:
         }
 
 
+def walk_sorted(path: Path, prefix: str = "") -> Iterator[Tuple[str, Path]]:
+    """
+    Yields (stage path, local path) of all files in a directory (recursively), in the
+    same order as enumerate_files, without building the whole list.
+    """
+    if not path.is_dir():
+        raise ValueError("Path must point to a directory")
+
+    with os.scandir(path) as it:
+        entries = sorted(it, key=lambda e: e.name)
+    for entry in entries:
+        stage_path = f"{prefix}{entry.name}"
+        if entry.is_dir():
+            yield from walk_sorted(Path(entry.path), f"{stage_path}/")
+        else:
+            yield stage_path, Path(entry.path)
+
+
 def enumerate_files(path: Path) -> List[Path]:
     """
     Get a list of all files in a directory (recursively).
@@ -99,80 +139,208 @@ def relative_to_stage_path(path: str, stage_path: StagePathParts) -> StagePathTy
     return StagePathType(relative_path)
 
 
+def iter_stage_md5s(
+    list_stage_cursor: DictCursor, stage_path: StagePathParts
+) -> Iterator[Tuple[str, Optional[str]]]:
+    """
+    Yields (file path, md5sum) pairs of a stage listing, fetching rows as they are consumed
+    instead of all at once. File paths are relative to the stage and subdirectory.
+    """
+    for file in list_stage_cursor:
+        yield str(relative_to_stage_path(file["name"], stage_path)), file["md5"]
+
+
 def build_md5_map(
     list_stage_cursor: DictCursor, stage_path: StagePathParts
 ) -> Dict[StagePathType, Optional[str]]:
     """
     Returns a mapping of file paths to their md5sums. File paths are relative to the stage and subdirectory.
     """
-    all_files = list_stage_cursor.fetchall()
     return {
-        relative_to_stage_path(file["name"], stage_path): file["md5"]
-        for file in all_files
+        StagePathType(path): md5
+        for path, md5 in iter_stage_md5s(list_stage_cursor, stage_path)
     }
 
 
+def compute_stage_to_stage_diff(
+    source: StagePathParts, destination: StagePathParts
+) -> DiffResult:
+    """
+    Diffs the files in the source stage path with files in the destination stage path.
+
+    Files are identical when both stages list them with the same size and md5sum, so no
+    file is downloaded. Files listed without an md5sum are always reported as different.
+    In the result, only_local holds the files that only exist on the source stage.
+    """
+    stage_manager = StageManager()
+
+    def list_stage(stage_path: StagePathParts) -> Dict[str, Tuple[Optional[str], int]]:
+        return {
+            str(relative_to_stage_path(file["name"], stage_path)): (
+                file["md5"],
+                file["size"],
+            )
+            for file in stage_manager.list_files(stage_path.full_path)
+        }
+
+    destination_files = list_stage(destination)
+    result: DiffResult = DiffResult()
+    for path, (md5, size) in sorted(list_stage(source).items()):
+        existing = destination_files.pop(path, None)
+        if existing is None:
+            result.only_local.append(StagePathType(path))
+        elif md5 and existing == (md5, size):
+            result.identical += 1
+        else:
+            result.different.append(StagePathType(path))
+    result.only_on_stage = [StagePathType(p) for p in sorted(destination_files)]
+    return result
+
+
 def preserve_from_diff(
     diff: DiffResult, stage_paths_to_sync: Collection[StagePathType]
 ) -> DiffResult:
     """
     Returns a filtered version of the provided diff, keeping only the provided stage paths.
+    The paths of identical files are not known, so the filtered diff does not count them.
     """
     paths_to_preserve = set(stage_paths_to_sync)
     preserved_diff: DiffResult = DiffResult()
-    preserved_diff.identical = [i for i in diff.identical if i in paths_to_preserve]
     preserved_diff.different = [i for i in diff.different if i in paths_to_preserve]
     preserved_diff.only_local = [i for i in diff.only_local if i in paths_to_preserve]
     preserved_diff.only_on_stage = [
         i for i in diff.only_on_stage if i in paths_to_preserve
     ]
+    preserved_diff.moved = {
+        dest: src for dest, src in diff.moved.items() if dest in paths_to_preserve
+    }
     return preserved_diff
 
 
+def _local_file_matches_stage(
+    local_file: Path, remote_md5: Optional[str], md5_cache: LocalMD5Cache
+) -> bool:
+    # N.B. file size on stage is not always accurate, so cannot fail fast
+    try:
+        # We are assuming that we will not get accidental collisions here due to the
+        # large space of the md5sum (32 * 4 = 128 bits means 1-in-9-trillion chance)
+        # combined with the fact that the file name + path must also match elsewhere.
+        return file_matches_md5sum(local_file, remote_md5, md5_cache)
+    except UnknownMD5FormatError:
+        log.warning(
+            "Could not compare md5 for %s, assuming file has changed",
+            local_file,
+            exc_info=True,
+        )
+        return False
+
+
+def _merge_sort_key(path: str) -> str:
+    """
+    Sort key ordering stage paths the way walk_sorted visits them: mapping '/' below
+    every other character makes a directory's files sort right after its name.
+    """
+    return path.replace("/", "\0")
+
+
+def _compact_md5(md5: Optional[str]) -> Union[bytes, str, None]:
+    # plain md5sums are kept as 16-byte digests, anything else as listed
+    return bytes.fromhex(md5) if md5 and is_md5sum(md5) else md5
+
+
+def _expand_md5(md5: Union[bytes, str, None]) -> Optional[str]:
+    return md5.hex() if isinstance(md5, bytes) else md5
+
+
 def compute_stage_diff(local_root: Path, stage_path: StagePathParts) -> DiffResult:
     """
     Diffs the files in the local_root with files in the stage path that is stage_path's full_path.
+
+    The whole stage listing is held in memory, as a sorted list of compact (sort key,
+    md5 digest) pairs, since LIST does not return files in the order of the walk; it is
+    merge-joined with a sorted walk of local_root, and identical files are only counted. Local files that also exist on the stage are hashed concurrently, in
+    batches of HASH_BATCH_SIZE.
+
+    Files that were moved to another directory are reported in only_local and
+    only_on_stage, and are also paired up in moved so that they can be copied on the
+    stage instead of being uploaded again.
     """
     stage_manager = StageManager()
-    local_files = enumerate_files(local_root)
     remote_files = stage_manager.list_files(stage_path.full_path)
 
-    # Create a mapping from remote_file path to file's md5sum. Path is relative to stage_name/directory.
-    remote_md5 = build_md5_map(remote_files, stage_path)
+    # Sorted in reverse so that the merge can pop (and free) the smallest entry.
+    remote = sorted(
+        (
+            (_merge_sort_key(path), _compact_md5(md5))
+            for path, md5 in iter_stage_md5s(remote_files, stage_path)
+        ),
+        key=itemgetter(0),
+        reverse=True,
+    )
 
     result: DiffResult = DiffResult()
-
-    for local_file in local_files:
-        relpath = local_file.relative_to(local_root)
-        rel_stage_path = to_stage_path(relpath)
-        if rel_stage_path not in remote_md5:
-            # doesn't exist on the stage
-            result.only_local.append(rel_stage_path)
-        else:
-            # N.B. file size on stage is not always accurate, so cannot fail fast
-            try:
-                if file_matches_md5sum(local_file, remote_md5[rel_stage_path]):
-                    # We are assuming that we will not get accidental collisions here due to the
-                    # large space of the md5sum (32 * 4 = 128 bits means 1-in-9-trillion chance)
-                    # combined with the fact that the file name + path must also match elsewhere.
-                    result.identical.append(rel_stage_path)
+    md5_cache = LocalMD5Cache()
+    max_workers = min(MAX_HASH_WORKERS, os.cpu_count() or 1)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        # (local file, stage path, remote md5) of files waiting to be hashed
+        to_compare: List[Tuple[Path, str, Optional[str]]] = []
+
+        def compare_pending():
+            matches = executor.map(
+                lambda item: _local_file_matches_stage(item[0], item[2], md5_cache),
+                to_compare,
+            )
+            # map() yields in submission order, so the result lists keep the local file order
+            for (_, rel_path, _), identical in zip(to_compare, matches):
+                if identical:
+                    result.identical += 1
                 else:
                     # either the file has changed, or we can't tell if it has
-                    result.different.append(rel_stage_path)
-            except UnknownMD5FormatError:
-                log.warning(
-                    "Could not compare md5 for %s, assuming file has changed",
-                    local_file,
-                    exc_info=True,
-                )
-                result.different.append(rel_stage_path)
-
-            # mark this file as seen
-            del remote_md5[rel_stage_path]
+                    result.different.append(StagePathType(rel_path))
+            to_compare.clear()
+
+        # file name -> md5sum -> path, of files only on the stage that could have been moved
+        move_sources: Dict[str, Dict[bytes, StagePathType]] = {}
+
+        def add_only_on_stage(key: str, md5: Union[bytes, str, None]):
+            stage_only_path = StagePathType(key.replace("\0", "/"))
+            result.only_on_stage.append(stage_only_path)
+            if isinstance(md5, bytes):
+                move_sources.setdefault(stage_only_path.name, {})[md5] = stage_only_path
+
+        for rel_path, local_file in walk_sorted(local_root):
+            key = _merge_sort_key(rel_path)
+            while remote and remote[-1][0] < key:
+                # we walked past this file, so it doesn't exist locally
+                add_only_on_stage(*remote.pop())
+            if remote and remote[-1][0] == key:
+                to_compare.append((local_file, rel_path, _expand_md5(remote.pop()[1])))
+                if len(to_compare) >= HASH_BATCH_SIZE:
+                    compare_pending()
+            else:
+                # doesn't exist on the stage
+                result.only_local.append(StagePathType(rel_path))
+        compare_pending()
+
+        # every entry here is a file we never saw locally
+        while remote:
+            add_only_on_stage(*remote.pop())
+
+        # Only files keeping their name can be copied, as COPY FILES preserves names,
+        # and only plain md5sums are compared, so moves never need multi-part hashing.
+        move_candidates = [
+            path for path in result.only_local if path.name in move_sources
+        ]
+        local_md5s = executor.map(
+            lambda path: md5_cache.md5sum(local_root / to_local_path(path)),
+            move_candidates,
+        )
+        for dest, local_md5 in zip(move_candidates, local_md5s):
+            if src := move_sources[dest.name].get(bytes.fromhex(local_md5)):
+                result.moved[dest] = src
 
-    # every entry here is a file we never saw locally
-    for rel_stage_path in remote_md5.keys():
-        result.only_on_stage.append(rel_stage_path)
+    md5_cache.save()
 
     return result
 
@@ -202,12 +370,49 @@ def delete_only_on_stage_files(
     stage_root: str,
     only_on_stage: List[StagePathType],
     role: Optional[str] = None,
-):
+) -> List[SnowflakeCursor]:
     """
     Deletes all files from a Snowflake stage according to the input list of filenames, using a custom role.
+    Returns the cursors of the removals, one per file. If any file could not be deleted, the others are still
+    deleted and SnowflakeSQLExecutionError lists the files that were not.
+    """
+    cursors = stage_manager.remove_many(
+        stage_name=stage_root, paths=[str(p) for p in only_on_stage], role=role
+    )
+    log.info("Deleted %d files from %s", len(cursors), stage_root)
+    return cursors
+
+
+def copy_moved_files_on_stage(
+    stage_manager: StageManager,
+    stage_root: str,
+    moved: Dict[StagePathType, StagePathType],
+    role: Optional[str] = None,
+):
+    """
+    Copies files that were moved to another directory from their old location on a Snowflake stage,
+    instead of uploading them again, using a custom role. Files moved between the same two directories
+    are copied together, COPY_FILES_BATCH_SIZE files per statement.
     """
-    for _stage_path in only_on_stage:
-        stage_manager.remove(stage_name=stage_root, path=str(_stage_path), role=role)
+    if not moved:
+        return
+    by_directories: Dict[Tuple[str, str], List[str]] = {}
+    for dest, src in moved.items():
+        by_directories.setdefault(
+            (get_stage_subpath(src), get_stage_subpath(dest)), []
+        ).append(src.name)
+
+    with stage_manager.use_role(role) if role else nullcontext():
+        for (src_dir, dest_dir), file_names in by_directories.items():
+            # FILES are resolved relative to the source directory
+            source_path = f"{stage_root}/{src_dir}/" if src_dir else f"{stage_root}/"
+            destination_path = f"{stage_root}/{dest_dir}" if dest_dir else stage_root
+            for start in range(0, len(file_names), COPY_FILES_BATCH_SIZE):
+                stage_manager.copy_files(
+                    source_path=source_path,
+                    destination_path=destination_path,
+                    files=file_names[start : start + COPY_FILES_BATCH_SIZE],
+                )
 
 
 def put_files_on_stage(
@@ -220,18 +425,18 @@ def put_files_on_stage(
 ):
     """
     Uploads all files given input list of filenames on your local filesystem, to a Snowflake stage, using a custom role.
+    Files in the same directory are uploaded with a single PUT, and directories are uploaded concurrently.
     """
-    for _stage_path in stage_paths:
-        stage_sub_path = get_stage_subpath(_stage_path)
-        full_stage_path = (
-            f"{stage_root}/{stage_sub_path}" if stage_sub_path else stage_root
-        )
-        stage_manager.put(
-            local_path=deploy_root_path / to_local_path(_stage_path),
-            stage_path=full_stage_path,
-            role=role,
-            overwrite=overwrite,
-        )
+    if not stage_paths:
+        return
+    for _ in stage_manager.put_files(
+        local_root=deploy_root_path,
+        relative_paths=[to_local_path(p) for p in stage_paths],
+        stage_path=stage_root,
+        role=role,
+        overwrite=overwrite,
+    ):
+        pass
 
 
 def sync_local_diff_with_stage(
@@ -243,6 +448,7 @@ def sync_local_diff_with_stage(
 ):
     """
     Syncs a given local directory's contents with a Snowflake stage, including removing old files, and re-uploading modified and new files.
+    Files that were only moved are copied on the stage rather than uploaded again.
     """
     stage_manager = StageManager()
     log.info(
@@ -250,7 +456,17 @@ def sync_local_diff_with_stage(
         deploy_root_path,
     )
 
+    # COPY FILES cannot write to user stages, and vstages are left to PUT
+    stage_root = stage_manager.build_path(stage_full_path)
+    moved = (
+        {}
+        if stage_root.is_user_stage() or stage_root.is_vstage()
+        else diff_result.moved
+    )
+
     try:
+        # moved files are copied before their sources can be deleted
+        copy_moved_files_on_stage(stage_manager, stage_full_path, moved, role)
         delete_only_on_stage_files(
             stage_manager, stage_full_path, diff_result.only_on_stage, role
         )
@@ -266,10 +482,45 @@ def sync_local_diff_with_stage(
             stage_manager=stage_manager,
             stage_root=stage_full_path,
             deploy_root_path=deploy_root_path,
-            stage_paths=diff_result.only_local,
+            stage_paths=[p for p in diff_result.only_local if p not in moved],
             role=role,
             overwrite=force_overwrite,
         )
+    except SnowflakeSQLExecutionError:
+        # already tells which files failed
+        raise
+    except Exception as err:
+        # Could be ProgrammingError or IntegrityError from SnowflakeCursor
+        log.error(err)
+        raise SnowflakeSQLExecutionError()
+
+
+def mirror_stage_diff(
+    diff_result: DiffResult,
+    source_full_path: str,
+    destination_full_path: str,
+):
+    """
+    Copies new and modified files from the source stage path to the destination stage path
+    with COPY FILES, so the files never leave Snowflake, and removes the files that only
+    exist on the destination.
+    """
+    stage_manager = StageManager()
+    to_copy = sorted(diff_result.only_local + diff_result.different)
+    try:
+        for start in range(0, len(to_copy), COPY_FILES_BATCH_SIZE):
+            stage_manager.copy_files(
+                # FILES are resolved relative to the source directory
+                source_path=f"{source_full_path}/",
+                destination_path=destination_full_path,
+                files=[str(p) for p in to_copy[start : start + COPY_FILES_BATCH_SIZE]],
+            )
+        delete_only_on_stage_files(
+            stage_manager, destination_full_path, diff_result.only_on_stage
+        )
+    except SnowflakeSQLExecutionError:
+        # already tells which files failed
+        raise
     except Exception as err:
         # Could be ProgrammingError or IntegrityError from SnowflakeCursor
         log.error(err)
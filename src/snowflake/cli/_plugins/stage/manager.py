@@ -16,13 +16,18 @@ from __future__ import annotations
 
 import fnmatch
 import glob
+import hashlib
+import json
 import logging
 import os
 import re
 import shutil
+import sys
+import threading
 import time
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from contextlib import contextmanager, nullcontext
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, as_completed, wait
+from contextlib import ExitStack, nullcontext
 from contextvars import copy_context
 from dataclasses import dataclass
 from enum import Enum
@@ -30,17 +35,20 @@ from os import path
 from pathlib import Path
 from tempfile import TemporaryDirectory
 from textwrap import dedent
-from typing import Dict, Generator, List, Optional, Union
+from typing import Any, Dict, Generator, List, Optional, Set, Union, cast
 
 from click import UsageError
 from snowflake.cli._plugins.snowpark.package_utils import parse_requirements
+from snowflake.cli._plugins.stage.md5 import LocalMD5Cache, file_matches_md5sum
+from snowflake.cli._plugins.stage.upload_concurrency import AdaptiveUploadConcurrency
+from snowflake.cli._plugins.stage.upload_journal import UploadJournal
 from snowflake.cli.api.commands.common import (
     OnErrorType,
     Variable,
 )
 from snowflake.cli.api.config import get_config_value
 from snowflake.cli.api.console import cli_console
-from snowflake.cli.api.exceptions import CliError
+from snowflake.cli.api.exceptions import CliError, SnowflakeSQLExecutionError
 from snowflake.cli.api.identifiers import FQN
 from snowflake.cli.api.project.util import VALID_IDENTIFIER_REGEX, to_string_literal
 from snowflake.cli.api.secure_path import SecurePath
@@ -50,13 +58,6 @@ from snowflake.cli.api.utils.path_utils import path_resolver, resolve_without_fo
 from snowflake.connector import DictCursor, ProgrammingError
 from snowflake.connector.cursor import SnowflakeCursor
 
-try:
-    # Session must be in module globals so @sproc can resolve the type annotation
-    # via typing.get_type_hints() when building the stored procedure signature.
-    from snowflake.snowpark import Session
-except ImportError:
-    pass
-
 log = logging.getLogger(__name__)
 
 
@@ -74,28 +75,44 @@ STAGE_UPLOAD_WORKERS_CONFIG_PATH = ("cli",)
 STAGE_UPLOAD_WORKERS_CONFIG_KEY = "stage_upload_workers"
 STAGE_UPLOAD_WORKERS_ENV_VAR = "SNOWFLAKE_CLI_STAGE_UPLOAD_WORKERS"
 
+# With ``stage_upload_workers = "auto"``, directory uploads adapt their
+# concurrency to the measured PUT latency and throughput (see
+# AdaptiveUploadConcurrency), up to this budget. Other transfers use the default.
+UPLOAD_WORKERS_AUTO = "auto"
+MAX_AUTO_UPLOAD_WORKERS = 32
+
+
+def _upload_workers_setting():
+    return get_config_value(
+        *STAGE_UPLOAD_WORKERS_CONFIG_PATH,
+        key=STAGE_UPLOAD_WORKERS_CONFIG_KEY,
+        default=None,
+    )
+
+
+def _adaptive_upload_workers() -> bool:
+    raw = _upload_workers_setting()
+    return isinstance(raw, str) and raw.strip().lower() == UPLOAD_WORKERS_AUTO
+
 
 def _resolve_upload_workers() -> int:
     """Resolve the total upload-concurrency budget for recursive uploads.
 
     Read from the ``cli.stage_upload_workers`` config value
     (``SNOWFLAKE_CLI_STAGE_UPLOAD_WORKERS`` env var first, then ``config.toml``),
-    falling back to :data:`DEFAULT_UPLOAD_WORKERS`. An invalid value (non-integer
-    or less than 1) is rejected rather than silently ignored, so a typo surfaces.
+    falling back to :data:`DEFAULT_UPLOAD_WORKERS`, which is also the budget in
+    ``auto`` mode. An invalid value (non-integer or less than 1) is rejected
+    rather than silently ignored, so a typo surfaces.
     """
-    raw = get_config_value(
-        *STAGE_UPLOAD_WORKERS_CONFIG_PATH,
-        key=STAGE_UPLOAD_WORKERS_CONFIG_KEY,
-        default=None,
-    )
-    if raw is None:
+    raw = _upload_workers_setting()
+    if raw is None or _adaptive_upload_workers():
         return DEFAULT_UPLOAD_WORKERS
     try:
         value = int(raw)
     except (TypeError, ValueError):
         raise CliError(
             f"Invalid {STAGE_UPLOAD_WORKERS_ENV_VAR}={raw!r}: "
-            "expected a positive integer."
+            f"expected a positive integer or {UPLOAD_WORKERS_AUTO!r}."
         ) from None
     if value < 1:
         raise CliError(
@@ -105,11 +122,44 @@ def _resolve_upload_workers() -> int:
     return value
 
 
+def _split_transfer_budget(
+    parallel: int, budget: Optional[int] = None
+) -> tuple[int, int]:
+    """Split the transfer budget between directory fan-out and per-query PARALLEL.
+
+    Returns ``(parallel, dir_workers)``. ``parallel`` is first clamped into
+    ``[1, budget]`` so that ``dir_workers * parallel <= budget`` always holds;
+    without the clamp, a parallel larger than the budget would floor
+    ``dir_workers`` to 1 yet still spawn ``parallel`` threads per directory.
+    ``budget`` defaults to :func:`_resolve_upload_workers`.
+    """
+    budget = budget or _resolve_upload_workers()
+    parallel = min(budget, max(parallel, 1))
+    return parallel, max(1, budget // parallel)
+
+
 UNQUOTED_FILE_URI_REGEX = r"[\w/*?\-.=&{}$#[\]\"\\!@%^+:]+"
 AT_PREFIX = "@"
 USER_STAGE_PREFIX = "@~"
 SNOW_PREFIX = "snow://"
 
+PYTHON_EXECUTION_PROCEDURE_PREFIX = "snowflake_cli_execute_python_"
+_PYTHON_EXECUTION_HANDLER = dedent(
+    """\
+    import json
+    import os
+
+    from snowflake.snowpark.files import SnowflakeFile
+
+
+    def run(session, file_path, variables):
+        with SnowflakeFile.open(file_path, require_scoped_url=False) as f:
+            file_content = f.read()
+        wrapper = f"import os\\nos.environ.update({json.dumps(variables)})\\n"
+        exec(wrapper + file_content, {"__name__": "__main__"})
+    """
+)
+
 EXECUTE_SUPPORTED_FILES_FORMATS = (
     ".sql",
     ".py",
@@ -381,23 +431,141 @@ class StageManager(SqlExecutionMixin):
         )
 
     def get_recursive(
-        self, stage_path: str, dest_path: Path, parallel: int = 4
-    ) -> List[SnowflakeCursor]:
+        self,
+        stage_path: str,
+        dest_path: Path,
+        parallel: int = 4,
+        skip_identical: bool = False,
+    ) -> Generator[Union[SnowflakeCursor, dict], None, None]:
+        """Recursively download ``stage_path`` into ``dest_path``.
+
+        Listed files are grouped by their remote directory and each directory
+        is fetched with a single GET whose ``PATTERN`` selects only its direct
+        files, so a directory costs one round-trip instead of one per file.
+        These per-directory GETs run concurrently within the same budget as
+        :meth:`put_recursive`; cursors are yielded as each directory finishes.
+
+        With ``skip_identical``, files that already exist locally with the size
+        and md5sum listed on the stage are not downloaded; a ``SKIPPED`` result
+        row is yielded for each of them instead.
+        """
         stage_root = self.build_path(stage_path)
-
-        results = []
-        for file_path in self.iter_stage(stage_root):
+        parallel, dir_workers = _split_transfer_budget(parallel)
+
+        units: Dict[tuple[Path, str], List[StagePath]] = {}
+        listed_names: Dict[tuple[Path, str], List[str]] = {}
+        # directories where some of the direct files are not downloaded
+        partial: Set[tuple[Path, str]] = set()
+        skipped: List[dict] = []
+        md5_cache = LocalMD5Cache() if skip_identical else None
+        root_prefix = stage_root.absolute_path()
+        for file_path, file in self._iter_stage_listing(stage_root):
             local_dir = file_path.get_local_target_path(
                 target_dir=dest_path, stage_root=stage_root
             )
-            self._assure_is_existing_directory(local_dir)
+            listed_dir, _, listed_name = file["name"].rstrip("/").rpartition("/")
+            key = (local_dir, listed_dir)
+            if not f"{file_path.parent.absolute_path().rstrip('/')}/".startswith(
+                root_prefix
+            ):
+                # The root is a partial name (e.g. `@stage/dir/fi`), which
+                # selects only some of the files of this directory.
+                partial.add(key)
+            if md5_cache is not None and self._is_downloaded(
+                local_dir / file_path.name, file, md5_cache
+            ):
+                skipped.append(
+                    self._skipped_download_row(
+                        local_dir / file_path.name, dest_path, file["size"]
+                    )
+                )
+                partial.add(key)
+                continue
+            units.setdefault(key, []).append(file_path)
+            listed_names.setdefault(key, []).append(listed_name)
+
+        if md5_cache is not None:
+            md5_cache.save()
+        if skipped:
+            cli_console.message(
+                f"Skipped {len(skipped)} files identical to local copies "
+                f"({sum(row['size'] for row in skipped)} bytes not downloaded)."
+            )
+            yield from skipped
 
-            result = self.execute_query(
-                f"get {file_path.path_for_sql()} {self._to_uri(f'{local_dir}/')} parallel={parallel}"
+        def _download(
+            local_dir: Path, listed_dir: str, files: List[StagePath]
+        ) -> SnowflakeCursor:
+            self._assure_is_existing_directory(local_dir)
+            local_uri = self._to_uri(f"{local_dir}/")
+            if len(files) == 1:
+                return self.execute_query(
+                    f"get {files[0].path_for_sql()} {local_uri} parallel={parallel}"
+                )
+            # When the whole directory was listed, selecting its direct files
+            # by pattern downloads exactly the listed files. Otherwise the
+            # pattern is anchored to the names of the files to download.
+            key = (local_dir, listed_dir)
+            pattern = self._direct_files_pattern(
+                listed_dir, names=listed_names[key] if key in partial else None
+            )
+            return self.execute_query(
+                f"get {files[0].parent.path_for_sql()} {local_uri} "
+                f"parallel={parallel} pattern={pattern}"
             )
-            results.append(result)
 
-        return results
+        # See put_recursive: the connection ContextVar must be copied into
+        # each worker thread.
+        with ThreadPoolExecutor(max_workers=dir_workers) as executor:
+            futures = [
+                executor.submit(
+                    copy_context().run, _download, local_dir, listed_dir, files
+                )
+                for (local_dir, listed_dir), files in units.items()
+            ]
+            for future in as_completed(futures):
+                yield future.result()
+
+    @staticmethod
+    def _is_downloaded(
+        local_file: Path, listed_file: dict, md5_cache: LocalMD5Cache
+    ) -> bool:
+        """Is ``local_file`` identical to the file listed on the stage?
+
+        The size is compared first, so files that differ are not read. Stages
+        that do not list a plain or multi-part md5sum (e.g. with client-side
+        encryption) never match, and their files are always downloaded.
+        """
+        try:
+            if local_file.stat().st_size != listed_file.get("size"):
+                return False
+            return file_matches_md5sum(local_file, listed_file.get("md5"), md5_cache)
+        except (OSError, ValueError):
+            return False
+
+    @staticmethod
+    def _skipped_download_row(local_file: Path, dest_path: Path, size: int) -> dict:
+        return {
+            "file": local_file.relative_to(dest_path).as_posix(),
+            "size": size,
+            "status": "SKIPPED",
+            "message": "Identical to the local file",
+        }
+
+    @staticmethod
+    def _direct_files_pattern(
+        listed_dir: str, names: Optional[List[str]] = None
+    ) -> str:
+        """GET/LS ``PATTERN`` literal matching files directly inside ``listed_dir``.
+
+        ``listed_dir`` is the directory as it appears in ``ls`` output, which is
+        also what GET matches its pattern against. If ``names`` are given, only
+        files with those names match.
+        """
+        files = "(" + "|".join(map(re.escape, names)) + ")" if names else "[^/]*"
+        regex = f"{re.escape(listed_dir)}/{files}" if listed_dir else files
+        # Snowflake string literals treat `\` as an escape prefix.
+        return to_string_literal(regex.replace("\\", "\\\\"))
 
     def put(
         self,
@@ -465,23 +633,81 @@ class StageManager(SqlExecutionMixin):
                 dest_dir=temp_dir_with_copy,
             )
 
-    @contextmanager
-    def _prepared_upload_dir(
-        self, local_path: Path, temp_directory: Optional[Path]
-    ) -> Generator[Path, None, None]:
-        """Yield the directory whose tree should be uploaded.
+    @staticmethod
+    def _plan_upload_groups(
+        local_path: Path, temp_directory: Optional[Path] = None
+    ) -> Dict[Path, List[Path]]:
+        """Map each directory to upload (relative to the upload root) to its files.
+
+        ``local_path`` is a directory or a glob pattern, selecting the same files
+        as :meth:`copy_to_tmp_dir`. A ``temp_directory`` prepared by the caller
+        is uploaded whole instead, like ``os.walk`` would list it.
+        """
+        groups: Dict[Path, List[Path]] = {}
+        if temp_directory is not None:
+            StageManager._walk_upload_tree(
+                temp_directory, groups, include_hidden=True, follow_symlinks=False
+            )
+        elif local_path.is_file():
+            raise UsageError("Cannot use recursive upload with a single file.")
+        elif local_path.is_dir():
+            StageManager._walk_upload_tree(
+                local_path, groups, include_hidden=False, follow_symlinks=True
+            )
+        else:
+            root = Path([p for p in local_path.parents if p.is_dir()][0])
+            for match in glob.iglob(str(local_path), recursive=True):
+                file = Path(match)
+                if file.is_file():
+                    groups.setdefault(file.parent.relative_to(root), []).append(file)
+        return groups
+
+    @staticmethod
+    def _walk_upload_tree(
+        root: Path,
+        groups: Dict[Path, List[Path]],
+        include_hidden: bool,
+        follow_symlinks: bool,
+    ) -> None:
+        pending = [Path(".")]
+        while pending:
+            rel = pending.pop()
+            files = []
+            with os.scandir(root / rel) as entries:
+                for entry in entries:
+                    if not include_hidden and entry.name.startswith("."):
+                        continue
+                    if entry.is_file():
+                        files.append(root / rel / entry.name)
+                    elif entry.is_dir() and (follow_symlinks or not entry.is_symlink()):
+                        pending.append(rel / entry.name)
+            if files:
+                groups[rel] = files
+
+    @staticmethod
+    def _directly_uploadable_dir(files: List[Path]) -> Optional[Path]:
+        """Return the directory of ``files`` if a ``<dir>/*`` PUT selects exactly them.
 
-        When ``temp_directory`` is provided it is used as-is; otherwise a
-        ``TemporaryDirectory`` is created and ``local_path`` is materialized
-        into it (applying any glob filter). Used by :meth:`put_recursive`.
+        The connector expands the glob like :func:`glob.glob` (skipping hidden
+        entries) and raises on a directory among the matches.
         """
-        with TemporaryDirectory() if temp_directory is None else nullcontext(
-            str(temp_directory)
-        ) as tmp:  # type: ignore[attr-defined]
-            temp_dir_with_copy = Path(tmp)
-            if temp_directory is None:
-                self.copy_to_tmp_dir(local_path, temp_dir_with_copy)
-            yield temp_dir_with_copy
+        directory = files[0].parent
+        names = {file.name for file in files}
+        if (
+            "*" in str(directory)
+            or any(file.parent != directory for file in files)
+            or any(name.startswith(".") for name in names)
+        ):
+            return None
+        matched = 0
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.name.startswith("."):
+                    continue
+                if entry.name not in names or not entry.is_file():
+                    return None
+                matched += 1
+        return resolve_without_follow(directory) if matched == len(names) else None
 
     def put_recursive(
         self,
@@ -492,6 +718,7 @@ class StageManager(SqlExecutionMixin):
         role: Optional[str] = None,
         auto_compress: bool = False,
         temp_directory: Optional[Path] = None,
+        journal: Optional[UploadJournal] = None,
     ) -> Generator[dict, None, None]:
         """Recursively upload ``local_path`` to ``stage_path``.
 
@@ -512,74 +739,174 @@ class StageManager(SqlExecutionMixin):
         multiplies into ``budget * parallel`` threads, even when ``parallel``
         exceeds the budget. A caller whose files are small (e.g. DCM) passes
         ``parallel=1`` to spend the whole budget on fan-out; ``budget`` of 1
-        uploads one directory at a time.
+        uploads one directory at a time. With ``stage_upload_workers = "auto"``
+        the budget is :data:`MAX_AUTO_UPLOAD_WORKERS`, and the number of
+        directories uploaded at a time starts low and follows the measured PUT
+        latency and throughput (see :class:`AdaptiveUploadConcurrency`).
+
+        The source tree is walked once and never mutated. A directory is put
+        with a ``<dir>/*`` glob when that selects exactly its files to upload.
+        Otherwise (the connector raises on a directory inside a PUT glob, and a
+        pattern may select only some files) it is uploaded through an isolated
+        view linking only its files to upload.
+
+        With a ``journal``, each directory is recorded once uploaded, and
+        directories the journal already records are reported as ``SKIPPED``
+        instead of being uploaded again.
+        """
+        yield from self._put_directory_groups(
+            self._plan_upload_groups(local_path, temp_directory),
+            stage_path=stage_path,
+            parallel=parallel,
+            overwrite=overwrite,
+            role=role,
+            auto_compress=auto_compress,
+            journal=journal,
+        )
+        if journal is not None:
+            journal.finish()
+
+    def put_files(
+        self,
+        local_root: Path,
+        relative_paths: List[Path],
+        stage_path: str,
+        parallel: int = 4,
+        overwrite: bool = False,
+        role: Optional[str] = None,
+    ) -> Generator[dict, None, None]:
+        """Upload selected files under ``local_root`` to the same relative paths under ``stage_path``.
+
+        Uses the same engine as :meth:`put_recursive`: files sharing a directory
+        are uploaded with a single PUT, and directories are uploaded
+        concurrently within the same budget. Other files under ``local_root``
+        are not uploaded.
+        """
+        groups: Dict[Path, List[Path]] = {}
+        for relative_path in relative_paths:
+            groups.setdefault(relative_path.parent, []).append(
+                local_root / relative_path
+            )
+        yield from self._put_directory_groups(
+            groups,
+            stage_path=stage_path,
+            parallel=parallel,
+            overwrite=overwrite,
+            role=role,
+        )
+
+    def _put_directory_groups(
+        self,
+        groups: Dict[Path, List[Path]],
+        stage_path: str,
+        parallel: int,
+        overwrite: bool,
+        role: Optional[str],
+        auto_compress: bool = False,
+        journal: Optional[UploadJournal] = None,
+    ) -> Generator[dict, None, None]:
+        """Upload each group of files to its directory (relative to ``stage_path``) with one PUT.
 
-        The connector raises on a directory inside a PUT glob, so each directory
-        is uploaded through an isolated view containing only its direct files.
-        The source tree is never mutated.
+        See :meth:`put_recursive` for how the transfer budget is split, and for
+        how the ``journal`` is used.
         """
-        budget = _resolve_upload_workers()
-        # Clamp the per-PUT PARALLEL into [1, budget] before splitting the
-        # budget, so it stays a genuine hard cap on total upload threads:
-        # dir_workers * parallel == (budget // parallel) * parallel <= budget.
-        # Without the clamp, a parallel larger than the budget would floor
-        # dir_workers to 1 yet still spawn `parallel` PUT threads per directory,
-        # exceeding the budget.
-        parallel = min(budget, max(parallel, 1))
-        dir_workers = max(1, budget // parallel)
-
-        with self._prepared_upload_dir(
-            local_path, temp_directory
-        ) as temp_dir_with_copy:
-            base = StagePath.from_stage_str(stage_path)
-
-            with TemporaryDirectory() as iso_root_str:
-                iso_root = Path(iso_root_str)
-                units: list[tuple[Path, StagePath, Path]] = []
-                for idx, (dirpath, _dirnames, filenames) in enumerate(
-                    os.walk(temp_dir_with_copy)
-                ):
-                    source_dir = Path(dirpath)
-                    files = [f for f in filenames if (source_dir / f).is_file()]
-                    if not files:
+        concurrency: Optional[AdaptiveUploadConcurrency] = None
+        if _adaptive_upload_workers():
+            parallel, dir_workers = _split_transfer_budget(
+                parallel, budget=MAX_AUTO_UPLOAD_WORKERS
+            )
+            concurrency = AdaptiveUploadConcurrency(max_limit=dir_workers)
+        else:
+            parallel, dir_workers = _split_transfer_budget(parallel)
+        base = StagePath.from_stage_str(stage_path)
+
+        with ExitStack() as stack:
+            iso_root: Optional[Path] = None
+            units: deque[tuple[Path, StagePath, Path, int]] = deque()
+            unit_keys: Dict[Path, str] = {}
+            for idx, (rel, files) in enumerate(groups.items()):
+                destination = base if rel == Path(".") else base / rel
+                if journal is not None:
+                    unit_key = journal.unit_key(destination, files)
+                    if journal.is_completed(unit_key):
+                        yield from self._skipped_upload_rows(rel, destination, files)
                         continue
-                    rel = source_dir.relative_to(temp_dir_with_copy)
-                    iso_dir = iso_root / str(idx)
-                    iso_dir.mkdir(parents=True, exist_ok=True)
-                    for name in files:
-                        self._link_or_copy_file(source_dir / name, iso_dir / name)
-                    destination = base if rel == Path(".") else base / rel
-                    units.append((iso_dir, destination, rel))
-
-                def _upload(unit: tuple[Path, StagePath, Path]) -> list[dict]:
-                    iso_dir, destination, rel = unit
-                    rows: list[dict] = self.put(
-                        local_path=iso_dir,
-                        stage_path=destination,
-                        parallel=parallel,
-                        overwrite=overwrite,
-                        role=role,
-                        auto_compress=auto_compress,
-                        use_dict_cursor=True,
-                    ).fetchall()
-                    for item in rows:
-                        source_name = item["source"]
-                        item["source"] = (
-                            source_name if rel == Path(".") else str(rel / source_name)
-                        )
-                        item["target"] = str(destination / item["target"])
-                    return rows
-
-                # The Snowflake connection lives in a ContextVar that does not
-                # propagate to worker threads, so run each upload inside a copy
-                # of the calling thread's context (captured on this thread).
-                with ThreadPoolExecutor(max_workers=dir_workers) as executor:
-                    futures = [
-                        executor.submit(copy_context().run, _upload, unit)
-                        for unit in units
-                    ]
-                    for future in as_completed(futures):
-                        yield from future.result()
+                    unit_keys[rel] = unit_key
+                size = sum(file.stat().st_size for file in files)
+                upload_dir = self._directly_uploadable_dir(files)
+                if upload_dir is None:
+                    if iso_root is None:
+                        iso_root = Path(stack.enter_context(TemporaryDirectory()))
+                    upload_dir = iso_root / str(idx)
+                    upload_dir.mkdir(parents=True, exist_ok=True)
+                    for file in files:
+                        self._link_or_copy_file(file, upload_dir / file.name)
+                units.append((upload_dir, destination, rel, size))
+
+            def _upload(unit: tuple[Path, StagePath, Path, int]) -> list[dict]:
+                upload_dir, destination, rel, _ = unit
+                rows: list[dict] = self.put(
+                    local_path=upload_dir,
+                    stage_path=destination,
+                    parallel=parallel,
+                    overwrite=overwrite,
+                    auto_compress=auto_compress,
+                    use_dict_cursor=True,
+                ).fetchall()
+                for item in rows:
+                    source_name = item["source"]
+                    item["source"] = (
+                        source_name if rel == Path(".") else str(rel / source_name)
+                    )
+                    item["target"] = str(destination / item["target"])
+                return rows
+
+            # The workers share one session, so the role is switched once for
+            # the whole batch (as in remove_many) rather than by each PUT.
+            if role and units:
+                stack.enter_context(self.use_role(role))
+            # The Snowflake connection lives in a ContextVar that does not
+            # propagate to worker threads, so run each upload inside a copy
+            # of the calling thread's context (captured on this thread).
+            # Directories are submitted as workers free up, so that the number
+            # of uploads in flight can follow the adaptive limit. A failure
+            # leaves the remaining directories unsubmitted.
+            running: dict = {}
+            with ThreadPoolExecutor(max_workers=dir_workers) as executor:
+                while units or running:
+                    limit = concurrency.limit if concurrency else dir_workers
+                    while units and len(running) < limit:
+                        unit = units.popleft()
+                        future = executor.submit(copy_context().run, _upload, unit)
+                        running[future] = (unit, time.monotonic())
+                    done, _ = wait(running, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        (_, _, rel, size), started = running.pop(future)
+                        rows = future.result()
+                        if concurrency is not None:
+                            concurrency.record(size, time.monotonic() - started)
+                        if journal is not None:
+                            journal.complete(unit_keys[rel])
+                        yield from rows
+            if concurrency is not None:
+                concurrency.report()
+
+    @staticmethod
+    def _skipped_upload_rows(
+        rel: Path, destination: StagePath, files: List[Path]
+    ) -> Generator[dict, None, None]:
+        for file in files:
+            size = file.stat().st_size
+            yield {
+                "source": file.name if rel == Path(".") else str(rel / file.name),
+                "target": str(destination / file.name),
+                "source_size": size,
+                "target_size": size,
+                "source_compression": "NONE",
+                "target_compression": "NONE",
+                "status": "SKIPPED",
+                "message": "Uploaded by a previous run",
+            }
 
     @staticmethod
     def _link_or_copy_file(src: Path, dst: Path) -> None:
@@ -592,7 +919,12 @@ class StageManager(SqlExecutionMixin):
                 dst.parent.mkdir(parents=True, exist_ok=True)
             shutil.copyfile(absolute_src, dst)
 
-    def copy_files(self, source_path: str, destination_path: str) -> SnowflakeCursor:
+    def copy_files(
+        self,
+        source_path: str,
+        destination_path: str,
+        files: Optional[List[str]] = None,
+    ) -> SnowflakeCursor:
         source_stage_path = self.build_path(source_path)
         # We copy only into stage
         destination_stage_path = StagePath.from_stage_str(destination_path)
@@ -608,6 +940,9 @@ class StageManager(SqlExecutionMixin):
         # Destination needs to end with /
         dest = destination_stage_path.absolute_path().rstrip("/") + "/"
         query = f"copy files into {dest} from {source_stage_path}"
+        if files:
+            # copy only these files, relative to source_path
+            query += f" files = ({', '.join(to_string_literal(f) for f in files)})"
         return self.execute_query(query)
 
     def remove(
@@ -623,6 +958,54 @@ class StageManager(SqlExecutionMixin):
             stage_path = self.build_path(stage_name) / path
             return self.execute_query(f"remove {stage_path.path_for_sql()}")
 
+    def remove_many(
+        self, stage_name: str, paths: List[str], role: Optional[str] = None
+    ) -> List[SnowflakeCursor]:
+        """
+        Removes each of the given file paths from a Snowflake stage.
+        The role is switched once for the whole batch rather than once per file,
+        and the REMOVE statements run concurrently within the transfer budget of
+        :meth:`put_recursive`. Returns one cursor per path, in the order given,
+        each listing the file it removed.
+
+        Every path is attempted; if any could not be removed, raises
+        SnowflakeSQLExecutionError listing those paths with their errors.
+        """
+        if not paths:
+            return []
+
+        def _remove(path: str) -> SnowflakeCursor:
+            cursor = self.remove(stage_name=stage_name, path=path)
+            log.debug("Removed %s from stage %s", path, stage_name)
+            return cursor
+
+        with self.use_role(role) if role else nullcontext():
+            workers = min(_resolve_upload_workers(), len(paths))
+            # See put_recursive: the connection ContextVar must be copied into
+            # each worker thread.
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                futures = [
+                    executor.submit(copy_context().run, _remove, path) for path in paths
+                ]
+                wait(futures)
+
+        failed = {
+            path: future.exception()
+            for path, future in zip(paths, futures)
+            if future.exception() is not None
+        }
+        if failed:
+            for path, err in failed.items():
+                log.error(
+                    "Could not remove %s from stage %s: %s", path, stage_name, err
+                )
+            raise SnowflakeSQLExecutionError(
+                f"Could not remove {len(failed)} of {len(paths)} files from "
+                f"{stage_name}:\n"
+                + "\n".join(f"{path}: {err}" for path, err in failed.items())
+            )
+        return [future.result() for future in futures]
+
     def create(
         self,
         fqn: FQN,
@@ -642,6 +1025,20 @@ class StageManager(SqlExecutionMixin):
         return self.execute_query(query)
 
     def iter_stage(self, stage_path: StagePath):
+        for path, _ in self._iter_stage_with_names(stage_path):
+            yield path
+
+    def _iter_stage_with_names(
+        self, stage_path: StagePath
+    ) -> Generator[tuple[StagePath, str], None, None]:
+        """Like :meth:`iter_stage`, also yielding each file's name as listed."""
+        for path, file in self._iter_stage_listing(stage_path):
+            yield path, file["name"]
+
+    def _iter_stage_listing(
+        self, stage_path: StagePath
+    ) -> Generator[tuple[StagePath, dict], None, None]:
+        """Like :meth:`iter_stage`, also yielding each file's ``ls`` row."""
         for file in self.list_files(stage_path.absolute_path()).fetchall():
             if stage_path.is_user_stage():
                 path = StagePath.get_user_stage() / file["name"]
@@ -661,7 +1058,7 @@ class StageManager(SqlExecutionMixin):
                     if relative_path
                     else stage_path.root_path()
                 )
-            yield path
+            yield path, file
 
     def execute(
         self,
@@ -669,7 +1066,16 @@ class StageManager(SqlExecutionMixin):
         on_error: OnErrorType,
         variables: Optional[List[str]] = None,
         requires_temporary_stage: bool = False,
+        parallel: int = 1,
     ):
+        """Execute the SQL and Python files matching ``stage_path_str``.
+
+        Files run in alphabetical order, directories last. With ``parallel``
+        greater than 1, up to ``parallel`` files run at the same time, each
+        statement on its own cursor, and results keep the same order. With
+        ``OnErrorType.BREAK`` the first failure stops files from starting and is
+        raised once the files already running have finished.
+        """
         if requires_temporary_stage:
             (
                 stage_path_parts,
@@ -711,14 +1117,13 @@ class StageManager(SqlExecutionMixin):
         parsed_variables = [Variable(k, v) for k, v in merged_vars_dict.items()]
         sql_variables = self.parse_execute_variables(parsed_variables)
         python_variables = self._parse_python_variables(parsed_variables)
-        results = []
 
         if any(file.endswith(".py") for file in sorted_file_path_list):
             self._python_exe_procedure = self._bootstrap_snowpark_execution_environment(
                 stage_path
             )
 
-        for file_path in sorted_file_path_list:
+        def _execute_file(file_path: str) -> Dict:
             file_stage_path = stage_path_parts.add_stage_prefix(file_path)
 
             # For better reporting push down the information about original
@@ -729,21 +1134,51 @@ class StageManager(SqlExecutionMixin):
                 original_path = file_stage_path
 
             if file_path.endswith(".py"):
-                result = self._execute_python(
+                return self._execute_python(
                     file_stage_path=file_stage_path,
                     on_error=on_error,
                     variables=python_variables,
                     original_file=original_path,
                 )
-            else:
-                result = self._call_execute_immediate(
-                    file_stage_path=file_stage_path,
-                    variables=sql_variables,
-                    on_error=on_error,
-                    original_file=original_path,
-                )
-            results.append(result)
+            return self._call_execute_immediate(
+                file_stage_path=file_stage_path,
+                variables=sql_variables,
+                on_error=on_error,
+                original_file=original_path,
+            )
 
+        if parallel <= 1 or len(sorted_file_path_list) == 1:
+            return [_execute_file(file_path) for file_path in sorted_file_path_list]
+
+        failed = threading.Event()
+
+        def _execute_file_unless_failed(file_path: str) -> Optional[Dict]:
+            # Only OnErrorType.BREAK lets an execution error through.
+            if failed.is_set():
+                return None
+            try:
+                return _execute_file(file_path)
+            except BaseException:
+                failed.set()
+                raise
+
+        results: List[Optional[Dict]] = [None] * len(sorted_file_path_list)
+        # Like uploads, run each file in a copy of this thread's context so
+        # that the workers see the connection.
+        with ThreadPoolExecutor(max_workers=parallel) as executor:
+            futures = {
+                executor.submit(
+                    copy_context().run, _execute_file_unless_failed, file_path
+                ): idx
+                for idx, file_path in enumerate(sorted_file_path_list)
+            }
+            try:
+                for future in as_completed(futures):
+                    results[futures[future]] = future.result()
+            except BaseException:
+                for future in futures:
+                    future.cancel()
+                raise
         return results
 
     def _create_temporary_copy_of_stage(
@@ -921,43 +1356,66 @@ class StageManager(SqlExecutionMixin):
 
         return [req.package_name for req in requirements]
 
-    def _bootstrap_snowpark_execution_environment(self, stage_path: StagePath):
-        """Prepares Snowpark session for executing Python code remotely."""
-        try:
-            from snowflake.snowpark.functions import sproc
-        except ImportError:
-            raise CliError(
-                "Executing Python files requires the snowflake-snowpark-python package. "
-                "Please install it and try again."
-            )
-
-        self.snowpark_session.add_packages("snowflake-snowpark-python")
-        self.snowpark_session.add_packages("snowflake.core")
-        requirements = self._check_for_requirements_file(stage_path)
-        self.snowpark_session.add_packages(*requirements)
-
-        @sproc(is_permanent=False, session=self.snowpark_session)
-        def _python_execution_procedure(
-            _: Session, file_path: str, variables: Dict | None = None
-        ) -> None:
-            """Snowpark session-scoped stored procedure to execute content of provided Python file."""
-            import json
-
-            from snowflake.snowpark.files import SnowflakeFile
-
-            with SnowflakeFile.open(file_path, require_scoped_url=False) as f:
-                file_content: str = f.read()  # type: ignore
+    def _bootstrap_snowpark_execution_environment(self, stage_path: StagePath) -> str:
+        """Returns the name of the procedure executing Python files from stage.
 
-            wrapper = dedent(
-                f"""\
-                import os
-                os.environ.update({json.dumps(variables)})
-                """
+        The procedure is named by a hash of its handler, packages and runtime, so it
+        is created only when one of them changes, and later executions skip package
+        resolution. A procedure of that name could also be created by someone else,
+        so it runs with the rights of the caller and is only used if its definition
+        is the expected one.
+        """
+        packages = sorted(
+            {
+                "snowflake-snowpark-python",
+                "snowflake.core",
+                *self._check_for_requirements_file(stage_path),
+            }
+        )
+        runtime = f"{sys.version_info.major}.{sys.version_info.minor}"
+        key = hashlib.sha256(
+            json.dumps([_PYTHON_EXECUTION_HANDLER, packages, runtime]).encode()
+        ).hexdigest()
+        name = f"{PYTHON_EXECUTION_PROCEDURE_PREFIX}{key[:32]}".upper()
+        self.execute_query(
+            f"create procedure if not exists {name}(file_path string, variables variant)\n"
+            f"returns string language python runtime_version = '{runtime}'\n"
+            f"packages = ({', '.join(to_string_literal(p) for p in packages)})\n"
+            f"handler = 'run'\n"
+            f"execute as caller\n"
+            f"as $${_PYTHON_EXECUTION_HANDLER}$$"
+        )
+        self._check_python_execution_procedure(name, packages, runtime)
+        return name
+
+    def _check_python_execution_procedure(
+        self, name: str, packages: List[str], runtime: str
+    ) -> None:
+        rows = self.execute_query(
+            f"describe procedure {name}(string, variant)", cursor_class=DictCursor
+        ).fetchall()
+        properties = {
+            str(row["property"]).lower(): str(row["value"])
+            for row in cast(List[Dict[str, Any]], rows)
+        }
+        expected = {
+            "body": _PYTHON_EXECUTION_HANDLER.strip(),
+            "handler": "run",
+            "runtime_version": runtime,
+            "execute as": "CALLER",
+        }
+        if (
+            any(
+                properties.get(prop, "").strip() != value
+                for prop, value in expected.items()
+            )
+            or sorted(re.findall(r"'([^']*)'", properties.get("packages", "")))
+            != packages
+        ):
+            raise CliError(
+                f"Procedure {name} used to execute Python files has an unexpected "
+                "definition. Drop it and try again."
             )
-
-            exec(wrapper + file_content)
-
-        return _python_execution_procedure
 
     def _execute_python(
         self,
@@ -967,15 +1425,20 @@ class StageManager(SqlExecutionMixin):
         original_file: str,
     ):
         """
-        Executes Python file from stage using a Snowpark temporary procedure.
+        Executes Python file from stage using the procedure from
+        :meth:`_bootstrap_snowpark_execution_environment`.
         Currently, there's no option to pass input to the execution.
         """
-        from snowflake.snowpark.exceptions import SnowparkSQLException
-
         try:
             log.info("Executing Python file: %s", file_stage_path)
-            self._python_exe_procedure(self.get_standard_stage_prefix(file_stage_path), variables, session=self.snowpark_session)  # type: ignore
+            file_path = to_string_literal(
+                self.get_standard_stage_prefix(file_stage_path)
+            )
+            self.execute_query(
+                f"call {self._python_exe_procedure}({file_path}, "
+                f"parse_json({to_string_literal(json.dumps(variables))}))"
+            )
             return StageManager._success_result(file=original_file)
-        except SnowparkSQLException as e:
+        except ProgrammingError as e:
             StageManager._handle_execution_exception(on_error=on_error, exception=e)
-            return StageManager._error_result(file=original_file, msg=e.message)
+            return StageManager._error_result(file=original_file, msg=e.msg or str(e))
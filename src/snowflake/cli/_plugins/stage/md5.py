@@ -15,24 +15,38 @@
 from __future__ import annotations
 
 import hashlib
+import io
+import json
 import logging
 import math
 import os.path
 import re
+import threading
+import time
 from pathlib import Path
-from typing import List, Tuple
+from typing import Dict, List, Optional, Tuple, cast
 
 from click.exceptions import ClickException
+from snowflake.cli.api.config import get_config_manager
 from snowflake.cli.api.secure_path import UNLIMITED, SecurePath
 
 ONE_MEGABYTE = 1024**2
-READ_BUFFER_BYTES = 64 * 1024
+# hashlib releases the GIL while digesting large buffers, so big reads let
+# several files be hashed in parallel threads (see compute_stage_diff)
+READ_BUFFER_BYTES = 1024**2
 MD5SUM_REGEX = r"^[A-Fa-f0-9]{32}$"
 MULTIPART_MD5SUM_REGEX = r"^([A-Fa-f0-9]{32})-(\d+)$"
 S3_MIN_PART_SIZE = 5 * 1024**2
 S3_MAX_PARTS = 10000
 S3_CHUNK_SIZE = 8388608
 
+MD5_CACHE_FILE_NAME = ".stage_md5.cache"
+MD5_CACHE_FILE_LIMIT_MB = 128
+MD5_CACHE_MAX_ENTRIES = 200_000
+# Files modified this recently are not cached: a write within the same mtime
+# tick could otherwise leave a stale entry that still matches size and mtime.
+MD5_CACHE_MIN_AGE_NS = 2 * 10**9
+
 log = logging.getLogger(__name__)
 
 
@@ -78,16 +92,21 @@ def compute_md5sum(file: Path, chunk_size: int | None = None) -> str:
         # simple md5 with no content
         return hashlib.md5().hexdigest()
 
-    with SecurePath(file).open("rb", read_file_limit_mb=UNLIMITED) as f:
+    with SecurePath(file).open("rb", read_file_limit_mb=UNLIMITED) as handle:
+        # files opened in binary mode are buffered readers
+        f = cast(io.BufferedReader, handle)
         md5s: List[hashlib._Hash] = []  # noqa: SLF001
         hasher = hashlib.md5()
 
+        # read into a single reused buffer to avoid allocating per read
+        buf = memoryview(bytearray(min(READ_BUFFER_BYTES, file_size)))
+
         remains = file_size
         remains_in_chunk: int = min(chunk_size, remains) if chunk_size else remains
         while remains > 0:
             sz = min(READ_BUFFER_BYTES, remains_in_chunk)
-            buf = f.read(sz)
-            hasher.update(buf)
+            read = f.readinto(buf[:sz])
+            hasher.update(buf[:read])
             remains_in_chunk -= sz
             remains -= sz
             if remains_in_chunk == 0:
@@ -106,7 +125,112 @@ def compute_md5sum(file: Path, chunk_size: int | None = None) -> str:
         return f"{digests_md5.hexdigest()}-{len(md5s)}"
 
 
-def file_matches_md5sum(local_file: Path, remote_md5: str | None) -> bool:
+class LocalMD5Cache:
+    """
+    Persistent index of md5sums computed for local files, stored next to the
+    CLI configuration file, so that unchanged files are not re-read by every
+    stage diff.
+
+    Entries are keyed by absolute path and are only trusted while the file's
+    size, mtime_ns and inode are unchanged. Each entry holds the plain md5sum
+    and any multi-part md5sums computed for it, keyed by chunk size.
+    """
+
+    def __init__(self, cache_file: Optional[SecurePath] = None):
+        self._cache_file = cache_file or SecurePath(
+            get_config_manager().file_path.parent / MD5_CACHE_FILE_NAME
+        )
+        self._entries: Optional[Dict[str, list]] = None
+        self._dirty = False
+        self._lock = threading.Lock()
+
+    def _load(self) -> Dict[str, list]:
+        if self._entries is None:
+            self._entries = {}
+            if self._cache_file.exists():
+                try:
+                    self._entries = json.loads(
+                        self._cache_file.read_text(
+                            file_size_limit_mb=MD5_CACHE_FILE_LIMIT_MB
+                        )
+                    )
+                except Exception:  # a broken cache is just an empty cache
+                    log.debug("Ignoring unreadable md5 cache", exc_info=True)
+        return self._entries
+
+    def md5sum(self, file: Path, chunk_size: int | None = None) -> str:
+        """
+        Returns the same checksum as compute_md5sum, reading the file only if
+        no valid cached value exists.
+        """
+        key = os.path.abspath(file)
+        stat = os.stat(file)
+        fingerprint = [stat.st_size, stat.st_mtime_ns, stat.st_ino]
+        variant = str(chunk_size or 0)
+
+        with self._lock:
+            entries = self._load()
+            entry = entries.pop(key, None)
+            if entry is not None and entry[:3] == fingerprint:
+                # re-insert to keep the most recently used entries last
+                entries[key] = entry
+                if variant in entry[3]:
+                    return entry[3][variant]
+
+        md5 = compute_md5sum(file, chunk_size)
+
+        if time.time_ns() - stat.st_mtime_ns < MD5_CACHE_MIN_AGE_NS:
+            return md5
+        with self._lock:
+            entry = entries.get(key)
+            if entry is None or entry[:3] != fingerprint:
+                entry = entries[key] = [*fingerprint, {}]
+            entry[3][variant] = md5
+            self._dirty = True
+        return md5
+
+    def save(self) -> None:
+        """
+        Writes the cache to disk if anything changed, keeping only the most
+        recently used entries.
+        """
+        with self._lock:
+            if not self._dirty or self._entries is None:
+                return
+            entries = self._entries
+            if len(entries) > MD5_CACHE_MAX_ENTRIES:
+                entries = dict(list(entries.items())[-MD5_CACHE_MAX_ENTRIES:])
+            try:
+                self._cache_file.parent.mkdir(parents=True, exist_ok=True)
+                # write aside and swap, so a concurrent reader never sees a partial file
+                tmp_file = SecurePath(f"{self._cache_file.path}.{os.getpid()}.tmp")
+                tmp_file.write_text(json.dumps(entries, separators=(",", ":")))
+                os.replace(tmp_file.path, self._cache_file.path)
+                self._dirty = False
+            except OSError:  # not crucial, the next diff just rehashes
+                log.debug("Failed to save md5 cache", exc_info=True)
+
+
+def size_rules_out_md5sum(file_size: int, remote_md5: str) -> bool:
+    """
+    Can a local file of the given size be ruled out as a match for remote_md5
+    without reading it?
+
+    File sizes reported by stages are not always accurate, so only the md5sum
+    itself is used: every chunk size file_matches_md5sum tries is at least one
+    megabyte, so a file split into N parts is bigger than N - 1 megabytes.
+    """
+    if md5_and_chunks := parse_multipart_md5sum(remote_md5):
+        (_, num_chunks) = md5_and_chunks
+        return file_size <= (num_chunks - 1) * ONE_MEGABYTE
+    return False
+
+
+def file_matches_md5sum(
+    local_file: Path,
+    remote_md5: str | None,
+    md5_cache: Optional[LocalMD5Cache] = None,
+) -> bool:
     """
     Try a few different md5sums to determine if a local file is identical
     to a file that has a given remote md5sum.
@@ -114,20 +238,26 @@ def file_matches_md5sum(local_file: Path, remote_md5: str | None) -> bool:
     Handles the multi-part md5sums generated by e.g. AWS S3, using values
     from the Python connector to make educated guesses on chunk size.
 
-    Assumes that upload time would dominate local hashing time.
+    Assumes that upload time would dominate local hashing time. If md5_cache
+    is given, checksums already computed for an unchanged file are reused.
     """
     if not remote_md5:
         # no hash available
         return False
 
+    md5sum = md5_cache.md5sum if md5_cache is not None else compute_md5sum
+
     if is_md5sum(remote_md5):
         # regular hash
-        return compute_md5sum(local_file) == remote_md5
+        return md5sum(local_file) == remote_md5
 
     if md5_and_chunks := parse_multipart_md5sum(remote_md5):
         # multi-part hash (e.g. aws)
         (_, num_chunks) = md5_and_chunks
         file_size = os.path.getsize(local_file)
+        if size_rules_out_md5sum(file_size, remote_md5):
+            log.debug("multi-part md5: %s too small for %s", local_file, remote_md5)
+            return False
 
         # If this file uses the maximum number of parts supported by the cloud backend,
         # the chunk size is likely not a clean multiple of a megabyte. Try reverse engineering
@@ -135,7 +265,7 @@ def file_matches_md5sum(local_file: Path, remote_md5: str | None) -> bool:
         # At time of writing this logic would trigger for files >= 80GiB (python connector)
         if num_chunks == S3_MAX_PARTS:
             chunk_size = max(math.ceil(file_size / S3_MAX_PARTS), S3_MIN_PART_SIZE)
-            if compute_md5sum(local_file, chunk_size) == remote_md5:
+            if md5sum(local_file, chunk_size) == remote_md5:
                 return True
 
         # Estimates the chunk size the multi-part file must have been uploaded with
@@ -152,7 +282,7 @@ def file_matches_md5sum(local_file: Path, remote_md5: str | None) -> bool:
             # -1 because we don't want to add an extra chunk when file_size is an exact multiple of num_chunks * chunk_size_alignment
             multiplier = 1 + ((file_size - 1) // (num_chunks * chunk_size_alignment))
             chunk_size = multiplier * chunk_size_alignment
-            if compute_md5sum(local_file, chunk_size) == remote_md5:
+            if md5sum(local_file, chunk_size) == remote_md5:
                 return True
 
         # we were unable to figure out the chunk size, or the files are different
@@ -0,0 +1,108 @@
+# Copyright (c) 2024 Snowflake Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import annotations
+
+import logging
+import time
+from typing import Callable, Optional
+
+from snowflake.cli.api.cli_global_context import get_cli_context
+from snowflake.cli.api.metrics import CLICounterField
+
+log = logging.getLogger(__name__)
+
+
+class AdaptiveUploadConcurrency:
+    """
+    Adjusts the number of directories uploaded at the same time (AIMD).
+
+    Completed uploads are measured in rounds of ``limit`` uploads. After each
+    round the limit grows by one, unless the round's mean PUT latency exceeded
+    ``latency_tolerance`` times the lowest latency seen while throughput did not
+    improve on the best round so far: extra uploads were then only queuing on the
+    link, so the limit is halved.
+    """
+
+    def __init__(
+        self,
+        max_limit: int,
+        initial_limit: int = 2,
+        latency_tolerance: float = 2.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_limit = max(1, max_limit)
+        self.limit = min(self.max_limit, max(1, initial_limit))
+        self.peak_limit = self.limit
+        self.decreases = 0
+        self._latency_tolerance = latency_tolerance
+        self._clock = clock
+        self._min_latency: Optional[float] = None
+        self._best_throughput = 0.0
+        self._round_start = clock()
+        self._round_bytes = 0
+        self._round_latency = 0.0
+        self._round_size = 0
+
+    def record(self, size: int, latency: float) -> None:
+        """Records an upload of ``size`` bytes whose PUT took ``latency`` seconds."""
+        if self._min_latency is None or latency < self._min_latency:
+            self._min_latency = latency
+        self._round_bytes += size
+        self._round_latency += latency
+        self._round_size += 1
+        if self._round_size >= self.limit:
+            self._finish_round()
+
+    def _finish_round(self) -> None:
+        elapsed = max(self._clock() - self._round_start, 1e-6)
+        throughput = self._round_bytes / elapsed
+        mean_latency = self._round_latency / self._round_size
+        congested = (
+            mean_latency > self._latency_tolerance * (self._min_latency or 0)
+            and throughput <= self._best_throughput
+        )
+
+        previous = self.limit
+        if congested:
+            self.limit = max(1, self.limit // 2)
+            self.decreases += 1
+        else:
+            self.limit = min(self.max_limit, self.limit + 1)
+        self.peak_limit = max(self.peak_limit, self.limit)
+        self._best_throughput = max(self._best_throughput, throughput)
+        log.debug(
+            "Upload round: %.0f B/s, mean PUT latency %.3fs, concurrency %d -> %d",
+            throughput,
+            mean_latency,
+            previous,
+            self.limit,
+        )
+
+        self._round_start = self._clock()
+        self._round_bytes = 0
+        self._round_latency = 0.0
+        self._round_size = 0
+
+    def report(self) -> None:
+        """Logs the tuning result and records the use of the feature in CLI metrics."""
+        log.debug(
+            "Adaptive upload concurrency finished at %d (peak %d, %d decreases)",
+            self.limit,
+            self.peak_limit,
+            self.decreases,
+        )
+        get_cli_context().metrics.set_counter(
+            CLICounterField.STAGE_UPLOAD_WORKERS_AUTO, 1
+        )
@@ -0,0 +1,97 @@
+# Copyright (c) 2024 Snowflake Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+from pathlib import Path
+from typing import List, Optional, Set
+
+from snowflake.cli.api.config import get_config_manager
+from snowflake.cli.api.secure_path import SecurePath
+from snowflake.cli.api.stage_path import StagePath
+
+UPLOAD_JOURNAL_DIR_NAME = ".stage_upload_journal"
+UPLOAD_JOURNAL_FILE_LIMIT_MB = 64
+
+log = logging.getLogger(__name__)
+
+
+class UploadJournal:
+    """
+    Records which directories of a recursive upload have completed, so that an
+    interrupted upload of the same source to the same destination can be resumed.
+
+    Each upload has its own journal file, stored next to the CLI configuration file
+    and removed once the upload finishes. A directory is identified by its stage
+    destination and the name, size and mtime_ns of each of its files, so a directory
+    that changed since it was uploaded is uploaded again.
+    """
+
+    def __init__(
+        self,
+        local_path: Path,
+        stage_path: str,
+        auto_compress: bool = False,
+        resume: bool = False,
+        journal_dir: Optional[SecurePath] = None,
+    ):
+        journal_dir = journal_dir or SecurePath(
+            get_config_manager().file_path.parent / UPLOAD_JOURNAL_DIR_NAME
+        )
+        upload = json.dumps([str(local_path.absolute()), stage_path, auto_compress])
+        self._file = journal_dir / f"{_sha256(upload)}.jsonl"
+        self._completed: Set[str] = set()
+
+        if resume and self._file.exists():
+            with self._file.open(
+                "r", read_file_limit_mb=UPLOAD_JOURNAL_FILE_LIMIT_MB
+            ) as fd:
+                self._completed = {line.strip() for line in fd if line.strip()}
+            log.info(
+                "Resuming upload, %d directories already uploaded",
+                len(self._completed),
+            )
+        else:
+            self._file.unlink(missing_ok=True)
+
+    @staticmethod
+    def unit_key(destination: StagePath, files: List[Path]) -> str:
+        fingerprint: List[object] = [str(destination)]
+        for file in sorted(files, key=lambda f: f.name):
+            stat = file.stat()
+            fingerprint.append([file.name, stat.st_size, stat.st_mtime_ns])
+        return _sha256(json.dumps(fingerprint))
+
+    def is_completed(self, unit_key: str) -> bool:
+        return unit_key in self._completed
+
+    def complete(self, unit_key: str) -> None:
+        self._completed.add(unit_key)
+        try:
+            self._file.parent.mkdir(parents=True, exist_ok=True)
+            with self._file.open("a") as fd:
+                fd.write(unit_key + "\n")
+        except OSError:  # not crucial, the directory is uploaded again on resume
+            log.debug("Failed to record uploaded directory", exc_info=True)
+
+    def finish(self) -> None:
+        """Removes the journal of an upload that completed."""
+        self._file.unlink(missing_ok=True)
+
+
+def _sha256(value: str) -> str:
+    return hashlib.sha256(value.encode()).hexdigest()
@@ -0,0 +1,86 @@
+# Copyright (c) 2024 Snowflake Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import annotations
+
+import heapq
+from dataclasses import dataclass, field
+from typing import Dict, List
+
+from snowflake.connector.cursor import DictCursor
+
+from .diff import relative_to_stage_path
+from .manager import StageManager, StagePathParts
+
+ROOT_PREFIX = "/"
+
+
+@dataclass
+class StageUsage:
+    """Sizes and numbers of files on a stage, in total and per prefix."""
+
+    size: int = 0
+    files: int = 0
+    prefixes: Dict[str, List[int]] = field(default_factory=dict)
+    "Prefix -> [size, number of files]"
+
+    def add(self, prefix: str, size: int) -> None:
+        self.size += size
+        self.files += 1
+        usage = self.prefixes.get(prefix)
+        if usage is None:
+            self.prefixes[prefix] = [size, 1]
+        else:
+            usage[0] += size
+            usage[1] += 1
+
+    def top(self, limit: int) -> List[dict]:
+        """Returns the ``limit`` largest prefixes, largest first."""
+        largest = heapq.nlargest(
+            limit, self.prefixes.items(), key=lambda item: (item[1][0], item[0])
+        )
+        return [
+            {"prefix": prefix, "size": size, "files": files}
+            for prefix, (size, files) in largest
+        ]
+
+
+def prefix_at_depth(relative_path: str, depth: int) -> str:
+    """
+    Returns the directory of a file, limited to its first ``depth`` components.
+    Files in the root directory (or with ``depth`` 0) belong to ``ROOT_PREFIX``.
+    """
+    directories = relative_path.split("/")[:-1][:depth]
+    return "/".join(directories) + "/" if directories else ROOT_PREFIX
+
+
+def aggregate_stage_usage(
+    list_stage_cursor: DictCursor, stage_path: StagePathParts, depth: int
+) -> StageUsage:
+    """
+    Sums the sizes and numbers of files of a stage listing per prefix, up to ``depth``
+    directories deep. Rows are consumed as they are fetched, so memory grows with the
+    number of prefixes rather than the number of files.
+    """
+    usage = StageUsage()
+    for file in list_stage_cursor:
+        relative_path = str(relative_to_stage_path(file["name"], stage_path))
+        usage.add(prefix_at_depth(relative_path, depth), file["size"])
+    return usage
+
+
+def compute_stage_usage(stage_path: StagePathParts, depth: int) -> StageUsage:
+    return aggregate_stage_usage(
+        StageManager().list_files(stage_path.full_path), stage_path, depth
+    )
@@ -0,0 +1,239 @@
+# Copyright (c) 2024 Snowflake Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import annotations
+
+import logging
+import os
+import posixpath
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+
+from .diff import (
+    DiffResult,
+    StagePathType,
+    sync_local_diff_with_stage,
+    walk_sorted,
+)
+from .manager import StagePathParts
+
+# Seconds without a new notification before a batch of changes is synced.
+WATCH_DEBOUNCE_SECONDS = 0.3
+# Seconds between rescans of the directory when notifications are unavailable.
+WATCH_POLL_INTERVAL_SECONDS = 0.5
+
+log = logging.getLogger(__name__)
+
+FileState = Tuple[int, int]
+
+
+class LocalChangeWatcher:
+    """
+    Reports files under a local directory that were changed or deleted.
+
+    File system notifications are used when the optional ``watchdog`` package is
+    installed, and only the directories of the notified files are checked again.
+    Otherwise the whole directory is rescanned every ``poll_interval`` seconds. Either
+    way a file is only reported when its size or modification time changed.
+    """
+
+    def __init__(
+        self,
+        root: Path,
+        debounce: float = WATCH_DEBOUNCE_SECONDS,
+        poll_interval: float = WATCH_POLL_INTERVAL_SECONDS,
+        use_notifications: bool = True,
+    ):
+        self._root = root
+        self._debounce = debounce
+        self._poll_interval = poll_interval
+        # directory -> stage path -> state, of the files directly in each directory
+        self._snapshot: Dict[str, Dict[str, FileState]] = self._scan_tree("")
+        self._lock = threading.Lock()
+        self._notified = threading.Event()
+        # directory -> whether its subdirectories must be rescanned too
+        self._dirty: Dict[str, bool] = {}
+        self._observer = self._start_observer() if use_notifications else None
+
+    @property
+    def uses_notifications(self) -> bool:
+        return self._observer is not None
+
+    def wait_for_changes(self) -> Tuple[List[str], List[str]]:
+        """
+        Blocks until files changed and returns their (changed, deleted) stage paths,
+        relative to the watched directory.
+        """
+        while True:
+            if self._observer is not None:
+                self._notified.wait()
+                # wait for the burst of notifications to settle
+                self._notified.clear()
+                while self._notified.wait(self._debounce):
+                    self._notified.clear()
+            else:
+                self._notified.wait(self._poll_interval)
+                self._notified.clear()
+                self._mark_dirty("", recursive=True)
+
+            with self._lock:
+                dirty, self._dirty = self._dirty, {}
+            changed, deleted = self._rescan(dirty)
+            if changed or deleted:
+                return changed, deleted
+
+    def close(self) -> None:
+        if self._observer is not None:
+            self._observer.stop()
+            self._observer.join()
+
+    def _mark_dirty(self, directory: str, recursive: bool = False) -> None:
+        with self._lock:
+            self._dirty[directory] = recursive or self._dirty.get(directory, False)
+        self._notified.set()
+
+    def _start_observer(self):
+        try:
+            from watchdog.events import EVENT_TYPE_MODIFIED, FileSystemEventHandler
+            from watchdog.observers import Observer
+        except ImportError:
+            log.debug("watchdog is not installed, polling for changes")
+            return None
+
+        watcher = self
+
+        class _Handler(FileSystemEventHandler):
+            def on_any_event(self, event):
+                # A directory is modified by any change of its files, which are
+                # notified on their own.
+                if event.is_directory and event.event_type == EVENT_TYPE_MODIFIED:
+                    return
+                for path in (event.src_path, getattr(event, "dest_path", "")):
+                    relative = watcher._relative(path)  # noqa: SLF001
+                    if relative is None:
+                        continue
+                    if event.is_directory:
+                        # created, deleted or moved with everything inside it
+                        watcher._mark_dirty(relative, recursive=True)  # noqa: SLF001
+                    else:
+                        watcher._mark_dirty(posixpath.dirname(relative))  # noqa: SLF001
+
+        observer = Observer()
+        observer.schedule(_Handler(), str(self._root), recursive=True)
+        observer.start()
+        return observer
+
+    def _relative(self, path) -> Optional[str]:
+        if not path:
+            return None
+        try:
+            relative = Path(os.fsdecode(path)).relative_to(self._root)
+        except ValueError:
+            return None
+        return "" if relative == Path(".") else relative.as_posix()
+
+    @staticmethod
+    def _file_state(stat: os.stat_result) -> FileState:
+        return stat.st_size, stat.st_mtime_ns
+
+    def _scan_directory(self, directory: str) -> Dict[str, FileState]:
+        """Returns the states of the files directly in ``directory``."""
+        prefix = f"{directory}/" if directory else ""
+        states = {}
+        try:
+            with os.scandir(self._root / directory) as it:
+                for entry in it:
+                    try:
+                        if entry.is_file():
+                            states[prefix + entry.name] = self._file_state(entry.stat())
+                    except OSError:  # removed while scanning
+                        continue
+        except (FileNotFoundError, NotADirectoryError):
+            pass
+        return states
+
+    def _scan_tree(self, directory: str) -> Dict[str, Dict[str, FileState]]:
+        """Returns the states of the files under ``directory``, by their directory."""
+        path = self._root / directory
+        if not path.is_dir():
+            return {}
+        states: Dict[str, Dict[str, FileState]] = {}
+        for stage_path, local_path in walk_sorted(
+            path, f"{directory}/" if directory else ""
+        ):
+            try:
+                state = self._file_state(local_path.stat())
+            except OSError:  # removed while scanning
+                continue
+            states.setdefault(posixpath.dirname(stage_path), {})[stage_path] = state
+        return states
+
+    def _rescan(self, dirty: Dict[str, bool]) -> Tuple[List[str], List[str]]:
+        if dirty.get(""):
+            dirty = {"": True}
+        changed: Set[str] = set()
+        deleted: Set[str] = set()
+
+        def compare(directory: str, current: Dict[str, FileState]) -> None:
+            previous = self._snapshot.pop(directory, {})
+            for path, state in current.items():
+                if previous.get(path) != state:
+                    changed.add(path)
+            deleted.update(previous.keys() - current.keys())
+            if current:
+                self._snapshot[directory] = current
+
+        for directory, recursive in dirty.items():
+            if not recursive:
+                compare(directory, self._scan_directory(directory))
+                continue
+            tree = self._scan_tree(directory)
+            known = {
+                subdirectory
+                for subdirectory in self._snapshot
+                if not directory
+                or subdirectory == directory
+                or subdirectory.startswith(f"{directory}/")
+            }
+            for subdirectory in tree.keys() | known:
+                compare(subdirectory, tree.get(subdirectory, {}))
+        return sorted(changed), sorted(deleted)
+
+
+def sync_changes_with_stage(
+    local_root: Path,
+    stage_path: StagePathParts,
+    changed: List[str],
+    deleted: List[str],
+    prune: bool,
+) -> DiffResult:
+    """
+    Uploads the changed files to the stage and, with ``prune``, removes the deleted
+    ones, without listing the stage again. Only local changes are synced; changes
+    made on the stage are not looked for.
+    """
+    diff = DiffResult(
+        different=[StagePathType(p) for p in changed],
+        only_on_stage=[StagePathType(p) for p in deleted] if prune else [],
+    )
+    if diff.has_changes():
+        sync_local_diff_with_stage(
+            role=None,
+            deploy_root_path=local_root,
+            diff_result=diff,
+            stage_full_path=stage_path.full_path,
+            force_overwrite=True,
+        )
+    return diff
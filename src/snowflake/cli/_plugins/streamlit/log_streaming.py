@@ -153,13 +153,18 @@ def _result_for_entry(entry, output_format: OutputFormat) -> CommandResult:
     """
     Pick the CommandResult subclass best matched to the current output format.
 
-    - JSON / CSV: yield a dict via ObjectResult so the framework produces
-      valid JSONL / CSV rows that downstream tools (e.g. ``jq``) can parse.
+    - JSON / CSV / PARQUET / ARROW: yield a dict via ObjectResult so the framework
+      produces valid JSONL / CSV rows or columnar records that downstream tools
+      (e.g. ``jq``) can parse.
     - TABLE / plain: yield a pre-formatted line via MessageResult so each
       log entry renders as a single human-readable row instead of a
       two-column key/value table.
     """
-    if output_format == OutputFormat.CSV or output_format.is_json:
+    if (
+        output_format == OutputFormat.CSV
+        or output_format.is_json
+        or output_format.is_columnar
+    ):
         return ObjectResult(entry.to_dict())
     return MessageResult(entry.format_line())
 
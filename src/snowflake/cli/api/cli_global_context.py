@@ -295,6 +295,7 @@ class _CliGlobalContextAccess:
         """Computes whether cli_console output should be muted."""
         return (
             self._manager.output_format.is_json
+            or self._manager.output_format.is_columnar
             or self._manager.output_format == OutputFormat.CSV
         )
 
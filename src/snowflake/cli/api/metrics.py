@@ -40,6 +40,7 @@ class _DomainPrefix:
     GLOBAL = "global"
     APP = "app"
     SQL = "sql"
+    STAGE = "stage"
 
 
 class CLICounterField:
@@ -98,6 +99,9 @@ class CLICounterField:
     CONFIG_SOURCE_CLI_ARGS = (
         f"{_TypePrefix.FEATURES}.{_DomainPrefix.GLOBAL}.config_source_cli_args"
     )
+    STAGE_UPLOAD_WORKERS_AUTO = (
+        f"{_TypePrefix.FEATURES}.{_DomainPrefix.STAGE}.upload_workers_auto"
+    )
 
 
 @dataclass
@@ -19,8 +19,15 @@ class OutputFormat(Enum):
     TABLE = "TABLE"
     JSON = "JSON"
     JSON_EXT = "JSON_EXT"
+    NDJSON = "NDJSON"
     CSV = "CSV"
+    PARQUET = "PARQUET"
+    ARROW = "ARROW"
 
     @property
     def is_json(self) -> bool:
-        return self in (OutputFormat.JSON, OutputFormat.JSON_EXT)
+        return self in (OutputFormat.JSON, OutputFormat.JSON_EXT, OutputFormat.NDJSON)
+
+    @property
+    def is_columnar(self) -> bool:
+        return self in (OutputFormat.PARQUET, OutputFormat.ARROW)
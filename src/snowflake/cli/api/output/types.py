@@ -23,6 +23,10 @@ from snowflake.cli.api.cli_global_context import get_cli_context
 from snowflake.cli.api.output.formats import OutputFormat
 from snowflake.connector import DictCursor
 from snowflake.connector.cursor import ResultMetadata, SnowflakeCursor
+from snowflake.connector.errors import NotSupportedError, ProgrammingError
+
+if t.TYPE_CHECKING:
+    from pyarrow import Table
 
 
 class RowMapper(ABC):
@@ -134,6 +138,8 @@ class QueryResult(CollectionResult):
             row_mapper=RespectingColumnTypesRowMapper(cursor.description),
         )
         self._query = cursor.query
+        self.description = cursor.description
+        self._cursor = cursor
 
     def _prepare_payload(self, cursor: SnowflakeCursor | DictCursor):
         if isinstance(cursor, DictCursor):
@@ -172,6 +178,31 @@ class QueryResult(CollectionResult):
     def query(self):
         return self._query
 
+    @property
+    def arrow_number_to_decimal(self) -> bool:
+        """Whether NUMBER columns with a scale are fetched as decimals, and not as
+        floats, in Arrow batches."""
+        return bool(self._cursor.connection.arrow_number_to_decimal)
+
+    def arrow_batches(self) -> t.Iterator[Table] | None:
+        """
+        Returns the rows as the Arrow tables fetched from Snowflake, or None if pyarrow
+        is not installed or the result is not in Arrow format. Use either this or
+        ``result``, before any rows are read.
+        """
+        if isinstance(self._cursor, DictCursor) or not isinstance(
+            self._cursor, SnowflakeCursor
+        ):
+            return None
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            return None
+        try:
+            return self._cursor.fetch_arrow_batches(force_microsecond_precision=True)
+        except (NotSupportedError, ProgrammingError):
+            return None
+
 
 class SingleQueryResult(ObjectResult):
     def __init__(self, cursor: SnowflakeCursor):
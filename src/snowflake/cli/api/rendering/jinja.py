@@ -110,12 +110,15 @@ class IgnoreAttrEnvironment(Environment):
             return self.undefined(obj=obj, name=argument)
 
 
-def get_basic_jinja_env(loader: Optional[loaders.BaseLoader] = None) -> Environment:
+def get_basic_jinja_env(
+    loader: Optional[loaders.BaseLoader] = None, **options: Any
+) -> Environment:
     return env_bootstrap(
         IgnoreAttrEnvironment(
             loader=loader or loaders.BaseLoader(),
             keep_trailing_newline=True,
             undefined=StrictUndefined,
+            **options,
         )
     )
 
@@ -14,11 +14,24 @@
 
 from __future__ import annotations
 
+import hashlib
+import threading
 from dataclasses import dataclass
-from typing import Dict, Optional
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
 
 from click import ClickException
-from jinja2 import Environment, StrictUndefined, loaders, meta
+from jinja2 import (
+    Environment,
+    FileSystemBytecodeCache,
+    StrictUndefined,
+    Template,
+    TemplateNotFound,
+    TemplateSyntaxError,
+    loaders,
+    meta,
+)
+from jinja2.utils import LRUCache
 from snowflake.cli.api.cli_global_context import get_cli_context
 from snowflake.cli.api.console.console import cli_console
 from snowflake.cli.api.exceptions import CliArgumentError, InvalidTemplateError
@@ -37,19 +50,27 @@ _OLD_SQL_TEMPLATE_START = "&{"
 _OLD_SQL_TEMPLATE_END = "}"
 _JINJA_TEMPLATE_START, _JINJA_TEMPLATE_END = "{{", "}}"
 RESERVED_KEYS = [CONTEXT_KEY, FUNCTION_KEY]
+# Number of compiled templates kept in memory by each environment of a renderer.
+TEMPLATE_CACHE_SIZE = 1000
 
 
-def _get_sql_jinja_env(template_start: str, template_end: str) -> Environment:
+def _get_sql_jinja_env(
+    template_start: str,
+    template_end: str,
+    loader: Optional[loaders.BaseLoader] = None,
+    **options: Any,
+) -> Environment:
     _random_block = "___very___unique___block___to___disable___logic___blocks___"
     return env_bootstrap(
         IgnoreAttrEnvironment(
             variable_start_string=template_start,
             variable_end_string=template_end,
-            loader=loaders.BaseLoader(),
+            loader=loader or loaders.BaseLoader(),
             block_start_string=_random_block,
             block_end_string=_random_block,
             keep_trailing_newline=True,
             undefined=StrictUndefined,
+            **options,
         )
     )
 
@@ -67,12 +88,18 @@ def has_sql_templates(template_content: str) -> bool:
     )
 
 
-def _get_legacy_sql_env() -> Environment:
-    return _get_sql_jinja_env(_OLD_SQL_TEMPLATE_START, _OLD_SQL_TEMPLATE_END)
+def _get_legacy_sql_env(
+    loader: Optional[loaders.BaseLoader] = None, **options: Any
+) -> Environment:
+    return _get_sql_jinja_env(
+        _OLD_SQL_TEMPLATE_START, _OLD_SQL_TEMPLATE_END, loader, **options
+    )
 
 
-def _get_standard_sql_env() -> Environment:
-    return _get_sql_jinja_env(_SQL_TEMPLATE_START, _SQL_TEMPLATE_END)
+def _get_standard_sql_env(
+    loader: Optional[loaders.BaseLoader] = None, **options: Any
+) -> Environment:
+    return _get_sql_jinja_env(_SQL_TEMPLATE_START, _SQL_TEMPLATE_END, loader, **options)
 
 
 def choose_sql_jinja_env_based_on_template_syntax(
@@ -82,6 +109,22 @@ def choose_sql_jinja_env_based_on_template_syntax(
     new_syntax_env = _get_standard_sql_env()
     has_old_syntax = _does_template_have_env_syntax(old_syntax_env, template_content)
     has_new_syntax = _does_template_have_env_syntax(new_syntax_env, template_content)
+    return _choose_sql_jinja_env(
+        old_syntax_env,
+        new_syntax_env,
+        has_old_syntax,
+        has_new_syntax,
+        reference_name,
+    )
+
+
+def _choose_sql_jinja_env(
+    old_syntax_env: Environment,
+    new_syntax_env: Environment,
+    has_old_syntax: bool,
+    has_new_syntax: bool,
+    reference_name: Optional[str] = None,
+) -> Environment:
     reference_name_str = f" in {reference_name}" if reference_name else ""
     if has_old_syntax and has_new_syntax:
         raise InvalidTemplateError(
@@ -108,57 +151,147 @@ class SQLTemplateSyntaxConfig:
     enable_jinja_syntax: bool = False
 
 
-def snowflake_sql_jinja_render(
-    content: str,
-    template_syntax_config: SQLTemplateSyntaxConfig,
-    data: Dict | None = None,
-) -> str:
+class _ContentLoader(loaders.BaseLoader):
     """
-    If both legacy and standard syntax are enabled, CLI chooses one basing on provided content.
-    If jinja syntax is enabled, it is resolved after standard and legacy syntax.
+    Loads templates named after the hash of their content, so that environments
+    cache them (and their bytecode) by content.
     """
-    # Jinja syntax is server-side templating, it should not be resolved by CLI by default.
-    # The main use case for adding support for it on CLI side is for testing scripts before running them on server,
-    # which is why jinja templates are resolved after standard CLI templates.
 
-    data = data or {}
+    def __init__(self):
+        self.sources: Dict[str, str] = {}
 
-    for reserved_key in RESERVED_KEYS:
-        if reserved_key in data:
-            raise ClickException(
-                f"{reserved_key} in user defined data. The `{reserved_key}` variable is reserved for CLI usage."
-            )
-    has_templates = has_sql_templates(content)
-    get_cli_context().metrics.set_counter(
-        CLICounterField.SQL_TEMPLATES, int(has_templates)
-    )
-    context_data = {}
-    if has_templates:
-        try:
-            context_data = get_cli_context().template_context
-        except Exception as e:
-            raise CliArgumentError(f"Failed to read snowflake.yml file: {e}")
-    context_data.update(data)
-
-    # resolve legacy and standard SQL templating:
-    if (
-        template_syntax_config.enable_legacy_syntax
-        and template_syntax_config.enable_standard_syntax
+    def get_source(
+        self, environment: Environment, template: str
+    ) -> Tuple[str, Optional[str], Callable[[], bool]]:
+        if template not in self.sources:
+            raise TemplateNotFound(template)
+        return self.sources[template], None, lambda: True
+
+
+class SqlTemplateRenderer:
+    """
+    Renders SQL templates with one set of Jinja environments.
+
+    Templates are compiled once per distinct content and reused by later renders of
+    the same content. With ``bytecode_cache_dir`` the compiled templates are also
+    stored on disk and reused by later invocations.
+    """
+
+    def __init__(
+        self,
+        template_syntax_config: SQLTemplateSyntaxConfig,
+        data: Dict | None = None,
+        bytecode_cache_dir: Optional[Path] = None,
     ):
-        env = choose_sql_jinja_env_based_on_template_syntax(content)
-    elif template_syntax_config.enable_legacy_syntax:
-        env = _get_legacy_sql_env()
-    elif template_syntax_config.enable_standard_syntax:
-        env = _get_standard_sql_env()
-    else:
-        env = None
-
-    if env:
-        content = env.from_string(content).render(context_data)
-
-    # resolve jinja templating
-    if template_syntax_config.enable_jinja_syntax:
-        jinja_env = get_basic_jinja_env()
-        content = jinja_env.from_string(content).render(context_data)
-
-    return content
+        self._config = template_syntax_config
+        self._data = data or {}
+        for reserved_key in RESERVED_KEYS:
+            if reserved_key in self._data:
+                raise ClickException(
+                    f"{reserved_key} in user defined data. The `{reserved_key}` variable is reserved for CLI usage."
+                )
+        self._bytecode_cache = (
+            FileSystemBytecodeCache(str(bytecode_cache_dir))
+            if bytecode_cache_dir
+            else None
+        )
+        self._template_context: Optional[Dict] = None
+        self._loader = _ContentLoader()
+        self._lock = threading.Lock()
+        self._envs: Dict[str, Environment] = {}
+        self._syntax_checks = LRUCache(TEMPLATE_CACHE_SIZE)
+
+    def render(self, content: str) -> str:
+        """
+        If both legacy and standard syntax are enabled, CLI chooses one basing on provided content.
+        If jinja syntax is enabled, it is resolved after standard and legacy syntax.
+        """
+        # Jinja syntax is server-side templating, it should not be resolved by CLI by default.
+        # The main use case for adding support for it on CLI side is for testing scripts before running them on server,
+        # which is why jinja templates are resolved after standard CLI templates.
+        has_templates = has_sql_templates(content)
+        get_cli_context().metrics.set_counter(
+            CLICounterField.SQL_TEMPLATES, int(has_templates)
+        )
+        context_data = self._context_data() if has_templates else dict(self._data)
+
+        # resolve legacy and standard SQL templating:
+        if self._config.enable_legacy_syntax and self._config.enable_standard_syntax:
+            env = self._choose_env(content)
+        elif self._config.enable_legacy_syntax:
+            env = self._env("legacy")
+        elif self._config.enable_standard_syntax:
+            env = self._env("standard")
+        else:
+            env = None
+
+        if env:
+            content = self._template(env, content).render(context_data)
+
+        # resolve jinja templating
+        if self._config.enable_jinja_syntax:
+            content = self._template(self._env("jinja"), content).render(context_data)
+
+        return content
+
+    def _context_data(self) -> Dict:
+        if self._template_context is None:
+            try:
+                template_context = get_cli_context().template_context
+            except Exception as e:
+                raise CliArgumentError(f"Failed to read snowflake.yml file: {e}")
+            template_context.update(self._data)
+            self._template_context = template_context
+        return self._template_context
+
+    def _env(self, syntax: str) -> Environment:
+        env = self._envs.get(syntax)
+        if env is None:
+            options = dict(
+                cache_size=TEMPLATE_CACHE_SIZE, bytecode_cache=self._bytecode_cache
+            )
+            if syntax == "legacy":
+                env = _get_legacy_sql_env(self._loader, **options)
+            elif syntax == "standard":
+                env = _get_standard_sql_env(self._loader, **options)
+            else:
+                env = get_basic_jinja_env(self._loader, **options)
+            self._envs[syntax] = env
+        return env
+
+    def _choose_env(self, content: str) -> Environment:
+        old_syntax_env = self._env("legacy")
+        new_syntax_env = self._env("standard")
+        key = _content_key(content)
+        syntax = self._syntax_checks.get(key)
+        if syntax is None:
+            syntax = (
+                _does_template_have_env_syntax(old_syntax_env, content),
+                _does_template_have_env_syntax(new_syntax_env, content),
+            )
+            self._syntax_checks[key] = syntax
+        return _choose_sql_jinja_env(old_syntax_env, new_syntax_env, *syntax)
+
+    def _template(self, env: Environment, content: str) -> Template:
+        key = _content_key(content)
+        with self._lock:
+            self._loader.sources[key] = content
+            try:
+                return env.get_template(key)
+            except TemplateSyntaxError:
+                # report the error without the generated template name
+                return env.from_string(content)
+            finally:
+                del self._loader.sources[key]
+
+
+def _content_key(content: str) -> str:
+    return hashlib.sha256(content.encode("utf-8", "surrogatepass")).hexdigest()
+
+
+def snowflake_sql_jinja_render(
+    content: str,
+    template_syntax_config: SQLTemplateSyntaxConfig,
+    data: Dict | None = None,
+) -> str:
+    return SqlTemplateRenderer(template_syntax_config, data).render(content)
@@ -17,11 +17,12 @@ from unittest import mock
 
 import pytest
 from click import ClickException
-from jinja2 import UndefinedError
+from jinja2 import Environment, TemplateSyntaxError, UndefinedError
 from snowflake.cli.api.rendering.project_definition_templates import (
     has_client_side_templates,
 )
 from snowflake.cli.api.rendering.sql_templates import (
+    SqlTemplateRenderer,
     SQLTemplateSyntaxConfig,
     has_sql_templates,
     snowflake_sql_jinja_render,
@@ -160,6 +161,75 @@ def test_contex_can_access_environment_variable(cli_context):
     ) == os.environ.get("TEST_ENV_VAR")
 
 
+@pytest.fixture
+def template_compilations():
+    with mock.patch.object(
+        Environment, "compile", autospec=True, side_effect=Environment.compile
+    ) as compile_:
+        yield compile_
+
+
+@pytest.mark.parametrize(
+    "template_syntax_config",
+    [
+        SQLTemplateSyntaxConfig(),
+        SQLTemplateSyntaxConfig(enable_legacy_syntax=False),
+        SQLTemplateSyntaxConfig(
+            enable_legacy_syntax=False,
+            enable_standard_syntax=False,
+            enable_jinja_syntax=True,
+        ),
+    ],
+)
+def test_renderer_compiles_each_template_once(
+    template_syntax_config, cli_context, template_compilations
+):
+    renderer = SqlTemplateRenderer(template_syntax_config, data={"foo": "bar"})
+    templates = ["select <% foo %>;", "select {{ foo }};", "select 1;"]
+
+    for _ in range(3):
+        for template in templates:
+            renderer.render(template)
+
+    assert template_compilations.call_count == len(templates)
+
+
+def test_renderer_results_match_rendering_each_template(cli_context):
+    config = SQLTemplateSyntaxConfig(enable_jinja_syntax=True)
+    renderer = SqlTemplateRenderer(config, data={"foo": "bar"})
+    for template in ["&{ foo }", "<% foo %>", "{{ foo }}", "{# c #}x", "&{ foo }"]:
+        assert renderer.render(template) == snowflake_sql_jinja_render(
+            template, template_syntax_config=config, data={"foo": "bar"}
+        )
+
+
+def test_renderer_reuses_bytecode_cache(tmp_path, cli_context, template_compilations):
+    config = SQLTemplateSyntaxConfig()
+    first = SqlTemplateRenderer(
+        config, data={"foo": "bar"}, bytecode_cache_dir=tmp_path
+    )
+    assert first.render("select <% foo %>;") == "select bar;"
+    assert template_compilations.call_count == 1
+    assert any(tmp_path.iterdir())
+
+    second = SqlTemplateRenderer(
+        config, data={"foo": "baz"}, bytecode_cache_dir=tmp_path
+    )
+    assert second.render("select <% foo %>;") == "select baz;"
+    assert template_compilations.call_count == 1
+
+
+def test_renderer_reports_syntax_errors_without_template_name(cli_context):
+    config = SQLTemplateSyntaxConfig()
+    with pytest.raises(TemplateSyntaxError) as expected:
+        Environment(variable_start_string="<%", variable_end_string="%>").from_string(
+            "select <% foo + %>;"
+        )
+    with pytest.raises(TemplateSyntaxError) as err:
+        SqlTemplateRenderer(config).render("select <% foo + %>;")
+    assert str(err.value) == str(expected.value)
+
+
 def test_has_sql_templates():
     assert has_sql_templates("abc <% %> abc")
     assert has_sql_templates("abc <% abc")
@@ -1474,8 +1474,8 @@ class TestDCMPlan:
 
         mock_dcm_manager().plan_async.return_value = TEST_SFQID
         mock_server_poll.return_value.run.side_effect = record_poll
-        mock_output_stage.get_recursive.side_effect = lambda **kwargs: calls.append(
-            "drain"
+        mock_output_stage.get_recursive.side_effect = (
+            lambda **kwargs: calls.append("drain") or []
         )
         mock_dcm_manager().sync_local_files.return_value = "TMP_STAGE"
         mock_manifest_load.return_value = _manifest_without_config()
@@ -1759,6 +1759,7 @@ class TestDCMPlan:
             out_dir = Path.cwd() / "out"
             out_dir.mkdir(exist_ok=True)
             (out_dir / "plan_result.json").write_text('{"errors": ["compile failed"]}')
+            return []
 
         mock_dcm_manager().plan_async.return_value = TEST_SFQID
         mock_server_poll.return_value.run.side_effect = CliError("plan blew up")
@@ -1815,6 +1816,7 @@ class TestDCMPlan:
             out_dir = Path.cwd() / "out"
             out_dir.mkdir(exist_ok=True)
             (out_dir / "plan_result.json").write_text(json.dumps(downloaded_result))
+            return []
 
         mock_dcm_manager().plan_async.return_value = TEST_SFQID
         mock_server_poll.return_value.run.return_value = _plan_cursor(
@@ -189,6 +189,7 @@ class TestCollectOutput:
             rendered_dir.mkdir(parents=True)
             (rendered_dir / "obj.sql").write_text("SELECT 1")
             (dest_path / "plan_result.json").write_text('{"version": 2}')
+            return []
 
         stage_manager.get_recursive.side_effect = fake_get_recursive
 
@@ -229,6 +230,7 @@ class TestCollectOutput:
 
         def fake_get_recursive(stage_path, dest_path):
             (dest_path / "plan_result.json").write_text('{"errors": ["compile"]}')
+            return []
 
         stage_manager.get_recursive.side_effect = fake_get_recursive
 
@@ -202,7 +202,7 @@ def test_fetch(mock_connector, runner, mock_ctx):
 
 
 @mock.patch("snowflake.connector.connect")
-@mock.patch.object(StageManager, "iter_stage")
+@mock.patch.object(StageManager, "_iter_stage_listing")
 @mock.patch("snowflake.cli._plugins.git.commands.QueryResult")
 def test_copy_to_local_file_system(
     mock_result, mock_iter, mock_connector, runner, mock_ctx, temporary_directory
@@ -211,10 +211,9 @@ def test_copy_to_local_file_system(
     ctx = mock_ctx()
     mock_connector.return_value = ctx
     mock_iter.return_value = (
-        StagePath.from_git_str(x)
+        (StagePath.from_git_str(x), {"name": x.removeprefix("@")})
         for x in [f"{repo_prefix}file.txt", f"{repo_prefix}dir/file_in_dir.txt"]
     )
-    mock_iter.__len__.return_value = 2
     mock_result.result = {"file": "mock"}
 
     local_path = Path(temporary_directory) / "local_dir"
@@ -223,10 +222,12 @@ def test_copy_to_local_file_system(
 
     assert result.exit_code == 0, result.output
     assert local_path.exists()
-    assert (
-        ctx.get_query()
-        == f"""get {repo_prefix}file.txt file://{local_path.resolve()}/ parallel=4
-get {repo_prefix}dir/file_in_dir.txt file://{local_path.resolve() / 'dir'}/ parallel=4"""
+    # directories are downloaded concurrently, so their GETs may run in any order
+    assert sorted(ctx.get_query().splitlines()) == sorted(
+        [
+            f"get {repo_prefix}file.txt file://{local_path.resolve()}/ parallel=4",
+            f"get {repo_prefix}dir/file_in_dir.txt file://{local_path.resolve() / 'dir'}/ parallel=4",
+        ]
     )
 
 
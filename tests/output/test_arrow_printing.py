@@ -0,0 +1,387 @@
+from datetime import date, datetime
+from decimal import Decimal
+from timeit import default_timer as timer
+from unittest import mock
+
+import pyarrow as pa
+import pytest
+from snowflake.cli._app.printing import print_result
+from snowflake.cli.api.exceptions import CliError
+from snowflake.cli.api.output.formats import OutputFormat
+from snowflake.cli.api.output.types import (
+    CollectionResult,
+    MultipleResults,
+    ObjectResult,
+    QueryResult,
+    StreamResult,
+)
+from snowflake.connector.cursor import ResultMetadata, SnowflakeCursor
+from snowflake.connector.errors import NotSupportedError
+
+
+def _column(name, type_code, precision=None, scale=None):
+    return ResultMetadata(name, type_code, None, None, precision, scale, True)
+
+
+class ArrowCursor(SnowflakeCursor):
+    """Cursor returning the same result as rows and, unless ``table`` is None, as
+    Arrow batches."""
+
+    def __init__(
+        self, description, rows, table=None, number_to_decimal=False, batch_size=2
+    ):
+        super().__init__(mock.Mock(arrow_number_to_decimal=number_to_decimal))
+        self._description = description
+        self._rows = iter(rows)
+        self._table = table
+        self._batch_size = batch_size
+        self.query = "SELECT A MOCK QUERY"
+        self.fetched_arrow_batches = False
+
+    @property
+    def description(self):
+        return self._description
+
+    def fetchone(self):
+        return next(self._rows, None)
+
+    def fetch_arrow_batches(self, force_microsecond_precision=False):
+        if self._table is None:
+            raise NotSupportedError
+        self.fetched_arrow_batches = True
+        return (
+            pa.Table.from_batches([batch])
+            for batch in self._table.to_batches(max_chunksize=self._batch_size)
+        )
+
+
+# (column, Arrow array, values of rows)
+COLUMNS = [
+    (_column("INT", 0, 10, 0), pa.array([1, -2, None]), [1, -2, None]),
+    (
+        _column("PRICE", 0, 10, 2),
+        pa.array([1.5, 0.0, None]),
+        [Decimal("1.50"), Decimal("0.00"), None],
+    ),
+    (
+        _column("RATE", 0, 15, 8),
+        pa.array([0.0, 1.2e-07, -3.5]),
+        [Decimal("0E-8"), Decimal("1.2E-7"), Decimal("-3.50000000")],
+    ),
+    (
+        _column("REAL", 1),
+        pa.array([1.0, float("nan"), float("-inf")]),
+        [1.0, float("nan"), float("-inf")],
+    ),
+    (
+        _column("TEXT", 2),
+        pa.array(["a,b", 'q"\n\x1b[31mred', None]),
+        ["a,b", 'q"\n\x1b[31mred', None],
+    ),
+    (
+        _column("DATE", 3),
+        pa.array([date(2024, 1, 2), None, date(1, 1, 1)]),
+        [date(2024, 1, 2), None, date(1, 1, 1)],
+    ),
+    (
+        _column("NTZ", 8),
+        pa.array(
+            [datetime(2024, 1, 2, 3, 4, 5), datetime(2024, 1, 2, 3, 4, 5, 6), None],
+            pa.timestamp("us"),
+        ),
+        [datetime(2024, 1, 2, 3, 4, 5), datetime(2024, 1, 2, 3, 4, 5, 6), None],
+    ),
+    (
+        _column("VARIANT", 5),
+        pa.array(['{\n  "a": 1\n}', "[]", None]),
+        ['{\n  "a": 1\n}', "[]", None],
+    ),
+    (
+        _column("BINARY", 11),
+        pa.array([b"\x00\xff", b"", None]),
+        [bytearray(b"\x00\xff"), bytearray(b""), None],
+    ),
+    (_column("BOOL", 13), pa.array([True, False, None]), [True, False, None]),
+    (_column("INT", 0, 10, 0), pa.array([None, None, None], pa.int64()), [None] * 3),
+]
+
+DECIMAL_COLUMNS = [
+    (
+        _column("BIG", 0, 38, 0),
+        pa.array([Decimal(10**30), None, Decimal(-1)], pa.decimal128(38, 0)),
+        [10**30, None, -1],
+    ),
+    (
+        _column("SMALL", 0, 20, 10),
+        pa.array([Decimal("0E-10"), Decimal("1.5"), None], pa.decimal128(20, 10)),
+        [Decimal("0E-10"), Decimal("1.5000000000"), None],
+    ),
+]
+
+
+def _cursors(columns, number_to_decimal=False, batch_size=2):
+    description = [column for column, _, _ in columns]
+    rows = list(zip(*(values for _, _, values in columns)))
+    table = pa.table(
+        [array for _, array, _ in columns], names=[f"c{i}" for i in range(len(columns))]
+    )
+    return (
+        ArrowCursor(description, rows, table, number_to_decimal, batch_size),
+        ArrowCursor(description, rows),
+    )
+
+
+def _printed(capsys, cursor, output_format):
+    print_result(QueryResult(cursor), output_format=output_format)
+    return capsys.readouterr().out
+
+
+@pytest.mark.parametrize("output_format", [OutputFormat.CSV, OutputFormat.JSON])
+@pytest.mark.parametrize(
+    "columns, number_to_decimal",
+    [(COLUMNS, False), (DECIMAL_COLUMNS, True), (COLUMNS[:1], False)],
+)
+def test_arrow_batches_print_same_as_rows(
+    capsys, output_format, columns, number_to_decimal
+):
+    arrow_cursor, row_cursor = _cursors(columns, number_to_decimal)
+
+    printed_from_batches = _printed(capsys, arrow_cursor, output_format)
+
+    assert arrow_cursor.fetched_arrow_batches
+    assert printed_from_batches == _printed(capsys, row_cursor, output_format)
+
+
+@pytest.mark.parametrize("output_format", [OutputFormat.CSV, OutputFormat.JSON])
+def test_arrow_batches_print_empty_result_same_as_rows(capsys, output_format):
+    arrow_cursor, row_cursor = _cursors(COLUMNS)
+    arrow_cursor._table = arrow_cursor._table.slice(0, 0)  # noqa: SLF001
+    row_cursor._rows = iter([])  # noqa: SLF001
+
+    printed_from_batches = _printed(capsys, arrow_cursor, output_format)
+
+    assert arrow_cursor.fetched_arrow_batches
+    assert printed_from_batches == _printed(capsys, row_cursor, output_format)
+
+
+@pytest.mark.parametrize(
+    "column",
+    [
+        _column("TIME", 12),
+        _column("LTZ", 6),
+        _column("OBJECT", 9),
+        _column("BIG", 0, 38, 0),
+        _column("PRECISE", 0, 20, 2),
+    ],
+)
+def test_unsupported_columns_are_printed_from_rows(capsys, column):
+    cursor = ArrowCursor([column], [(1,)], pa.table({"c": [1]}))
+
+    assert _printed(capsys, cursor, OutputFormat.CSV) == f"{column.name}\n1\n"
+    assert not cursor.fetched_arrow_batches
+
+
+@mock.patch(
+    "snowflake.cli._app.printing._get_format_type",
+    return_value=OutputFormat.JSON_EXT,
+)
+def test_variant_columns_are_printed_from_rows_with_json_ext(_, capsys):
+    arrow_cursor, _ = _cursors(COLUMNS)
+
+    _printed(capsys, arrow_cursor, OutputFormat.JSON_EXT)
+
+    assert not arrow_cursor.fetched_arrow_batches
+
+
+SAMPLE_AMOUNT = 3
+BENCHMARK_ROWS = 100_000
+
+
+def _benchmark_cursors():
+    columns = [
+        (
+            _column("ID", 0, 18, 0),
+            pa.array(range(BENCHMARK_ROWS)),
+            list(range(BENCHMARK_ROWS)),
+        ),
+        (
+            _column("AMOUNT", 0, 12, 2),
+            pa.array([i / 100 for i in range(BENCHMARK_ROWS)]),
+            [Decimal(i).scaleb(-2) for i in range(BENCHMARK_ROWS)],
+        ),
+        (
+            _column("NAME", 2),
+            pa.array([f"name {i}" for i in range(BENCHMARK_ROWS)]),
+            [f"name {i}" for i in range(BENCHMARK_ROWS)],
+        ),
+        (
+            _column("DAY", 3),
+            pa.array([date(2024, 1, 1 + i % 28) for i in range(BENCHMARK_ROWS)]),
+            [date(2024, 1, 1 + i % 28) for i in range(BENCHMARK_ROWS)],
+        ),
+    ]
+    return _cursors(columns, batch_size=10_000)
+
+
+def _rows_per_second(capsys, output_format, use_arrow: bool) -> float:
+    results = []
+    for _ in range(SAMPLE_AMOUNT):
+        arrow_cursor, row_cursor = _benchmark_cursors()
+        cursor = arrow_cursor if use_arrow else row_cursor
+        start = timer()
+        print_result(QueryResult(cursor), output_format=output_format)
+        results.append(timer() - start)
+        capsys.readouterr()
+    return BENCHMARK_ROWS / min(results)
+
+
+@pytest.mark.performance
+@pytest.mark.parametrize("output_format", [OutputFormat.CSV, OutputFormat.JSON])
+def test_arrow_batches_printing_performance(capsys, output_format):
+    from_batches = _rows_per_second(capsys, output_format, use_arrow=True)
+    from_rows = _rows_per_second(capsys, output_format, use_arrow=False)
+    assert from_batches >= 2 * from_rows, (
+        f"{output_format.value}: {from_batches:,.0f} rows/s from Arrow batches, "
+        f"{from_rows:,.0f} rows/s from rows"
+    )
+
+
+def _read_columnar(data: bytes, output_format):
+    import io
+
+    if output_format == OutputFormat.PARQUET:
+        import pyarrow.parquet as pq
+
+        return pq.read_table(io.BytesIO(data))
+    return pa.ipc.open_stream(data).read_all()
+
+
+COLUMNAR_FORMATS = [OutputFormat.PARQUET, OutputFormat.ARROW]
+
+
+@pytest.mark.parametrize("output_format", COLUMNAR_FORMATS)
+def test_columnar_output_writes_arrow_batches(capsysbinary, output_format):
+    arrow_cursor, _ = _cursors(COLUMNS)
+
+    print_result(QueryResult(arrow_cursor), output_format=output_format)
+
+    table = _read_columnar(capsysbinary.readouterr().out, output_format)
+    assert arrow_cursor.fetched_arrow_batches
+    assert table.column_names == ["INT", "PRICE", "RATE", "REAL", "TEXT", "DATE"] + [
+        "NTZ",
+        "VARIANT",
+        "BINARY",
+        "BOOL",
+        "INT_2",
+    ]
+    assert table.num_rows == 3
+    assert table.column("TEXT").to_pylist() == ["a,b", 'q"\n\x1b[31mred', None]
+
+
+@pytest.mark.parametrize("output_format", COLUMNAR_FORMATS)
+def test_columnar_output_writes_rows_of_other_results(capsysbinary, output_format):
+    _, row_cursor = _cursors(COLUMNS[:1] + COLUMNS[4:6] + COLUMNS[8:9])
+
+    print_result(QueryResult(row_cursor), output_format=output_format)
+
+    table = _read_columnar(capsysbinary.readouterr().out, output_format)
+    assert table.to_pylist() == [
+        {"INT": 1, "TEXT": "a,b", "DATE": date(2024, 1, 2), "BINARY": b"\x00\xff"},
+        {"INT": -2, "TEXT": 'q"\n\x1b[31mred', "DATE": None, "BINARY": b""},
+        {"INT": None, "TEXT": None, "DATE": date(1, 1, 1), "BINARY": None},
+    ]
+
+
+@pytest.mark.parametrize("output_format", COLUMNAR_FORMATS)
+def test_columnar_output_writes_stream_results_together(capsysbinary, output_format):
+    result = StreamResult(ObjectResult({"line": i}) for i in range(25_000))
+
+    with mock.patch("snowflake.cli._app.arrow_printing.ROWS_PER_BATCH", 10):
+        print_result(result, output_format=output_format)
+
+    table = _read_columnar(capsysbinary.readouterr().out, output_format)
+    assert table.column("line").to_pylist() == list(range(25_000))
+
+
+@pytest.mark.parametrize("output_format", COLUMNAR_FORMATS)
+def test_columnar_output_of_empty_result_has_columns(capsysbinary, output_format):
+    arrow_cursor, _ = _cursors(COLUMNS[:2])
+    arrow_cursor._table = arrow_cursor._table.slice(0, 0)  # noqa: SLF001
+
+    print_result(QueryResult(arrow_cursor), output_format=output_format)
+
+    table = _read_columnar(capsysbinary.readouterr().out, output_format)
+    assert table.column_names == ["INT", "PRICE"]
+    assert table.num_rows == 0
+
+
+@pytest.mark.parametrize("output_format", COLUMNAR_FORMATS)
+def test_columnar_output_widens_integers_of_later_batches(capsysbinary, output_format):
+    description = [_column("SMALL", 0, 10, 0), _column("BIG", 0, 38, 0)]
+    batches = [
+        pa.table({"c0": pa.array([1], pa.int8()), "c1": pa.array([2], pa.int8())}),
+        pa.table(
+            {
+                "c0": pa.array([70_000], pa.int32()),
+                "c1": pa.array([Decimal(10**30)], pa.decimal128(38, 0)),
+            }
+        ),
+    ]
+    cursor = ArrowCursor(description, [])
+
+    with mock.patch.object(cursor, "fetch_arrow_batches", return_value=iter(batches)):
+        print_result(QueryResult(cursor), output_format=output_format)
+
+    table = _read_columnar(capsysbinary.readouterr().out, output_format)
+    assert table.schema.types == [pa.int64(), pa.decimal128(38, 0)]
+    assert table.to_pylist() == [
+        {"SMALL": 1, "BIG": Decimal(2)},
+        {"SMALL": 70_000, "BIG": Decimal(10**30)},
+    ]
+
+
+@pytest.mark.parametrize("output_format", COLUMNAR_FORMATS)
+def test_columnar_output_writes_rows_with_values_only_in_later_batches(
+    capsysbinary, output_format
+):
+    description = [_column("INT", 0, 10, 0), _column("PRICE", 0, 10, 2)]
+    rows = [(None, None), (None, Decimal("1.5")), (3, Decimal("12.25"))]
+
+    with mock.patch("snowflake.cli._app.arrow_printing.ROWS_PER_BATCH", 1):
+        print_result(QueryResult(ArrowCursor(description, rows)), output_format)
+
+    table = _read_columnar(capsysbinary.readouterr().out, output_format)
+    assert table.schema.types == [pa.int64(), pa.decimal128(10, 2)]
+    assert table.to_pylist() == [
+        {"INT": None, "PRICE": None},
+        {"INT": None, "PRICE": Decimal("1.50")},
+        {"INT": 3, "PRICE": Decimal("12.25")},
+    ]
+
+
+def test_columnar_output_rejects_results_with_different_columns(capsysbinary):
+    result = MultipleResults(
+        [CollectionResult([{"a": 1}]), CollectionResult([{"b": 1}])]
+    )
+
+    with pytest.raises(CliError, match="Results with different columns"):
+        print_result(result, output_format=OutputFormat.PARQUET)
+
+
+def test_columnar_output_is_not_written_to_terminal(capsysbinary):
+    with mock.patch("sys.stdout.isatty", return_value=True):
+        with pytest.raises(CliError, match="cannot be written to a terminal"):
+            print_result(CollectionResult([{"a": 1}]), output_format=OutputFormat.ARROW)
+
+
+@mock.patch("snowflake.cli._plugins.sql.manager.SqlExecutionMixin._execute_string")
+def test_sql_format_parquet(mock_execute, runner, mock_cursor):
+    mock_execute.return_value = iter(
+        [mock_cursor(rows=[(1, "a"), (2, "b")], columns=["ID", "NAME"])]
+    )
+
+    result = runner.invoke(["sql", "-q", "select 1", "--format", "parquet"])
+
+    assert result.exit_code == 0, result.output
+    table = _read_columnar(result.stdout_bytes, OutputFormat.PARQUET)
+    assert table.to_pylist() == [{"ID": 1, "NAME": "a"}, {"ID": 2, "NAME": "b"}]
@@ -17,6 +17,7 @@ from datetime import datetime, time
 from decimal import Decimal
 from textwrap import dedent
 from typing import NamedTuple
+from unittest import mock
 
 import pytest
 from snowflake.cli._app.printing import print_result
@@ -250,6 +251,84 @@ def test_print_many_columns_table_is_legible(capsys):
         assert f"value_{i}" in output, f"Missing cell value value_{i}"
 
 
+@mock.patch("snowflake.cli._app.printing.TABLE_WINDOW_ROWS", 2)
+def test_print_table_in_windows(capsys):
+    names = ["a", "bb", "c", "d", "a much longer name", "e", "f"]
+    collection = CollectionResult(
+        {"id": i, "name": name} for i, name in enumerate(names)
+    )
+
+    print_result(collection, output_format=OutputFormat.TABLE)
+
+    # a window with wider values starts a new table
+    assert get_output(capsys) == dedent(
+        """\
+    +-----------+
+    | id | name |
+    |----+------|
+    | 0  | a    |
+    | 1  | bb   |
+    | 2  | c    |
+    +-----------+
+    +-------------------------+
+    | id | name               |
+    |----+--------------------|
+    | 3  | d                  |
+    | 4  | a much longer name |
+    | 5  | e                  |
+    | 6  | f                  |
+    +-------------------------+
+    """
+    )
+
+
+@mock.patch("snowflake.cli._app.printing.TABLE_WINDOW_ROWS", 2)
+@mock.patch("snowflake.cli._app.printing._NON_TERMINAL_RENDER_WIDTH", 20)
+def test_print_table_in_windows_folds_values_wider_than_console(capsys):
+    names = ["a", "bb", "c", "a much longer name", "d"]
+    collection = CollectionResult(
+        {"id": i, "name": name} for i, name in enumerate(names)
+    )
+
+    print_result(collection, output_format=OutputFormat.TABLE)
+
+    assert get_output(capsys) == dedent(
+        """\
+    +-----------+
+    | id | name |
+    |----+------|
+    | 0  | a    |
+    | 1  | bb   |
+    | 2  | c    |
+    | 3  | a    |
+    |    | much |
+    |    | long |
+    |    | er   |
+    |    | name |
+    | 4  | d    |
+    +-----------+
+    """
+    )
+
+
+@mock.patch("snowflake.cli._app.printing.TABLE_WINDOW_ROWS", 10)
+def test_print_table_flushes_windows_before_result_is_consumed(capsys):
+    printed_before_last_row = []
+
+    def rows():
+        for i in range(25):
+            if i == 24:
+                printed_before_last_row.append(capsys.readouterr().out)
+            yield {"id": i}
+
+    print_result(CollectionResult(rows()), output_format=OutputFormat.TABLE)
+
+    printed = printed_before_last_row[0]
+    assert "| 20 |" in printed
+    assert "| 21 |" not in printed
+    assert (printed + get_output(capsys)).count("+----+") == 2
+
+
 def test_print_multi_results_csv(capsys, _multiple_results):
     print_result(_multiple_results, output_format=OutputFormat.CSV)
 
@@ -411,6 +490,43 @@ def test_print_different_data_sources_json(capsys, _multiple_data_sources):
     ]
 
 
+def test_print_different_data_sources_ndjson(capsys, _multiple_data_sources):
+    print_result(_multiple_data_sources, output_format=OutputFormat.NDJSON)
+
+    assert get_output(capsys) == dedent(
+        """\
+    {"statement_index": 0, "string": "string", "number": 42, "array": ["array"], "object": {"k": "object"}, "date": "2022-03-21T00:00:00"}
+    {"statement_index": 0, "string": "string", "number": 43, "array": ["array"], "object": {"k": "object"}, "date": "2022-03-21T00:00:00"}
+    {"statement_index": 1, "message": "Command done"}
+    {"statement_index": 2, "key": "value_0"}
+    {"statement_index": 2, "key": "value_1"}
+    """
+    )
+
+
+def test_print_query_result_ndjson(capsys, _bytearray_result):
+    print_result(_bytearray_result, output_format=OutputFormat.NDJSON)
+    assert get_output(capsys) == '{"BYTE_ARRAY": "544849532053484f554c4420574f524b"}\n'
+
+
+def test_print_ndjson_flushes_every_line(capsys):
+    printed = []
+
+    def rows():
+        for i in range(3):
+            yield {"id": i}
+            printed.append(capsys.readouterr().out)
+
+    print_result(CollectionResult(rows()), output_format=OutputFormat.NDJSON)
+
+    assert printed == ['{"id": 0}\n', '{"id": 1}\n', '{"id": 2}\n']
+
+
+def test_print_empty_result_ndjson(capsys):
+    print_result(CollectionResult([]), output_format=OutputFormat.NDJSON)
+    assert get_output(capsys) == ""
+
+
 def test_print_with_no_data_table(capsys):
     print_result(None)
     assert get_output(capsys) == "Done\n"
@@ -518,6 +634,11 @@ def test_print_stream_result_json(capsys, _stream):
     ]
 
 
+def test_print_stream_result_ndjson(capsys, _stream):
+    print_result(_stream, output_format=OutputFormat.NDJSON)
+    assert get_output(capsys) == '{"message": "1"}\n{"2": "3"}\n'
+
+
 def test_print_stream_result_csv(capsys, _stream):
     print_result(_stream, output_format=OutputFormat.CSV)
     assert get_output(capsys) == dedent(
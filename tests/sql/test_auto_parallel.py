@@ -0,0 +1,296 @@
+from unittest import mock
+
+import pytest
+from snowflake.cli._plugins.sql.auto_parallel import (
+    BARRIER,
+    StatementAccess,
+    analyze_statement,
+    dependencies,
+    execute_concurrently,
+)
+from snowflake.cli._plugins.sql.manager import SqlManager
+from snowflake.connector.errors import ProgrammingError
+
+
+@pytest.mark.parametrize(
+    "statement",
+    [
+        "use database db;",
+        "USE ROLE r;",
+        "set x = 1;",
+        "unset x;",
+        "alter session set query_tag = 'x';",
+        "begin;",
+        "commit;",
+        "rollback;",
+        "show tables;",
+        "describe table t;",
+        "call p();",
+        "execute immediate $$ select 1 $$;",
+        "create database db;",
+        "create schema s;",
+        "drop schema s;",
+        "alter table t rename to u;",
+        "alter table t swap with u;",
+        "grant ownership on table t to role r;",
+        "select * from table(result_scan(last_query_id()));",
+        "select system$wait(1);",
+        "select * from information_schema.tables;",
+        "select seq.nextval;",
+        "create table identifier($name) (a int);",
+        "put file:///tmp/a.csv @s;",
+        "",
+    ],
+)
+def test_analyze_statement_barriers(statement):
+    assert analyze_statement(statement) == BARRIER
+
+
+@pytest.mark.parametrize(
+    "statement, writes",
+    [
+        ("select * from t;", set()),
+        ("with x as (select 1) select * from x;", set()),
+        ("create table t (a int);", {"T"}),
+        ("create or replace transient table db.s.t (a int);", {"T"}),
+        ('create or alter view "My View" as select 1;', {"My View"}),
+        ("create table if not exists t (a int);", {"T"}),
+        ("create or replace secure materialized view v as select 1;", {"V"}),
+        ("drop table if exists s.t;", {"T"}),
+        ("alter warehouse wh set warehouse_size = small;", {"WH"}),
+        ("comment on table t is 'x';", {"T"}),
+        ("insert into t values (1);", {"T"}),
+        ("insert overwrite into t select * from u;", {"T"}),
+        ("merge into t using u on t.a = u.a when matched then delete;", {"T"}),
+        ("copy into t from @s;", {"T"}),
+        ("delete from t where a = 1;", {"T"}),
+        ("update t set a = 1;", {"T"}),
+        ("truncate table if exists t;", {"T"}),
+        ("grant select on table db.s.t to role r;", {"T"}),
+        ("grant role r to user u;", {"R"}),
+        ("revoke usage on database db from role r;", {"DB"}),
+    ],
+)
+def test_analyze_statement_targets(statement, writes):
+    access = analyze_statement(statement)
+    assert not access.barrier
+    assert access.writes == writes
+    assert writes <= access.reads
+
+
+def test_analyze_statement_reads_names_in_strings_and_comments():
+    access = analyze_statement("select 'T1' -- and T2\n from t3;")
+    assert {"T1", "T2", "T3"} <= access.reads
+
+
+def test_dependencies():
+    accesses = [
+        StatementAccess(writes=frozenset({"A"}), reads=frozenset({"A"})),
+        StatementAccess(writes=frozenset({"B"}), reads=frozenset({"B"})),
+        StatementAccess(reads=frozenset({"A"})),
+        StatementAccess(reads=frozenset({"A", "B"})),
+        StatementAccess(writes=frozenset({"A"}), reads=frozenset({"A"})),
+        StatementAccess(reads=frozenset({"C"})),
+    ]
+    assert dependencies(accesses) == [set(), set(), {0}, {0, 1}, {0, 2, 3}, set()]
+
+
+def test_dependencies_of_objects_read_through_views():
+    accesses = [
+        analyze_statement(statement)
+        for statement in (
+            "create table t (a int);",
+            "create view v as select * from t;",
+            "insert into t values (1);",
+            "select count(*) from v;",
+            "select count(*) from u;",
+            "drop table w;",
+        )
+    ]
+    assert dependencies(accesses) == [set(), {0}, {0, 1}, {1, 2}, {1, 2}, {1, 2, 3, 4}]
+
+
+class _FakeConnection:
+    """Runs each query for ``duration`` status checks; failing queries end in an
+    error."""
+
+    def __init__(self, duration=2, failing=(), durations=None):
+        self.duration = duration
+        self.durations = durations or {}
+        self.failing = failing
+        self.cursors = []
+        self.started = []
+        self.remaining = {}
+        self.max_running = 0
+
+    def cursor(self):
+        cursor = mock.MagicMock()
+
+        def execute_async(query):
+            cursor.sfqid = f"qid-{len(self.started)}"
+            self.started.append(query)
+            self.remaining[cursor.sfqid] = self.durations.get(query, self.duration)
+            self.max_running = max(
+                self.max_running, sum(1 for r in self.remaining.values() if r > 0)
+            )
+
+        cursor.execute_async.side_effect = execute_async
+        self.cursors.append(cursor)
+        return cursor
+
+    def _query(self, sfqid):
+        return self.started[int(sfqid.split("-")[1])]
+
+    def get_query_status(self, sfqid):
+        self.remaining[sfqid] -= 1
+        if self.remaining[sfqid] > 0:
+            return "RUNNING"
+        return "FAILED" if self._query(sfqid) in self.failing else "SUCCESS"
+
+    def is_still_running(self, status):
+        return status == "RUNNING"
+
+    def is_an_error(self, status):
+        return status == "FAILED"
+
+    def get_query_status_throw_if_error(self, sfqid):
+        raise ProgrammingError(f"{self._query(sfqid)} failed")
+
+
+def _statements(*texts):
+    return [(text, analyze_statement(text)) for text in texts]
+
+
+@mock.patch("snowflake.cli._plugins.sql.auto_parallel.time.sleep")
+def test_execute_concurrently_keeps_order_and_dependencies(_):
+    connection = _FakeConnection()
+    statements = _statements(
+        "create table a (x int);",
+        "create table b (x int);",
+        "insert into a values (1);",
+        "insert into b select * from a;",
+        "select * from c;",
+    )
+
+    results = list(execute_concurrently(connection, statements))
+
+    assert [text for text, _ in results] == [text for text, _ in statements]
+    # independent statements start right away, dependent ones after their inputs,
+    # and queries and DML after all earlier changes
+    assert connection.started == [
+        "create table a (x int);",
+        "create table b (x int);",
+        "insert into a values (1);",
+        "insert into b select * from a;",
+        "select * from c;",
+    ]
+    for _, cursor in results:
+        cursor.get_results_from_sfqid.assert_called_once_with(cursor.sfqid)
+
+
+@mock.patch("snowflake.cli._plugins.sql.auto_parallel.time.sleep")
+def test_execute_concurrently_limits_running_statements(_):
+    connection = _FakeConnection(duration=3)
+    statements = _statements(*(f"select {i} from t{i};" for i in range(20)))
+
+    results = list(execute_concurrently(connection, statements, max_running=4))
+
+    assert len(results) == 20
+    assert connection.max_running == 4
+
+
+@mock.patch("snowflake.cli._plugins.sql.auto_parallel.time.sleep")
+def test_execute_concurrently_raises_after_earlier_results(_):
+    connection = _FakeConnection(failing=("insert into a values (1);",))
+    statements = _statements(
+        "create table a (x int);",
+        "insert into a values (1);",
+        "select * from a;",
+        "select * from b;",
+    )
+
+    results = execute_concurrently(connection, statements, max_running=1)
+
+    assert next(results)[0] == "create table a (x int);"
+    with pytest.raises(ProgrammingError, match="insert into a values"):
+        next(results)
+    assert "select * from a;" not in connection.started
+    assert "select * from b;" not in connection.started
+
+
+@mock.patch("snowflake.cli._plugins.sql.auto_parallel.time.sleep")
+def test_execute_concurrently_cancels_later_statements_on_error(_):
+    connection = _FakeConnection(
+        failing=("select * from a;",),
+        durations={"select * from b;": 5},
+    )
+    statements = _statements(
+        "select * from a;",
+        "select * from b;",
+        "create table c (x int);",
+        "select * from c;",
+    )
+
+    results = execute_concurrently(connection, statements)
+
+    with pytest.raises(ProgrammingError, match="select \\* from a"):
+        next(results)
+    # only queries run ahead of an unfinished statement, and they are cancelled
+    assert connection.started == ["select * from a;", "select * from b;"]
+    connection.cursors[1].abort_query.assert_called_once_with("qid-1")
+    connection.cursors[0].abort_query.assert_not_called()
+
+
+@mock.patch("snowflake.cli._plugins.sql.auto_parallel.time.sleep")
+def test_execute_concurrently_cancels_running_statements_when_abandoned(_):
+    connection = _FakeConnection(durations={"select * from b;": 5})
+    statements = _statements("select * from a;", "select * from b;")
+
+    results = execute_concurrently(connection, statements)
+    assert next(results)[0] == "select * from a;"
+    results.close()
+
+    connection.cursors[1].abort_query.assert_called_once_with("qid-1")
+
+
+@mock.patch("snowflake.cli._plugins.sql.auto_parallel.time.sleep")
+def test_execute_concurrently_reads_statements_as_scheduled(_):
+    connection = _FakeConnection()
+    read = []
+
+    def statements():
+        for i in range(100):
+            read.append(i)
+            yield f"select {i} from t{i};", analyze_statement(f"select {i} from t{i};")
+
+    results = execute_concurrently(connection, statements(), window=4)
+
+    assert next(results)[0] == "select 0 from t0;"
+    assert len(read) <= 5
+    assert len(list(results)) == 99
+
+
+@mock.patch("snowflake.cli._plugins.sql.auto_parallel.time.sleep")
+@mock.patch("snowflake.cli.api.sql_execution.BaseSqlExecutor._execute_string")
+def test_execute_auto_parallel_runs_barriers_alone(mock_execute_string, _):
+    connection = _FakeConnection()
+    executed = []
+    mock_execute_string.side_effect = lambda query, **kwargs: executed.append(
+        (query, list(connection.started))
+    ) or iter([mock.MagicMock()])
+
+    _, cursors = SqlManager(connection=connection).execute(
+        query="select 1 from a; select 2 from b; use schema s; select 3 from c;",
+        files=None,
+        std_in=False,
+        auto_parallel=True,
+    )
+
+    assert len(list(cursors)) == 4
+    # the barrier runs after the statements before it and before the ones after it
+    assert executed == [("use schema s;", ["select 1 from a;", "select 2 from b;"])]
+    assert connection.started == [
+        "select 1 from a;",
+        "select 2 from b;",
+        "select 3 from c;",
+    ]
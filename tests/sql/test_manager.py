@@ -1,6 +1,12 @@
 from unittest import mock
 
-from snowflake.cli._plugins.sql.manager import SqlManager
+import pytest
+from snowflake.cli._plugins.sql.manager import (
+    READ_AHEAD_STATEMENTS,
+    SqlManager,
+    _read_ahead,
+)
+from snowflake.cli.api.exceptions import CliSqlError
 
 
 @mock.patch("snowflake.cli.api.sql_execution.BaseSqlExecutor._execute_string")
@@ -15,3 +21,115 @@ def test_execute_passed_correct_query(mock_execute_string):
     assert mock_execute_string.call_count == 2
     executed_queries = [call.args[0] for call in mock_execute_string.call_args_list]
     assert executed_queries == ["select 1;", "select 2"]
+
+
+@pytest.mark.parametrize(
+    "query, expected_results",
+    [
+        ("select 1;", 1),
+        ("select 1; select 2; select 3;", 3),
+        ("select 1;>", 0),
+        ("select 1;> select 2;", 1),
+    ],
+)
+@mock.patch("snowflake.cli.api.sql_execution.BaseSqlExecutor._execute_string")
+def test_execute_counts_expected_results(mock_execute_string, query, expected_results):
+    expected_results_cnt, _ = SqlManager().execute(
+        query=query, files=None, std_in=False
+    )
+
+    assert expected_results_cnt == expected_results
+
+
+@mock.patch("snowflake.cli.api.sql_execution.BaseSqlExecutor._execute_string")
+def test_execute_streams_statements_from_file(mock_execute_string, tmp_path):
+    sql_file = tmp_path / "dump.sql"
+    sql_file.write_text("".join(f"select {i};\n" for i in range(1000)))
+
+    _, result_generator = SqlManager().execute(
+        query=None, files=[sql_file], std_in=False
+    )
+    next(iter(result_generator), None)
+    list(result_generator)
+
+    executed_queries = [call.args[0] for call in mock_execute_string.call_args_list]
+    assert executed_queries == [f"select {i};" for i in range(1000)]
+
+
+@mock.patch("snowflake.cli._plugins.sql.manager.cli_console")
+@mock.patch("snowflake.cli.api.sql_execution.BaseSqlExecutor._execute_string")
+def test_execute_reports_all_errors_before_execution(mock_execute_string, mock_console):
+    with pytest.raises(CliSqlError):
+        SqlManager().execute(
+            query="!unknown1;\nselect 1;\n!unknown2;", files=None, std_in=False
+        )
+
+    mock_execute_string.assert_not_called()
+    assert mock_console.warning.call_count == 2
+
+
+@mock.patch("snowflake.cli._plugins.sql.manager.cli_console")
+@mock.patch("snowflake.cli.api.sql_execution.BaseSqlExecutor._execute_string")
+def test_execute_reports_late_error_before_execution(
+    mock_execute_string, mock_console, tmp_path
+):
+    sql_file = tmp_path / "dump.sql"
+    sql_file.write_text(
+        "".join(f"select {i};\n" for i in range(READ_AHEAD_STATEMENTS * 3))
+        + "!unknown;\nselect 1;\n"
+    )
+
+    with pytest.raises(CliSqlError):
+        SqlManager().execute(query=None, files=[sql_file], std_in=False)
+
+    mock_execute_string.assert_not_called()
+    (warning,) = mock_console.warning.call_args.args
+    assert warning.endswith(f"({sql_file}, statement {READ_AHEAD_STATEMENTS * 3 + 1})")
+
+
+def test_read_ahead_stops_producer_when_consumer_stops():
+    produced = []
+
+    def source():
+        for i in range(1000):
+            produced.append(i)
+            yield i
+
+    statements = _read_ahead(source(), size=2)
+    assert next(statements) == 0
+    statements.close()
+
+    assert len(produced) < 10
+
+
+def test_read_ahead_reraises_producer_errors():
+    def source():
+        yield 1
+        raise ValueError("broken")
+
+    statements = _read_ahead(source(), size=2)
+
+    assert next(statements) == 1
+    with pytest.raises(ValueError, match="broken"):
+        next(statements)
+
+
+@mock.patch("snowflake.cli.api.sql_execution.BaseSqlExecutor._execute_string")
+def test_execute_stores_compiled_templates_in_configured_directory(
+    mock_execute_string, tmp_path
+):
+    cache_dir = tmp_path / "templates"
+    with mock.patch.dict(
+        "os.environ", {"SNOWFLAKE_CLI_SQL_TEMPLATE_CACHE_DIR": str(cache_dir)}
+    ):
+        _, result_generator = SqlManager().execute(
+            query="select <% foo %>; select <% foo %>;",
+            files=None,
+            std_in=False,
+            data={"foo": "bar"},
+        )
+        list(result_generator)
+
+    executed_queries = [call.args[0] for call in mock_execute_string.call_args_list]
+    assert executed_queries == ["select bar;", "select bar;"]
+    assert len(list(cache_dir.iterdir())) == 1
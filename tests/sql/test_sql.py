@@ -11,7 +11,9 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+import json
 import sys
+import threading
 from pathlib import Path
 from tempfile import NamedTemporaryFile, TemporaryDirectory
 from textwrap import dedent
@@ -32,6 +34,7 @@ from snowflake.cli.api.project.util import identifier_to_show_like_pattern
 from snowflake.cli.api.rendering.sql_templates import SQLTemplateSyntaxConfig
 from snowflake.cli.api.sql_execution import SqlExecutionMixin, VerboseCursor
 from snowflake.connector.cursor import DictCursor
+from snowflake.connector.errors import ProgrammingError
 
 from tests.testing_utils.result_assertions import assert_that_result_is_usage_error
 
@@ -78,6 +81,174 @@ def test_sql_execute_multiple_file(mock_execute, runner, mock_cursor):
     )
 
 
+def _query_cursors(mock_cursor, slow_query=None, until_query=None, failing_query=None):
+    """Executes queries on cursors returning their text; slow_query only finishes
+    after until_query was executed."""
+    until_executed = threading.Event()
+
+    def execute(query, **kwargs):
+        if query == slow_query:
+            assert until_executed.wait(timeout=30), f"{until_query} did not run"
+        if query == until_query:
+            until_executed.set()
+        if query == failing_query:
+            raise ProgrammingError(f"{query} failed")
+        cursor = mock_cursor(rows=[(query,)], columns=["query"])
+        cursor.query = query
+        return iter([cursor])
+
+    return execute
+
+
+@mock.patch("snowflake.cli.api.connections.ConnectionContext.build_connection")
+@mock.patch("snowflake.cli._plugins.sql.manager.SqlExecutionMixin._execute_string")
+def test_sql_execute_files_in_parallel(
+    mock_execute, mock_build_connection, runner, mock_cursor, tmp_path
+):
+    # the first file finishes last
+    mock_execute.side_effect = _query_cursors(
+        mock_cursor, slow_query="select 'f1a';", until_query="select 'f3b';"
+    )
+    connections = []
+    mock_build_connection.side_effect = (
+        lambda: connections.append(mock.MagicMock()) or connections[-1]
+    )
+    files = []
+    for name in ["f1", "f2", "f3"]:
+        file = tmp_path / f"{name}.sql"
+        file.write_text(f"select '{name}a';\nselect '{name}b';")
+        files.extend(["-f", file])
+
+    result = runner.invoke(["sql", *files, "--parallel-files", "3", "--format", "json"])
+
+    assert result.exit_code == 0, result.output
+    assert [r[0]["query"] for r in json.loads(result.output)] == [
+        "select 'f1a';",
+        "select 'f1b';",
+        "select 'f2a';",
+        "select 'f2b';",
+        "select 'f3a';",
+        "select 'f3b';",
+    ]
+    # besides the CLI's own connection, each file had its own one, closed once done
+    file_connections = [c for c in connections if c.cursor.called or c.close.called]
+    assert len(file_connections) == 3
+    for connection in file_connections:
+        connection.close.assert_called_once()
+
+
+@mock.patch("snowflake.cli._plugins.sql.manager.SqlExecutionMixin._execute_string")
+def test_sql_format_ndjson(mock_execute, runner, mock_cursor):
+    mock_execute.return_value = iter(
+        [
+            mock_cursor(rows=[(1, "a"), (2, "b")], columns=["ID", "NAME"]),
+            mock_cursor(rows=[("done",)], columns=["status"]),
+        ]
+    )
+
+    result = runner.invoke(["sql", "-q", "select 1; select 2;", "--format", "ndjson"])
+
+    assert result.exit_code == 0, result.output
+    assert [json.loads(line) for line in result.output.splitlines()] == [
+        {"statement_index": 0, "ID": 1, "NAME": "a"},
+        {"statement_index": 0, "ID": 2, "NAME": "b"},
+        {"statement_index": 1, "status": "done"},
+    ]
+
+
+@mock.patch("snowflake.cli.api.connections.ConnectionContext.build_connection")
+@mock.patch("snowflake.cli._plugins.sql.manager.SqlExecutionMixin._execute_string")
+def test_sql_execute_files_in_parallel_isolates_errors(
+    mock_execute, mock_build_connection, runner, mock_cursor, tmp_path
+):
+    mock_execute.side_effect = _query_cursors(
+        mock_cursor, failing_query="select 'f1a';"
+    )
+    f1 = tmp_path / "f1.sql"
+    f1.write_text("select 'f1a';\nselect 'f1b';")
+    f2 = tmp_path / "f2.sql"
+    f2.write_text("select 'f2a';")
+
+    result = runner.invoke(["sql", "-f", f1, "-f", f2, "--parallel-files", "2"])
+
+    assert result.exit_code == 1
+    assert "select 'f1a'; failed" in result.output
+    assert "f1b" not in result.output
+    assert "f2a" in result.output
+    assert "Execution failed for 1 of 2 files" in result.output
+
+
+@mock.patch("snowflake.cli.api.connections.ConnectionContext.build_connection")
+@mock.patch("snowflake.cli._plugins.sql.manager.SqlExecutionMixin._execute_string")
+def test_sql_execute_files_in_parallel_refuses_repl_commands(
+    mock_execute, mock_build_connection, runner, tmp_path
+):
+    f1 = tmp_path / "f1.sql"
+    f1.write_text("select 'f1a';")
+    f2 = tmp_path / "f2.sql"
+    f2.write_text("select 'f2a';\n!queries amount=1;")
+
+    result = runner.invoke(["sql", "-f", f1, "-f", f2, "--parallel-files", "2"])
+
+    assert result.exit_code == 1
+    assert "REPL commands cannot be used with --parallel-files" in result.output
+    mock_execute.assert_not_called()
+
+
+@pytest.mark.parametrize(
+    "option, message",
+    [
+        (["--authenticator", "externalbrowser"], "the externalbrowser authenticator"),
+        (["--mfa-passcode", "123456"], "an MFA passcode"),
+    ],
+)
+@mock.patch("snowflake.cli.api.connections.ConnectionContext.build_connection")
+def test_sql_parallel_files_refuses_interactive_authentication(
+    mock_build_connection, runner, tmp_path, option, message
+):
+    f1 = tmp_path / "f1.sql"
+    f1.write_text("select 1;")
+    f2 = tmp_path / "f2.sql"
+    f2.write_text("select 2;")
+
+    result = runner.invoke(
+        ["sql", "-f", f1, "-f", f2, "--parallel-files", "2", *option]
+    )
+
+    assert result.exit_code == 1
+    assert f"--parallel-files cannot be used with {message}" in result.output
+    mock_build_connection.return_value.cursor.assert_not_called()
+
+
+def test_sql_parallel_files_requires_files(runner):
+    result = runner.invoke(["sql", "-q", "select 1", "--parallel-files", "2"])
+
+    assert result.exit_code == 1
+    assert "--parallel-files can only be used with --filename." in result.output
+
+
+@mock.patch("snowflake.cli._plugins.sql.commands.SqlManager")
+def test_command_auto_parallel_flag(mock_manager, mock_cursor, runner):
+    mock_manager().execute.return_value = (0, mock_cursor([], []))
+    result = runner.invoke(["sql", "-q", "select 1", "--auto-parallel"])
+    assert result.exit_code == 0, result.output
+    _, kwargs = mock_manager().execute.call_args
+    assert kwargs["auto_parallel"] is True
+
+
+@pytest.mark.parametrize(
+    "option", [["--single-transaction"], ["--parallel-files", "2"]]
+)
+def test_sql_auto_parallel_incompatible_options(runner, tmp_path, option):
+    file = tmp_path / "f.sql"
+    file.write_text("select 1;")
+
+    result = runner.invoke(["sql", "-f", file, "--auto-parallel", *option])
+
+    assert result.exit_code == 1
+    assert f"--auto-parallel cannot be used with {option[0]}." in result.output
+
+
 @mock.patch("snowflake.cli._plugins.sql.manager.SqlExecutionMixin._execute_string")
 def test_sql_execute_from_stdin(mock_execute, runner, mock_cursor):
     mock_execute.return_value = (mock_cursor(["row"], []) for _ in range(1))
@@ -771,6 +942,7 @@ def test_command_enable_templating_flag(
             enable_jinja_syntax=exp_jinja,
         ),
         local_only=False,
+        auto_parallel=False,
     )
 
 
@@ -11,6 +11,7 @@ from snowflake.cli._plugins.sql.statement_reader import (
     _protect_sql_comments,
     compile_statements,
     files_reader,
+    iter_compiled_statements,
     parse_statement,
     query_reader,
 )
@@ -384,6 +385,31 @@ def test_parse_source_file(tmp_path_factory: pytest.TempPathFactory):
     assert source.error is None
 
 
+def test_parse_source_file_without_reading(tmp_path_factory: pytest.TempPathFactory):
+    f1 = tmp_path_factory.mktemp("a") / "f1.sql"
+    f1.write_text("select 1;")
+
+    source = parse_statement(
+        f"!source {f1.as_posix()};", WORKING_OPERATOR_FUNCS, read_files=False
+    )
+
+    assert source.statement_type == StatementType.FILE
+    assert source.source_path == f1.as_posix()
+    assert source.statement.read() == ""
+    assert source.error is None
+
+
+def test_iter_compiled_statements_yields_errors_in_place():
+    compiled = list(
+        iter_compiled_statements(
+            query_reader("select 1;\n!unknown;\nselect 2;", WORKING_OPERATOR_FUNCS)
+        )
+    )
+
+    assert [c.statement for c in compiled] == ["select 1;", None, "select 2;"]
+    assert compiled[1].error
+
+
 def test_parse_source_invalid_file(tmp_path_factory: pytest.TempPathFactory):
     f1 = tmp_path_factory.mktemp("a") / "f1.sql"
 
@@ -0,0 +1,140 @@
+import io
+import random
+from timeit import default_timer as timer
+
+import pytest
+from snowflake.cli._plugins.sql.statement_splitter import split_statements
+from snowflake.connector.util_text import split_statements as connector_split_statements
+
+CORPUS = [
+    "",
+    "\n\n",
+    "select 1",
+    "select 1;",
+    "select 1; select 2;",
+    "select 1;\nselect 2;\n",
+    "select 1;> select 2;>\n",
+    "select 1;   -- trailing comment\nselect 2;",
+    "select 1; /* not a trailing comment */ select 2;",
+    "-- only a comment",
+    "-- comment\nselect 1; -- comment\n-- comment\n",
+    "/* block\ncomment; spanning lines */ select 1;",
+    "select /* inline */ 1; /* unterminated",
+    "select 'a;b', \"c;d\", 'e''f;', \"g\"\"h;\";",
+    "select 'escaped \\' quote;', 'backslash \\\\';",
+    "select 'multi\nline; string';",
+    "select '-- not a comment', '/* not a comment */';",
+    "create function f() returns int as $$ select 1; $$;",
+    "create procedure p() as $$\nbegin\n  return 1;\nend;\n$$;\nselect 2;",
+    "select $$ unterminated ;\nselect 2;",
+    "!source file.sql\nselect 1;",
+    "select 1\n!queries amount=2;\nselect 2;",
+    "!queries amount=3; select 3;",
+    " !not a command; select 1;",
+    "put file:///tmp/*.csv @stage;",
+    "PUT file:///tmp/data/*.csv @stage auto_compress=true;\nget @stage/x file:///tmp/;",
+    "  put\tfile:///a/*.csv @s;",
+    "select 1 --; not split\n, 2;",
+    "select\t1;\tselect\t2;",
+    "select 'a'\"b\"'c';",
+    "select 1;;;",
+    "x;\r\ny;\r\n",
+    "selecté 'ü;' ; -- ünïcode\n",
+]
+
+FRAGMENTS = [
+    "select",
+    "put",
+    "GET",
+    "a",
+    "12",
+    " ",
+    "\t",
+    "\n",
+    "\r\n",
+    ";",
+    ";>",
+    ">",
+    "'",
+    '"',
+    "''",
+    '""',
+    "\\",
+    "\\'",
+    "--",
+    "-- c\n",
+    "/*",
+    "*/",
+    "$$",
+    "!",
+    "!source x\n",
+    "file://",
+    "file:///*",
+    "'a;b'",
+    "$$ ; $$",
+]
+
+
+def _random_scripts(count: int, seed: int = 0):
+    rnd = random.Random(seed)
+    for _ in range(count):
+        yield "".join(rnd.choice(FRAGMENTS) for _ in range(rnd.randint(0, 40)))
+
+
+def _assert_same_as_connector(script: str):
+    for remove_comments in (False, True):
+        assert list(split_statements(io.StringIO(script), remove_comments)) == list(
+            connector_split_statements(io.StringIO(script), remove_comments)
+        ), f"{script!r} (remove_comments={remove_comments})"
+
+
+@pytest.mark.parametrize("script", CORPUS)
+def test_split_statements_matches_connector(script):
+    _assert_same_as_connector(script)
+
+
+def test_split_statements_matches_connector_on_random_scripts():
+    for script in _random_scripts(5000):
+        _assert_same_as_connector(script)
+
+
+def test_split_statements_reads_from_file(tmp_path):
+    script = "\n".join(CORPUS)
+    file = tmp_path / "script.sql"
+    file.write_text(script)
+    with file.open() as f, file.open() as reference:
+        assert list(split_statements(f)) == list(connector_split_statements(reference))
+
+
+def test_split_statements_rejects_binary_input():
+    with pytest.raises(TypeError):
+        list(split_statements(io.BytesIO(b"select 1;")))
+
+
+SAMPLE_AMOUNT = 5
+BENCHMARK_SCRIPT = (
+    "select a, b, 'x;y' as c -- comment\nfrom t where d = \"q\" /* block */;\n"
+    "create function f() returns int as $$ select 1; $$;\n"
+    "insert into t values "
+    + ", ".join(f"({i}, 'value {i}')" for i in range(200))
+    + ";\n"
+) * 200
+
+
+def _best_time(split) -> float:
+    results = []
+    for _ in range(SAMPLE_AMOUNT):
+        start = timer()
+        for _ in split(io.StringIO(BENCHMARK_SCRIPT)):
+            pass
+        results.append(timer() - start)
+    return min(results)
+
+
+@pytest.mark.performance
+def test_split_statements_performance():
+    fast = _best_time(split_statements)
+    reference = _best_time(connector_split_statements)
+    assert (
+        fast * 3 <= reference
+    ), f"Splitting took {fast:.3f}s, the connector takes {reference:.3f}s"
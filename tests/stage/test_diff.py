@@ -15,6 +15,7 @@
 from __future__ import annotations
 
 import hashlib
+import shutil
 import typing
 from pathlib import Path
 from typing import Dict, List, Union
@@ -26,15 +27,24 @@ from snowflake.cli._plugins.stage.diff import (
     StagePathType,
     build_md5_map,
     compute_stage_diff,
+    compute_stage_to_stage_diff,
+    copy_moved_files_on_stage,
     delete_only_on_stage_files,
     enumerate_files,
     get_stage_subpath,
+    mirror_stage_diff,
     preserve_from_diff,
     put_files_on_stage,
     sync_local_diff_with_stage,
+    to_stage_path,
+    walk_sorted,
 )
 from snowflake.cli._plugins.stage.manager import DefaultStagePathParts, StageManager
 from snowflake.cli._plugins.stage.utils import print_diff_to_console
+from snowflake.cli._plugins.stage.watch import (
+    LocalChangeWatcher,
+    sync_changes_with_stage,
+)
 from snowflake.cli.api.artifacts.bundle_map import BundleMap
 from snowflake.cli.api.exceptions import (
     SnowflakeSQLExecutionError,
@@ -48,6 +58,8 @@ if IS_WINDOWS:
 
 STAGE_MANAGER = "snowflake.cli._plugins.stage.manager.StageManager"
 STAGE_DIFF = "snowflake.cli._plugins.object.stage.diff"
+STAGE_WATCH = "snowflake.cli._plugins.stage.watch"
+STAGE_DIFF_MODULE = "snowflake.cli._plugins.stage.diff"
 
 FILE_CONTENTS = {
     "README.md": "This is a README\n",
@@ -97,7 +109,7 @@ def test_empty_stage(mock_list, mock_cursor):
         diff_result = compute_stage_diff(local_path, DefaultStagePathParts("a.b.c"))
         assert len(diff_result.only_on_stage) == 0
         assert len(diff_result.different) == 0
-        assert len(diff_result.identical) == 0
+        assert diff_result.identical == 0
         assert sorted(diff_result.only_local) == sorted(
             as_stage_paths(FILE_CONTENTS.keys())
         )
@@ -116,7 +128,7 @@ def test_empty_dir(mock_list, mock_cursor):
             as_stage_paths(FILE_CONTENTS.keys())
         )
         assert len(diff_result.different) == 0
-        assert len(diff_result.identical) == 0
+        assert diff_result.identical == 0
         assert len(diff_result.only_local) == 0
 
 
@@ -131,9 +143,7 @@ def test_identical_stage(mock_list, mock_cursor):
         diff_result = compute_stage_diff(local_path, DefaultStagePathParts("a.b.stage"))
         assert len(diff_result.only_on_stage) == 0
         assert len(diff_result.different) == 0
-        assert sorted(diff_result.identical) == sorted(
-            as_stage_paths(FILE_CONTENTS.keys())
-        )
+        assert diff_result.identical == len(FILE_CONTENTS)
         assert len(diff_result.only_local) == 0
 
 
@@ -150,9 +160,7 @@ def test_new_local_file(mock_list, mock_cursor):
         diff_result = compute_stage_diff(local_path, DefaultStagePathParts("a.b.stage"))
         assert len(diff_result.only_on_stage) == 0
         assert len(diff_result.different) == 0
-        assert sorted(diff_result.identical) == sorted(
-            as_stage_paths(FILE_CONTENTS.keys())
-        )
+        assert diff_result.identical == len(FILE_CONTENTS)
         assert diff_result.only_local == as_stage_paths(["a/new/README.md"])
 
 
@@ -172,9 +180,7 @@ def test_modified_file(mock_list, mock_cursor):
         diff_result = compute_stage_diff(local_path, DefaultStagePathParts("a.b.stage"))
         assert len(diff_result.only_on_stage) == 0
         assert sorted(diff_result.different) == as_stage_paths(["README.md"])
-        assert sorted(diff_result.identical) == as_stage_paths(
-            ["my.jar", "ui/streamlit.py"]
-        )
+        assert diff_result.identical == 2
         assert len(diff_result.only_local) == 0
 
 
@@ -198,12 +204,133 @@ def test_unmodified_file_no_remote_md5sum(mock_list, mock_cursor):
         diff_result = compute_stage_diff(local_path, DefaultStagePathParts("a.b.stage"))
         assert len(diff_result.only_on_stage) == 0
         assert sorted(diff_result.different) == as_stage_paths(["README.md"])
-        assert sorted(diff_result.identical) == as_stage_paths(
-            ["my.jar", "ui/streamlit.py"]
-        )
+        assert diff_result.identical == 2
         assert len(diff_result.only_local) == 0
 
 
+@mock.patch(f"{STAGE_MANAGER}.list_files")
+def test_many_files_keep_local_order(mock_list, mock_cursor):
+    local_contents = {f"dir{i % 3}/file{i:03}.txt": f"contents {i}" for i in range(60)}
+    stage_files = {
+        path: contents if i % 4 else "modified on stage"
+        for i, (path, contents) in enumerate(local_contents.items())
+        if i % 5
+    }
+    mock_list.return_value = mock_cursor(
+        rows=stage_contents(stage_files),
+        columns=STAGE_LS_COLUMNS,
+    )
+
+    with temp_local_dir(local_contents) as local_path:
+        diff_result = compute_stage_diff(local_path, DefaultStagePathParts("a.b.stage"))
+        local_order = [
+            to_stage_path(f.relative_to(local_path))
+            for f in enumerate_files(local_path)
+        ]
+
+    def in_local_order(paths):
+        expected = set(as_stage_paths(paths))
+        return [p for p in local_order if p in expected]
+
+    assert diff_result.identical == sum(
+        1 for i in range(len(local_contents)) if i % 5 and i % 4
+    )
+    assert diff_result.different == in_local_order(
+        p for i, p in enumerate(local_contents) if i % 5 and not i % 4
+    )
+    assert diff_result.only_local == in_local_order(
+        p for i, p in enumerate(local_contents) if not i % 5
+    )
+    assert len(diff_result.only_on_stage) == 0
+
+
+@mock.patch(f"{STAGE_MANAGER}.list_files")
+def test_diff_merges_paths_sorting_around_separator(mock_list, mock_cursor):
+    # "a-b" sorts before "a/..." as strings, but after the "a" directory in a walk
+    local_contents = {
+        "a/x.txt": "x",
+        "a-b": "a-b",
+        "a.txt": "a",
+        "a/b/y.txt": "y",
+        "b/z.txt": "z",
+    }
+    stage_files = {
+        "a/b/y.txt": "y",
+        "a-b": "changed",
+        "a.txt": "a",
+        "a0": "only on stage",
+        "b/z.txt": "z",
+        "a/b/stale.txt": "only on stage",
+    }
+    # the listing order is not relied upon
+    mock_list.return_value = mock_cursor(
+        rows=list(reversed(stage_contents(stage_files))),
+        columns=STAGE_LS_COLUMNS,
+    )
+
+    with temp_local_dir(local_contents) as local_path:
+        diff_result = compute_stage_diff(local_path, DefaultStagePathParts("a.b.stage"))
+
+    assert diff_result.identical == 3
+    assert diff_result.different == as_stage_paths(["a-b"])
+    assert diff_result.only_local == as_stage_paths(["a/x.txt"])
+    assert diff_result.only_on_stage == as_stage_paths(["a/b/stale.txt", "a0"])
+
+
+def test_walk_sorted_matches_enumerate_files():
+    with temp_local_dir(
+        {
+            **FILE_CONTENTS,
+            "ui-pages/page.py": "# page",
+            "ui/nested/environment.yml": "# this is a environment file\n",
+            "ui.md": "# ui",
+        }
+    ) as local_path:
+        assert [path for _, path in walk_sorted(local_path)] == enumerate_files(
+            local_path
+        )
+        assert [
+            StagePathType(stage_path) for stage_path, _ in walk_sorted(local_path)
+        ] == [
+            to_stage_path(f.relative_to(local_path))
+            for f in enumerate_files(local_path)
+        ]
+
+
+@mock.patch(f"{STAGE_MANAGER}.list_files")
+def test_moved_files(mock_list, mock_cursor):
+    mock_list.return_value = mock_cursor(
+        rows=stage_contents(
+            {
+                "old/README.md": FILE_CONTENTS["README.md"],
+                "old/app.py": "# app",
+                "old/renamed.py": "# renamed",
+            }
+        ),
+        columns=STAGE_LS_COLUMNS,
+    )
+
+    with temp_local_dir(
+        {
+            "new/README.md": FILE_CONTENTS["README.md"],
+            "new/app.py": "# modified app",
+            "new/other_name.py": "# renamed",
+        }
+    ) as local_path:
+        diff_result = compute_stage_diff(local_path, DefaultStagePathParts("a.b.stage"))
+
+    # moved files are still reported as added and deleted
+    assert diff_result.only_local == as_stage_paths(
+        ["new/README.md", "new/app.py", "new/other_name.py"]
+    )
+    assert diff_result.only_on_stage == as_stage_paths(
+        ["old/README.md", "old/app.py", "old/renamed.py"]
+    )
+    assert diff_result.moved == {
+        StagePathType("new/README.md"): StagePathType("old/README.md")
+    }
+
+
 def test_get_stage_path_from_file():
     expected = [
         "",
@@ -227,26 +354,40 @@ def test_get_stage_path_from_file():
     assert actual.sort() == expected
 
 
-@mock.patch(f"{STAGE_MANAGER}.remove")
-def test_delete_only_on_stage_files(mock_remove):
+@mock.patch(f"{STAGE_MANAGER}.remove_many")
+def test_delete_only_on_stage_files(mock_remove_many):
     stage_name = "some_stage_name"
-    random_file = "some_file_on_stage"
+    random_files = ["some_file_on_stage", "dir/other_file_on_stage"]
 
-    delete_only_on_stage_files(
-        StageManager(), stage_name, as_stage_paths([random_file]), "some_role"
+    cursors = delete_only_on_stage_files(
+        StageManager(), stage_name, as_stage_paths(random_files), "some_role"
     )
-    mock_remove.assert_has_calls(
-        [mock.call(stage_name=stage_name, path=random_file, role="some_role")]
+    mock_remove_many.assert_called_once_with(
+        stage_name=stage_name, paths=random_files, role="some_role"
     )
+    assert cursors == mock_remove_many.return_value
 
 
+@mock.patch(f"{STAGE_MANAGER}.use_role")
 @mock.patch(f"{STAGE_MANAGER}.put")
 @pytest.mark.parametrize("overwrite_param", [True, False])
-def test_put_files_on_stage(mock_put, overwrite_param):
+def test_put_files_on_stage(mock_put, mock_use_role, overwrite_param):
     stage_name = "some_stage_name"
+    uploaded = {}
+
+    def fake_put(**kwargs):
+        # one PUT per directory, each handed a directory with only the selected files
+        uploaded[str(kwargs["stage_path"])] = sorted(
+            p.name for p in Path(kwargs["local_path"]).iterdir()
+        )
+        return mock.MagicMock(fetchall=mock.MagicMock(return_value=[]))
+
+    mock_put.side_effect = fake_put
     with temp_local_dir(
         {
             "ui/nested/environment.yml": "# this is a environment file\n",
+            "ui/nested/streamlit.py": "# this is a streamlit file\n",
+            "ui/nested/unchanged.py": "# this file is not uploaded\n",
             "README.md": "# this is an app file\n",
         }
     ) as local_path:
@@ -254,25 +395,34 @@ def test_put_files_on_stage(mock_put, overwrite_param):
             stage_manager=StageManager(),
             stage_root=stage_name,
             deploy_root_path=local_path,
-            stage_paths=as_stage_paths(["ui/nested/environment.yml", "README.md"]),
+            stage_paths=as_stage_paths(
+                ["ui/nested/environment.yml", "README.md", "ui/nested/streamlit.py"]
+            ),
             role="some_role",
             overwrite=overwrite_param,
         )
-        expected = [
-            mock.call(
-                local_path=local_path / "ui/nested/environment.yml",
-                stage_path=f"{stage_name}/ui/nested",  # TODO: verify if trailing slash is needed, doesn't seem so from regression tests
-                role="some_role",
-                overwrite=overwrite_param,
-            ),
-            mock.call(
-                local_path=local_path / "README.md",
-                stage_path=f"{stage_name}",
-                role="some_role",
-                overwrite=overwrite_param,
-            ),
-        ]
-        assert mock_put.mock_calls == expected
+
+    assert uploaded == {
+        f"@{stage_name}/ui/nested": ["environment.yml", "streamlit.py"],
+        f"@{stage_name}": ["README.md"],
+    }
+    assert mock_put.call_count == 2
+    # the concurrent PUTs share one session, so the role is switched once around them
+    mock_use_role.assert_called_once_with("some_role")
+    for call in mock_put.mock_calls:
+        assert "role" not in call.kwargs
+        assert call.kwargs["overwrite"] == overwrite_param
+
+
+@mock.patch(f"{STAGE_MANAGER}.put")
+def test_put_files_on_stage_no_files(mock_put):
+    put_files_on_stage(
+        stage_manager=StageManager(),
+        stage_root="some_stage_name",
+        deploy_root_path=Path("."),
+        stage_paths=[],
+    )
+    mock_put.assert_not_called()
 
 
 def test_build_md5_map(mock_cursor):
@@ -311,6 +461,121 @@ def test_sync_local_diff_with_stage(mock_remove, temporary_directory):
         )
 
 
+@mock.patch(f"{STAGE_MANAGER}.put")
+@mock.patch(f"{STAGE_MANAGER}.remove")
+def test_sync_local_diff_with_stage_reports_files_not_deleted(
+    mock_remove, mock_put, temporary_directory
+):
+    def remove(stage_name, path, role=None):
+        if path == "b.py":
+            raise Exception("Mock Exception")
+        return mock.MagicMock()
+
+    mock_remove.side_effect = remove
+    diff = DiffResult(only_on_stage=as_stage_paths(["a.py", "b.py"]))
+
+    with pytest.raises(SnowflakeSQLExecutionError) as err:
+        sync_local_diff_with_stage(
+            role=None,
+            deploy_root_path=Path(temporary_directory),
+            diff_result=diff,
+            stage_full_path="some_stage_name",
+        )
+
+    assert mock_remove.call_count == 2
+    assert "Could not remove 1 of 2 files" in err.value.message
+    assert "b.py: Mock Exception" in err.value.message
+
+
+@mock.patch(f"{STAGE_MANAGER}.put")
+@mock.patch(f"{STAGE_MANAGER}.remove")
+@mock.patch(f"{STAGE_MANAGER}.copy_files")
+def test_sync_local_diff_with_stage_copies_moved_files(
+    mock_copy, mock_remove, mock_put, temporary_directory
+):
+    mock_put.return_value.fetchall.return_value = []
+    diff = DiffResult()
+    diff.only_local = as_stage_paths(["new/a.py", "new/b.py", "c.py", "new/d.py"])
+    diff.only_on_stage = as_stage_paths(["old/a.py", "old/b.py", "old/c.py"])
+    diff.moved = {
+        StagePathType("new/a.py"): StagePathType("old/a.py"),
+        StagePathType("new/b.py"): StagePathType("old/b.py"),
+        StagePathType("c.py"): StagePathType("old/c.py"),
+    }
+    calls = mock.Mock()
+    calls.attach_mock(mock_copy, "copy_files")
+    calls.attach_mock(mock_remove, "remove")
+
+    with temp_local_dir({"new/d.py": "# d"}) as local_path:
+        sync_local_diff_with_stage(
+            role=None,
+            deploy_root_path=local_path,
+            diff_result=diff,
+            stage_full_path="db.schema.stage/app",
+        )
+
+    assert calls.mock_calls[:2] == [
+        mock.call.copy_files(
+            source_path="db.schema.stage/app/old/",
+            destination_path="db.schema.stage/app/new",
+            files=["a.py", "b.py"],
+        ),
+        mock.call.copy_files(
+            source_path="db.schema.stage/app/old/",
+            destination_path="db.schema.stage/app",
+            files=["c.py"],
+        ),
+    ]
+    assert mock_remove.call_count == 3
+    # only the file that was not moved is uploaded
+    mock_put.assert_called_once()
+    assert str(mock_put.call_args.kwargs["stage_path"]) == "@db.schema.stage/app/new"
+
+
+@mock.patch(f"{STAGE_MANAGER}.put")
+@mock.patch(f"{STAGE_MANAGER}.copy_files")
+def test_sync_local_diff_with_user_stage_uploads_moved_files(
+    mock_copy, mock_put, temporary_directory
+):
+    mock_put.return_value.fetchall.return_value = []
+    diff = DiffResult()
+    diff.only_local = as_stage_paths(["new/a.py"])
+    diff.moved = {StagePathType("new/a.py"): StagePathType("old/a.py")}
+
+    with temp_local_dir({"new/a.py": "# a"}) as local_path:
+        sync_local_diff_with_stage(
+            role=None,
+            deploy_root_path=local_path,
+            diff_result=diff,
+            stage_full_path="@~/app",
+        )
+
+    mock_copy.assert_not_called()
+    mock_put.assert_called_once()
+
+
+@mock.patch(f"{STAGE_DIFF_MODULE}.COPY_FILES_BATCH_SIZE", 2)
+@mock.patch(f"{STAGE_MANAGER}.copy_files")
+def test_copy_moved_files_on_stage_in_batches(mock_copy):
+    moved = {
+        StagePathType(f"new/{name}"): StagePathType(f"old/{name}")
+        for name in ["a.py", "b.py", "c.py"]
+    }
+
+    copy_moved_files_on_stage(StageManager(), "@stage", moved)
+
+    assert mock_copy.mock_calls == [
+        mock.call(
+            source_path="@stage/old/",
+            destination_path="@stage/new",
+            files=["a.py", "b.py"],
+        ),
+        mock.call(
+            source_path="@stage/old/", destination_path="@stage/new", files=["c.py"]
+        ),
+    ]
+
+
 def test_filter_from_diff():
     diff = DiffResult()
     diff.different = as_stage_paths(
@@ -356,7 +621,7 @@ def test_filter_from_diff():
         assert path in paths_to_sync
     for path in new_diff.only_on_stage:
         assert path in paths_to_sync
-    assert new_diff.identical == diff.identical
+    assert new_diff.identical == 0
 
 
 def test_print_diff_to_console_no_bundlemap(
@@ -369,13 +634,8 @@ def test_print_diff_to_console_no_bundlemap(
     captured = capsys.readouterr()
     assert captured.out == os_agnostic_snapshot
 
-    # Only identical paths
-    diff.identical = as_stage_paths(
-        [
-            "identical",
-            "dir/identical",
-        ]
-    )
+    # Only identical files
+    diff.identical = 2
     print_diff_to_console(diff)
     captured = capsys.readouterr()
     assert captured.out == os_agnostic_snapshot
@@ -445,13 +705,8 @@ def test_print_diff_to_console_with_bundlemap(capsys, os_agnostic_snapshot):
     captured = capsys.readouterr()
     assert captured.out == os_agnostic_snapshot
 
-    # Only identical paths
-    diff.identical = as_stage_paths(
-        [
-            "identical",
-            "dir/identical",
-        ]
-    )
+    # Only identical files
+    diff.identical = 2
     print_diff_to_console(diff, bundle_map)
     bundle_map.to_project_path.assert_not_called()
     captured = capsys.readouterr()
@@ -520,3 +775,184 @@ def test_print_diff_to_console_with_bundlemap(capsys, os_agnostic_snapshot):
     print_diff_to_console(diff, bundle_map)
     captured = capsys.readouterr()
     assert captured.out == os_agnostic_snapshot
+
+
+def test_local_change_watcher_reports_changed_and_deleted_files():
+    with temp_local_dir(
+        {"README.md": "readme", "ui/a.py": "# a", "ui/b.py": "# b"}
+    ) as local_path:
+        watcher = LocalChangeWatcher(
+            local_path, poll_interval=0.01, use_notifications=False
+        )
+        assert not watcher.uses_notifications
+
+        (local_path / "ui" / "a.py").write_text("# a, modified")
+        (local_path / "ui" / "c.py").write_text("# c")
+        (local_path / "README.md").unlink()
+        assert watcher.wait_for_changes() == (["ui/a.py", "ui/c.py"], ["README.md"])
+
+        # only files changed since the previous batch are reported
+        (local_path / "ui" / "b.py").write_text("# b, modified")
+        assert watcher.wait_for_changes() == (["ui/b.py"], [])
+        watcher.close()
+
+
+def test_local_change_watcher_rescans_only_notified_paths():
+    with temp_local_dir({"a/x.py": "# x", "b/y.py": "# y"}) as local_path:
+        watcher = LocalChangeWatcher(local_path, use_notifications=False)
+        (local_path / "a" / "x.py").write_text("# x, modified")
+        (local_path / "b" / "y.py").unlink()
+
+        assert watcher._rescan({"a": False}) == (["a/x.py"], [])  # noqa: SLF001
+        assert watcher._rescan({"b": False}) == ([], ["b/y.py"])  # noqa: SLF001
+
+
+def test_local_change_watcher_rescans_directory_trees():
+    with temp_local_dir(
+        {"a/x.py": "# x", "a/b/y.py": "# y", "a/b/c/z.py": "# z", "d/w.py": "# w"}
+    ) as local_path:
+        watcher = LocalChangeWatcher(local_path, use_notifications=False)
+        shutil.rmtree(local_path / "a" / "b")
+        (local_path / "a" / "e").mkdir()
+        (local_path / "a" / "e" / "v.py").write_text("# v")
+        (local_path / "d" / "w.py").write_text("# w, not rescanned")
+
+        # a directory rescanned without its subdirectories misses their changes
+        assert watcher._rescan({"a": False}) == ([], [])  # noqa: SLF001
+        assert watcher._rescan({"a": True}) == (  # noqa: SLF001
+            ["a/e/v.py"],
+            ["a/b/c/z.py", "a/b/y.py"],
+        )
+
+
+def test_local_change_watcher_rescans_only_directory_of_notified_file():
+    with temp_local_dir({"a/x.py": "# x", "b/y.py": "# y"}) as local_path:
+        watcher = LocalChangeWatcher(local_path, debounce=0.05)
+        assert watcher.uses_notifications
+        try:
+            with mock.patch.object(
+                watcher, "_rescan", wraps=watcher._rescan  # noqa: SLF001
+            ) as rescan:
+                (local_path / "a" / "x.py").write_text("# x, modified")
+                assert watcher.wait_for_changes() == (["a/x.py"], [])
+            # the modification of directory `a` is not rescanned as a tree
+            assert rescan.call_args.args == ({"a": False},)
+        finally:
+            watcher.close()
+
+
+@pytest.mark.parametrize("prune", [True, False])
+@mock.patch(f"{STAGE_WATCH}.sync_local_diff_with_stage")
+def test_sync_changes_with_stage(mock_sync, prune):
+    local_path = Path("app")
+    diff = sync_changes_with_stage(
+        local_root=local_path,
+        stage_path=DefaultStagePathParts("db.schema.stage/app"),
+        changed=["ui/a.py"],
+        deleted=["README.md"],
+        prune=prune,
+    )
+
+    assert diff.different == as_stage_paths(["ui/a.py"])
+    assert diff.only_on_stage == (as_stage_paths(["README.md"]) if prune else [])
+    mock_sync.assert_called_once_with(
+        role=None,
+        deploy_root_path=local_path,
+        diff_result=diff,
+        stage_full_path="db.schema.stage/app",
+        force_overwrite=True,
+    )
+
+
+@mock.patch(f"{STAGE_WATCH}.sync_local_diff_with_stage")
+def test_sync_changes_with_stage_skips_pruning_only_batch(mock_sync):
+    diff = sync_changes_with_stage(
+        local_root=Path("app"),
+        stage_path=DefaultStagePathParts("db.schema.stage/app"),
+        changed=[],
+        deleted=["README.md"],
+        prune=False,
+    )
+
+    assert not diff.has_changes()
+    mock_sync.assert_not_called()
+
+
+def _listed_on(stage: str, files: Dict[str, Union[str, bytes]]):
+    return [
+        {**row, "name": row["name"].replace("stage/", f"{stage}/", 1)}
+        for row in stage_contents(files)
+    ]
+
+
+@mock.patch(f"{STAGE_MANAGER}.list_files")
+def test_stage_to_stage_diff(mock_list, mock_cursor):
+    source_files = {
+        "README.md": "This is a README\n",
+        "ui/streamlit.py": "# this is a streamlit\n",
+        "new.py": "# new",
+        "no_md5.py": "# no md5",
+    }
+    source_rows = _listed_on("src", source_files)
+    source_rows[-1]["md5"] = None
+    destination_rows = _listed_on(
+        "dst",
+        {
+            "README.md": "This is a README\n",
+            "ui/streamlit.py": "# this is an old streamlit\n",
+            "no_md5.py": "# no md5",
+            "old.py": "# old",
+        },
+    )
+    destination_rows[2]["md5"] = None
+    mock_list.side_effect = lambda path: mock_cursor(
+        rows=destination_rows if path.startswith("a.b.dst") else source_rows,
+        columns=STAGE_LS_COLUMNS,
+    )
+
+    diff_result = compute_stage_to_stage_diff(
+        DefaultStagePathParts("a.b.src"), DefaultStagePathParts("a.b.dst")
+    )
+
+    assert diff_result.identical == 1
+    assert diff_result.different == as_stage_paths(["no_md5.py", "ui/streamlit.py"])
+    assert diff_result.only_local == as_stage_paths(["new.py"])
+    assert diff_result.only_on_stage == as_stage_paths(["old.py"])
+
+
+@mock.patch(f"{STAGE_DIFF_MODULE}.COPY_FILES_BATCH_SIZE", 2)
+@mock.patch(f"{STAGE_MANAGER}.remove_many")
+@mock.patch(f"{STAGE_MANAGER}.copy_files")
+def test_mirror_stage_diff(mock_copy, mock_remove):
+    diff = DiffResult(
+        identical=1,
+        different=as_stage_paths(["ui/a.py"]),
+        only_local=as_stage_paths(["b.py", "c.py"]),
+        only_on_stage=as_stage_paths(["old.py"]),
+    )
+
+    mirror_stage_diff(diff, "@src/app", "@dst/app")
+
+    assert mock_copy.mock_calls == [
+        mock.call(
+            source_path="@src/app/",
+            destination_path="@dst/app",
+            files=["b.py", "c.py"],
+        ),
+        mock.call(
+            source_path="@src/app/", destination_path="@dst/app", files=["ui/a.py"]
+        ),
+    ]
+    mock_remove.assert_called_once_with(
+        stage_name="@dst/app", paths=["old.py"], role=None
+    )
+
+
+@mock.patch(f"{STAGE_MANAGER}.copy_files")
+def test_mirror_stage_diff_error(mock_copy):
+    mock_copy.side_effect = Exception("Mock Exception")
+
+    with pytest.raises(SnowflakeSQLExecutionError):
+        mirror_stage_diff(
+            DiffResult(only_local=as_stage_paths(["a.py"])), "@src", "@dst"
+        )
@@ -15,17 +15,21 @@
 from __future__ import annotations
 
 import math
+import os
 from pathlib import Path
 from typing import List, Tuple
 from unittest import mock
 
 import pytest
+from snowflake.cli._plugins.stage import md5
 from snowflake.cli._plugins.stage.md5 import (
     ONE_MEGABYTE,
+    LocalMD5Cache,
     UnknownMD5FormatError,
     compute_md5sum,
     file_matches_md5sum,
 )
+from snowflake.cli.api.secure_path import SecurePath
 from snowflake.connector.constants import S3_CHUNK_SIZE, S3_MAX_PARTS, S3_MIN_PART_SIZE
 
 from tests.testing_utils.files_and_dirs import temp_local_dir
@@ -125,14 +129,21 @@ def test_multipart_md5sum():
         # multi-part, but incorrect md5sum
         (
             f"00001111222233334444555566667777-{S3_MAX_PARTS}",
-            S3_MAX_PARTS * 50,
+            S3_MAX_PARTS * ONE_MEGABYTE * 2,
             [
-                (max(50, S3_MIN_PART_SIZE), f"badmd5-{S3_MAX_PARTS}"),
-                (S3_CHUNK_SIZE, f"badmd5-50"),
-                (ONE_MEGABYTE, f"badmd5-400"),
+                (S3_MIN_PART_SIZE, f"badmd5-{S3_MAX_PARTS}"),
+                (S3_CHUNK_SIZE, f"badmd5-2500"),
+                (2 * ONE_MEGABYTE, f"badmd5-{S3_MAX_PARTS}"),
             ],
             False,
         ),
+        # multi-part, but the file is too small to have that many parts
+        (
+            f"00001111222233334444555566667777-{S3_MAX_PARTS}",
+            S3_MAX_PARTS * 50,
+            None,
+            False,
+        ),
     ],
 )
 @mock.patch("os.path.getsize")
@@ -182,3 +193,70 @@ def test_file_matches_md5sum(
                 for (chunk_size, _) in chunk_size_and_md5
             ]
         )
+
+
+def _age_file(path: Path, seconds: int = 60):
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns - seconds * 10**9))
+
+
+@mock.patch("snowflake.cli._plugins.stage.md5.compute_md5sum", wraps=md5.compute_md5sum)
+def test_md5_cache_reuses_checksums_of_unchanged_files(compute_mock, tmp_path):
+    cache_file = SecurePath(tmp_path / "md5.cache")
+    with temp_local_dir({"README.md": "12345678"}) as root:
+        _age_file(root / "README.md")
+
+        cache = LocalMD5Cache(cache_file)
+        assert cache.md5sum(root / "README.md") == "25d55ad283aa400af464c76d713c07ad"
+        assert cache.md5sum(root / "README.md", 4) == compute_md5sum(
+            root / "README.md", 4
+        )
+        cache.save()
+        compute_mock.reset_mock()
+
+        # a fresh instance reads both variants back from disk
+        reloaded = LocalMD5Cache(cache_file)
+        assert reloaded.md5sum(root / "README.md") == "25d55ad283aa400af464c76d713c07ad"
+        assert file_matches_md5sum(
+            root / "README.md", "25d55ad283aa400af464c76d713c07ad", reloaded
+        )
+        assert reloaded.md5sum(root / "README.md", 4).endswith("-2")
+        compute_mock.assert_not_called()
+
+
+def test_md5_cache_invalidated_when_file_changes(tmp_path):
+    cache_file = SecurePath(tmp_path / "md5.cache")
+    with temp_local_dir({"README.md": "12345678"}) as root:
+        _age_file(root / "README.md", seconds=120)
+        cache = LocalMD5Cache(cache_file)
+        cache.md5sum(root / "README.md")
+        cache.save()
+
+        (root / "README.md").write_text("87654321")
+        _age_file(root / "README.md")
+        assert LocalMD5Cache(cache_file).md5sum(root / "README.md") == compute_md5sum(
+            root / "README.md"
+        )
+
+
+@mock.patch("snowflake.cli._plugins.stage.md5.compute_md5sum", wraps=md5.compute_md5sum)
+def test_md5_cache_skips_recently_modified_files(compute_mock, tmp_path):
+    cache_file = SecurePath(tmp_path / "md5.cache")
+    with temp_local_dir({"README.md": "12345678"}) as root:
+        cache = LocalMD5Cache(cache_file)
+        cache.md5sum(root / "README.md")
+        cache.md5sum(root / "README.md")
+        cache.save()
+
+    assert compute_mock.call_count == 2
+    assert not cache_file.exists()
+
+
+def test_md5_cache_ignores_corrupted_file(tmp_path):
+    cache_file = SecurePath(tmp_path / "md5.cache")
+    cache_file.write_text("{not json")
+    with temp_local_dir({"README.md": "12345678"}) as root:
+        assert (
+            LocalMD5Cache(cache_file).md5sum(root / "README.md")
+            == "25d55ad283aa400af464c76d713c07ad"
+        )
@@ -12,7 +12,13 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 import glob
+import hashlib
+import json
 import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Optional
 from unittest import mock
@@ -20,14 +26,22 @@ from unittest.mock import MagicMock
 
 import pytest
 from snowflake.cli._plugins.git.manager import GitManager
+from snowflake.cli._plugins.stage.diff import DiffResult, StagePathType
 from snowflake.cli._plugins.stage.manager import (
+    _PYTHON_EXECUTION_HANDLER,
+    MAX_AUTO_UPLOAD_WORKERS,
     STAGE_UPLOAD_WORKERS_ENV_VAR,
     StageManager,
     TemporaryDirectory,
     _resolve_upload_workers,
 )
+from snowflake.cli._plugins.stage.upload_concurrency import AdaptiveUploadConcurrency
+from snowflake.cli._plugins.stage.upload_journal import UploadJournal
+from snowflake.cli.api.cli_global_context import get_cli_context
 from snowflake.cli.api.errno import DOES_NOT_EXIST_OR_NOT_AUTHORIZED
-from snowflake.cli.api.exceptions import CliError
+from snowflake.cli.api.exceptions import CliError, SnowflakeSQLExecutionError
+from snowflake.cli.api.metrics import CLICounterField
+from snowflake.cli.api.secure_path import SecurePath
 from snowflake.cli.api.stage_path import StagePath
 from snowflake.connector import ProgrammingError
 from snowflake.connector.cursor import DictCursor, SnowflakeCursor
@@ -383,6 +397,15 @@ def test_copy_stage_to_stage(mock_execute, runner, mock_cursor):
     )
 
 
+@mock.patch(f"{STAGE_MANAGER}.execute_query")
+def test_copy_files_selected_files(mock_execute, mock_cursor):
+    mock_execute.return_value = mock_cursor(["row"], [])
+    StageManager().copy_files("@stage/old/", "@stage/new", files=["a.py", "it's.py"])
+    mock_execute.assert_called_once_with(
+        "copy files into @stage/new/ from @stage/old/ files = ('a.py', 'it''s.py')"
+    )
+
+
 @pytest.mark.parametrize(
     "stage_path, files_on_stage, expected_stage_path, expected_calls",
     [
@@ -518,13 +541,13 @@ def test_copy_get_recursive(
         [{"name": f"exe/{file}"} for file in files_on_stage], []
     )
 
-    StageManager().get_recursive(stage_path, Path(temporary_directory))
+    list(StageManager().get_recursive(stage_path, Path(temporary_directory)))
 
     ls_call, *copy_calls = mock_execute.mock_calls
     assert ls_call == mock.call(f"ls {expected_stage_path}", cursor_class=DictCursor)
-    assert copy_calls == [
-        mock.call(c.format(temporary_directory)) for c in expected_calls
-    ]
+    assert sorted(copy_calls, key=str) == sorted(
+        (mock.call(c.format(temporary_directory)) for c in expected_calls), key=str
+    )
 
 
 @pytest.mark.parametrize(
@@ -581,13 +604,13 @@ def test_copy_get_recursive_from_user_stage(
         [{"name": file} for file in files_on_stage], []
     )
 
-    StageManager().get_recursive(stage_path, Path(temporary_directory))
+    list(StageManager().get_recursive(stage_path, Path(temporary_directory)))
 
     ls_call, *copy_calls = mock_execute.mock_calls
     assert ls_call == mock.call(f"ls '{expected_stage_path}'", cursor_class=DictCursor)
-    assert copy_calls == [
-        mock.call(c.format(temporary_directory)) for c in expected_calls
-    ]
+    assert sorted(copy_calls, key=str) == sorted(
+        (mock.call(c.format(temporary_directory)) for c in expected_calls), key=str
+    )
 
 
 @pytest.mark.parametrize(
@@ -601,8 +624,7 @@ def test_copy_get_recursive_from_user_stage(
             ],
             "@repo/tags/v3.6.0/Casks",
             [
-                "get @repo/tags/v3.6.0/Casks/snowcli.rb file://{}/ parallel=4",
-                "get @repo/tags/v3.6.0/Casks/snowcli.tmpl.rb file://{}/ parallel=4",
+                r"get @repo/tags/v3.6.0/Casks file://{}/ parallel=4 pattern='repo/tags/v3\\.6\\.0/Casks/[^/]*'",
             ],
         ),
         (
@@ -638,13 +660,13 @@ def test_copy_get_recursive_from_git_repo(
         [{"name": file} for file in files_on_stage], []
     )
 
-    GitManager().get_recursive(stage_path, Path(temporary_directory))
+    list(GitManager().get_recursive(stage_path, Path(temporary_directory)))
 
     ls_call, *copy_calls = mock_execute.mock_calls
     assert ls_call == mock.call(f"ls {expected_stage_path}", cursor_class=DictCursor)
-    assert copy_calls == [
-        mock.call(c.format(temporary_directory)) for c in expected_calls
-    ]
+    assert sorted(copy_calls, key=str) == sorted(
+        (mock.call(c.format(temporary_directory)) for c in expected_calls), key=str
+    )
 
 
 @pytest.mark.parametrize(
@@ -702,13 +724,13 @@ def test_copy_get_recursive_from_vstage(
         [{"name": file} for file in files_on_stage], []
     )
 
-    StageManager().get_recursive(stage_path, Path(temporary_directory))
+    list(StageManager().get_recursive(stage_path, Path(temporary_directory)))
 
     ls_call, *copy_calls = mock_execute.mock_calls
     assert ls_call == mock.call(f"ls {expected_stage_path}", cursor_class=DictCursor)
-    assert copy_calls == [
-        mock.call(c.format(temporary_directory)) for c in expected_calls
-    ]
+    assert sorted(copy_calls, key=str) == sorted(
+        (mock.call(c.format(temporary_directory)) for c in expected_calls), key=str
+    )
 
 
 @pytest.mark.parametrize(
@@ -743,15 +765,192 @@ def test_copy_get_recursive_from_vstage_case_mismatch(
         [{"name": file} for file in files_on_stage], []
     )
 
-    StageManager().get_recursive(stage_path, Path(temporary_directory))
+    list(StageManager().get_recursive(stage_path, Path(temporary_directory)))
 
     ls_call, *copy_calls = mock_execute.mock_calls
     assert ls_call == mock.call(f"ls {expected_stage_path}", cursor_class=DictCursor)
-    assert copy_calls == [
-        mock.call(c.format(temporary_directory)) for c in expected_calls
+    assert sorted(copy_calls, key=str) == sorted(
+        (mock.call(c.format(temporary_directory)) for c in expected_calls), key=str
+    )
+
+
+@pytest.mark.parametrize(
+    "stage_path, files_on_stage, expected_calls",
+    [
+        (
+            "@exe",
+            ["exe/s1.sql", "exe/s2.sql", "exe/a/s3.sql", "exe/a/b/s4.sql"],
+            [
+                "get @exe file://{}/ parallel=4 pattern='exe/[^/]*'",
+                "get @exe/a/s3.sql file://{}/a/ parallel=4",
+                "get @exe/a/b/s4.sql file://{}/a/b/ parallel=4",
+            ],
+        ),
+        (
+            "@exe/a",
+            ["exe/a/s1.sql", "exe/a/b/s2.sql", "exe/a/b/s3.sql"],
+            [
+                "get @exe/a/s1.sql file://{}/ parallel=4",
+                "get @exe/a/b file://{}/b/ parallel=4 pattern='exe/a/b/[^/]*'",
+            ],
+        ),
+        (
+            "@~/a",
+            ["a/s1.sql", "a/s2.sql"],
+            [
+                "get '@~/a' file://{}/ parallel=4 pattern='a/[^/]*'",
+            ],
+        ),
+        (
+            "@exe",
+            ["exe/d.1/s1.sql", "exe/d.1/s2.sql"],
+            [
+                r"get @exe/d.1 file://{}/d.1/ parallel=4 pattern='exe/d\\.1/[^/]*'",
+            ],
+        ),
+    ],
+)
+@mock.patch(f"{STAGE_MANAGER}.execute_query")
+def test_copy_get_recursive_batches_directories(
+    mock_execute,
+    mock_cursor,
+    temporary_directory,
+    stage_path,
+    files_on_stage,
+    expected_calls,
+):
+    mock_execute.return_value = mock_cursor(
+        [{"name": file} for file in files_on_stage], []
+    )
+
+    list(StageManager().get_recursive(stage_path, Path(temporary_directory)))
+
+    _, *get_calls = mock_execute.mock_calls
+    assert sorted(get_calls, key=str) == sorted(
+        (mock.call(c.format(temporary_directory)) for c in expected_calls), key=str
+    )
+
+
+@mock.patch.object(StagePath, "get_local_target_path")
+@mock.patch(f"{STAGE_MANAGER}.execute_query")
+def test_copy_get_recursive_from_partial_name_gets_only_listed_files(
+    mock_execute, mock_target_path, mock_cursor, temporary_directory
+):
+    mock_target_path.return_value = Path(temporary_directory)
+    mock_execute.return_value = mock_cursor(
+        [{"name": "exe/a/file1.sql"}, {"name": "exe/a/file2.sql"}], []
+    )
+
+    list(StageManager().get_recursive("@exe/a/fi", Path(temporary_directory)))
+
+    # the pattern must not select other files of the directory, e.g. exe/a/other.sql
+    assert mock_execute.mock_calls[1:] == [
+        mock.call(
+            f"get @exe/a file://{temporary_directory}/ parallel=4 "
+            r"pattern='exe/a/(file1\\.sql|file2\\.sql)'"
+        )
     ]
 
 
+@mock.patch(f"{STAGE_MANAGER}.execute_query")
+def test_copy_get_recursive_skips_identical_files(
+    mock_execute, mock_cursor, temporary_directory
+):
+    local = Path(temporary_directory)
+    (local / "d").mkdir()
+    contents = {"a.sql": b"select 1;", "d/b.sql": b"select 2;", "d/c.sql": b"new"}
+    (local / "a.sql").write_bytes(contents["a.sql"])
+    (local / "d" / "b.sql").write_bytes(contents["d/b.sql"])
+    (local / "d" / "c.sql").write_bytes(b"old")
+    mock_execute.return_value = mock_cursor(
+        [
+            {
+                "name": f"exe/{name}",
+                "size": len(data),
+                "md5": hashlib.md5(data).hexdigest(),
+            }
+            for name, data in contents.items()
+        ]
+        + [{"name": "exe/d/e.sql", "size": 3, "md5": None}],
+        [],
+    )
+
+    results = list(StageManager().get_recursive("@exe", local, skip_identical=True))
+
+    _, *get_calls = mock_execute.mock_calls
+    # only the changed and the missing file of d/ are downloaded
+    assert get_calls == [
+        mock.call(
+            f"get @exe/d file://{local}/d/ parallel=4 pattern='exe/d/(c\\\\.sql|e\\\\.sql)'"
+        )
+    ]
+    assert [r for r in results if isinstance(r, dict)] == [
+        {
+            "file": "a.sql",
+            "size": 9,
+            "status": "SKIPPED",
+            "message": "Identical to the local file",
+        },
+        {
+            "file": "d/b.sql",
+            "size": 9,
+            "status": "SKIPPED",
+            "message": "Identical to the local file",
+        },
+    ]
+
+
+@mock.patch(f"{STAGE_MANAGER}.execute_query")
+def test_stage_copy_recursive_reports_skipped_downloads(
+    mock_execute, mock_cursor, runner, temporary_directory
+):
+    (Path(temporary_directory) / "a.sql").write_bytes(b"select 1;")
+    mock_execute.return_value = mock_cursor(
+        [
+            {
+                "name": "exe/a.sql",
+                "size": 9,
+                "md5": hashlib.md5(b"select 1;").hexdigest(),
+            }
+        ],
+        [],
+    )
+
+    result = runner.invoke(
+        ["stage", "copy", "@exe", temporary_directory, "--recursive"]
+    )
+
+    assert result.exit_code == 0, result.output
+    assert "Skipped 1 files identical to local copies (9 bytes not downloaded)." in (
+        result.output
+    )
+    assert "SKIPPED" in result.output
+    # the stage is listed, but nothing is downloaded
+    assert mock_execute.call_count == 1
+
+
+@mock.patch(f"{STAGE_MANAGER}.execute_query")
+def test_copy_get_recursive_respects_transfer_budget(
+    mock_execute, mock_cursor, temporary_directory, monkeypatch
+):
+    monkeypatch.setenv(STAGE_UPLOAD_WORKERS_ENV_VAR, "8")
+    mock_execute.return_value = mock_cursor(
+        [{"name": f"exe/d{i}/s.sql"} for i in range(3)], []
+    )
+
+    with mock.patch(
+        "snowflake.cli._plugins.stage.manager.ThreadPoolExecutor",
+        wraps=ThreadPoolExecutor,
+    ) as pool:
+        list(
+            StageManager().get_recursive("@exe", Path(temporary_directory), parallel=20)
+        )
+
+    pool.assert_called_once_with(max_workers=1)
+    _, *get_calls = mock_execute.mock_calls
+    assert all("parallel=8" in c.args[0] for c in get_calls)
+
+
 @mock.patch(f"{STAGE_MANAGER}.execute_query")
 def test_stage_create(mock_execute, runner, mock_cursor):
     mock_execute.return_value = mock_cursor(["row"], [])
@@ -904,9 +1103,14 @@ def test_stage_print_result_for_get_all_files_from_stage_recursive(
             ],
             [],
         ),
-        mock_cursor([("file1.txt", 10, "DOWNLOADED", "")], columns),
-        mock_cursor([("file2.txt", 10, "DOWNLOADED", "")], columns),
-        mock_cursor([("file3.txt", 10, "DOWNLOADED", "")], columns),
+        mock_cursor(
+            [
+                ("file1.txt", 10, "DOWNLOADED", ""),
+                ("file2.txt", 10, "DOWNLOADED", ""),
+                ("file3.txt", 10, "DOWNLOADED", ""),
+            ],
+            columns,
+        ),
     ]
 
     with TemporaryDirectory() as tmp_dir:
@@ -956,6 +1160,51 @@ def test_stage_internal_remove_no_role_change(mock_execute, mock_cursor):
     assert mock_execute.mock_calls == expected
 
 
+@mock.patch(f"{STAGE_MANAGER}.execute_query")
+def test_stage_internal_remove_many_switches_role_once(mock_execute, mock_cursor):
+    mock_execute.return_value = mock_cursor([("old_role",)], [])
+    sm = StageManager()
+    paths = [f"my/file/foo{i}.csv" for i in range(20)]
+    cursors = sm.remove_many("stageName", paths, "new_role")
+
+    assert len(cursors) == len(paths)
+    calls = mock_execute.mock_calls
+    assert calls[:2] == [
+        mock.call("select current_role()"),
+        mock.call("use role new_role"),
+    ]
+    assert calls[-1] == mock.call("use role old_role")
+    assert sorted(calls[2:-1]) == sorted(
+        mock.call(f"remove @stageName/{path}") for path in paths
+    )
+
+
+@mock.patch(f"{STAGE_MANAGER}.remove")
+def test_stage_internal_remove_many_reports_failed_files(mock_remove):
+    def remove(stage_name, path, role=None):
+        if path.endswith("1.csv") or path.endswith("3.csv"):
+            raise ProgrammingError(f"cannot remove {path}")
+        return mock.MagicMock()
+
+    mock_remove.side_effect = remove
+    paths = [f"foo{i}.csv" for i in range(5)]
+
+    with pytest.raises(SnowflakeSQLExecutionError) as err:
+        StageManager().remove_many("stageName", paths)
+
+    # the other files are still removed
+    assert sorted(call.kwargs["path"] for call in mock_remove.mock_calls) == paths
+    assert "Could not remove 2 of 5 files from stageName" in err.value.message
+    assert "foo1.csv: cannot remove foo1.csv" in err.value.message
+    assert "foo3.csv: cannot remove foo3.csv" in err.value.message
+
+
+@mock.patch(f"{STAGE_MANAGER}.execute_query")
+def test_stage_internal_remove_many_empty(mock_execute):
+    assert StageManager().remove_many("stageName", [], "new_role") == []
+    mock_execute.assert_not_called()
+
+
 @mock.patch(f"{STAGE_MANAGER}.execute_query")
 def test_stage_internal_put(mock_execute, mock_cursor):
     mock_execute.return_value = mock_cursor([("old_role",)], [])
@@ -1150,11 +1399,11 @@ def test_execute_from_user_stage(
 
 
 @mock.patch(f"{STAGE_MANAGER}.execute_query")
-@mock.patch(f"{STAGE_MANAGER}._bootstrap_snowpark_execution_environment")
-@mock.patch(f"{STAGE_MANAGER}.snowpark_session")
-def test_execute_with_variables(
-    mock_snowpark_session, mock_bootstrap, mock_execute, mock_cursor, runner
-):
+@mock.patch(
+    f"{STAGE_MANAGER}._bootstrap_snowpark_execution_environment",
+    return_value="EXECUTE_PYTHON",
+)
+def test_execute_with_variables(mock_bootstrap, mock_execute, mock_cursor, runner):
     mock_execute.return_value = mock_cursor(
         [{"name": "exe/s1.sql"}, {"name": "exe/s2.py"}], []
     )
@@ -1183,18 +1432,12 @@ def test_execute_with_variables(
         mock.call(
             f"execute immediate from @exe/s1.sql using (key1=>'string value', key2=>1, KEY3=>TRUE, key4=>NULL, key5=>'var=value')"
         ),
+        mock.call(
+            "call EXECUTE_PYTHON('@exe/s2.py', parse_json('"
+            '{"key1": "string value", "key2": "1", "KEY3": "TRUE", "key4": "NULL", "key5": "var=value"}'
+            "'))"
+        ),
     ]
-    mock_bootstrap.return_value.assert_called_once_with(
-        "@exe/s2.py",
-        {
-            "key1": "string value",
-            "key2": "1",
-            "KEY3": "TRUE",
-            "key4": "NULL",
-            "key5": "var=value",
-        },
-        session=mock_snowpark_session,
-    )
 
 
 @mock.patch(f"{STAGE_MANAGER}.execute_query")
@@ -1286,11 +1529,11 @@ def test_execute_no_files_for_stage_path(
 
 
 @mock.patch(f"{STAGE_MANAGER}.execute_query")
-@mock.patch(f"{STAGE_MANAGER}._bootstrap_snowpark_execution_environment")
-@mock.patch(f"{STAGE_MANAGER}.snowpark_session")
-def test_execute_stop_on_error(
-    mock_snowpark_session, mock_bootstrap, mock_execute, mock_cursor, runner
-):
+@mock.patch(
+    f"{STAGE_MANAGER}._bootstrap_snowpark_execution_environment",
+    return_value="EXECUTE_PYTHON",
+)
+def test_execute_stop_on_error(mock_bootstrap, mock_execute, mock_cursor, runner):
     error_message = "Error"
     mock_execute.side_effect = [
         mock_cursor(
@@ -1304,6 +1547,8 @@ def test_execute_stop_on_error(
             [],
         ),
         mock_cursor([{"1": 1}], []),
+        mock_cursor([{"1": 1}], []),
+        mock_cursor([{"1": 1}], []),
         ProgrammingError(error_message),
     ]
 
@@ -1312,29 +1557,26 @@ def test_execute_stop_on_error(
 
     assert mock_execute.mock_calls == [
         mock.call("ls @exe", cursor_class=DictCursor),
+        mock.call("call EXECUTE_PYTHON('@exe/p1.py', parse_json('{}'))"),
+        mock.call("call EXECUTE_PYTHON('@exe/p2.py', parse_json('{}'))"),
         mock.call(f"execute immediate from @exe/s1.sql"),
         mock.call(f"execute immediate from @exe/s2.sql"),
     ]
-    assert mock_bootstrap.return_value.mock_calls == [
-        mock.call("@exe/p1.py", {}, session=mock_snowpark_session),
-        mock.call("@exe/p2.py", {}, session=mock_snowpark_session),
-    ]
     assert error_message in result.output
 
 
 @mock.patch(f"{STAGE_MANAGER}.execute_query")
-@mock.patch(f"{STAGE_MANAGER}._bootstrap_snowpark_execution_environment")
-@mock.patch(f"{STAGE_MANAGER}.snowpark_session")
+@mock.patch(
+    f"{STAGE_MANAGER}._bootstrap_snowpark_execution_environment",
+    return_value="EXECUTE_PYTHON",
+)
 def test_execute_continue_on_error(
-    mock_snowpark_session,
     mock_bootstrap,
     mock_execute,
     mock_cursor,
     runner,
     os_agnostic_snapshot,
 ):
-    from snowflake.snowpark.exceptions import SnowparkSQLException
-
     mock_execute.side_effect = [
         mock_cursor(
             [
@@ -1346,28 +1588,196 @@ def test_execute_continue_on_error(
             ],
             [],
         ),
+        mock_cursor([{"ok": "ok"}], []),
+        ProgrammingError("Test error"),
         mock_cursor([{"1": 1}], []),
         ProgrammingError("Error"),
         mock_cursor([{"3": 3}], []),
     ]
 
-    mock_bootstrap.return_value.side_effect = ["ok", SnowparkSQLException("Test error")]
-
     result = runner.invoke(["stage", "execute", "exe", "--on-error", "continue"])
 
     assert result.exit_code == 0
     assert result.output == os_agnostic_snapshot
     assert mock_execute.mock_calls == [
         mock.call("ls @exe", cursor_class=DictCursor),
+        mock.call("call EXECUTE_PYTHON('@exe/p1.py', parse_json('{}'))"),
+        mock.call("call EXECUTE_PYTHON('@exe/p2.py', parse_json('{}'))"),
         mock.call(f"execute immediate from @exe/s1.sql"),
         mock.call(f"execute immediate from @exe/s2.sql"),
         mock.call(f"execute immediate from @exe/s3.sql"),
     ]
 
-    assert mock_bootstrap.return_value.mock_calls == [
-        mock.call("@exe/p1.py", {}, session=mock_snowpark_session),
-        mock.call("@exe/p2.py", {}, session=mock_snowpark_session),
+
+def _python_procedure_queries(mock_cursor, definition=None):
+    """Answers DESCRIBE PROCEDURE with the definition of the last created procedure,
+    or with ``definition``."""
+    created = {}
+
+    def execute_query(query, **kwargs):
+        if query.startswith("ls "):
+            return mock_cursor([{"name": "exe/p1.py"}], [])
+        if query.startswith("create procedure"):
+            created["runtime"] = re.search(r"runtime_version = '(.*)'", query)[1]
+            created["packages"] = re.search(r"packages = \((.*)\)", query)[1]
+        if query.startswith("describe procedure"):
+            properties = definition or {
+                "body": _PYTHON_EXECUTION_HANDLER,
+                "handler": "run",
+                "runtime_version": created["runtime"],
+                "packages": f"[{created['packages']}]",
+                "execute as": "CALLER",
+            }
+            return mock_cursor(
+                [{"property": k, "value": v} for k, v in properties.items()], []
+            )
+        return mock_cursor([], [])
+
+    return execute_query
+
+
+@mock.patch(f"{STAGE_MANAGER}._check_for_requirements_file")
+@mock.patch(f"{STAGE_MANAGER}.execute_query")
+def test_execute_python_uses_procedure_named_by_requirements(
+    mock_execute, mock_requirements, mock_cursor, runner
+):
+    mock_execute.side_effect = _python_procedure_queries(mock_cursor)
+
+    def execute(requirements) -> list[str]:
+        mock_requirements.return_value = requirements
+        mock_execute.reset_mock()
+        result = runner.invoke(["stage", "execute", "@exe"])
+        assert result.exit_code == 0, result.output
+        return [call.args[0] for call in mock_execute.mock_calls]
+
+    first = execute(["pandas", "numpy"])
+    create_query = first[1]
+    name = create_query.split()[5].split("(")[0]
+    assert name.startswith("SNOWFLAKE_CLI_EXECUTE_PYTHON_")
+    assert create_query.startswith(
+        f"create procedure if not exists {name}(file_path string, variables variant)"
+    )
+    assert (
+        "packages = ('numpy', 'pandas', 'snowflake-snowpark-python', 'snowflake.core')"
+        in create_query
+    )
+    assert "execute as caller" in create_query
+    assert first[2:] == [
+        f"describe procedure {name}(string, variant)",
+        f"call {name}('@exe/p1.py', parse_json('{{}}'))",
+    ]
+
+    # the same requirements use the same procedure, which is created only once
+    assert execute(["numpy", "pandas"]) == first
+
+    # other requirements use a procedure of their own
+    other = execute(["pandas"])
+    assert name not in other[1]
+
+
+@mock.patch(f"{STAGE_MANAGER}._check_for_requirements_file", return_value=[])
+@mock.patch(f"{STAGE_MANAGER}.execute_query")
+def test_execute_python_refuses_procedure_with_other_definition(
+    mock_execute, _, mock_cursor, runner
+):
+    mock_execute.side_effect = _python_procedure_queries(
+        mock_cursor,
+        definition={"body": "import evil", "handler": "run", "execute as": "OWNER"},
+    )
+
+    result = runner.invoke(["stage", "execute", "@exe"])
+
+    assert result.exit_code == 1
+    assert "has an unexpected definition" in result.output
+    assert not any(call.args[0].startswith("call ") for call in mock_execute.mock_calls)
+
+
+def test_python_execution_handler_runs_files_as_main(capsys):
+    script = 'import os\nif __name__ == "__main__":\n    print(os.environ["A"])\n'
+    files = mock.MagicMock()
+    files.SnowflakeFile.open.return_value.__enter__.return_value.read.return_value = (
+        script
+    )
+    handler: dict = {}
+    with mock.patch.dict("sys.modules", {"snowflake.snowpark.files": files}):
+        exec(_PYTHON_EXECUTION_HANDLER, handler)
+    with mock.patch.dict(os.environ):
+        handler["run"](None, "@exe/p1.py", {"A": "main"})
+
+    assert capsys.readouterr().out == "main\n"
+
+
+def _execute_query_by_file(mock_cursor, failing_file: str):
+    failed = threading.Event()
+
+    def _execute_query(query, **kwargs):
+        if query.startswith("ls "):
+            return mock_cursor(
+                [{"name": f"exe/s{i}.sql"} for i in range(1, 6)],
+                [],
+            )
+        if query.endswith(failing_file):
+            failed.set()
+            raise ProgrammingError("Error")
+        # Finish other files only after the failure was seen.
+        failed.wait(timeout=5)
+        time.sleep(0.1)
+        return mock_cursor([{"1": 1}], [])
+
+    return _execute_query
+
+
+@mock.patch(f"{STAGE_MANAGER}.execute_query")
+def test_execute_parallel_keeps_file_order(mock_execute, mock_cursor, runner):
+    mock_execute.side_effect = _execute_query_by_file(mock_cursor, "s2.sql")
+
+    result = runner.invoke(
+        [
+            "stage",
+            "execute",
+            "exe",
+            "--parallel",
+            "3",
+            "--on-error",
+            "continue",
+            "--format",
+            "json",
+        ]
+    )
+
+    assert result.exit_code == 0, result.output
+    assert json.loads(result.output) == [
+        {"File": f"@exe/s{i}.sql", "Status": "SUCCESS", "Error": None}
+        if i != 2
+        else {"File": "@exe/s2.sql", "Status": "FAILURE", "Error": "Error"}
+        for i in range(1, 6)
     ]
+    assert sorted(call.args[0] for call in mock_execute.call_args_list[1:]) == [
+        f"execute immediate from @exe/s{i}.sql" for i in range(1, 6)
+    ]
+
+
+@mock.patch(f"{STAGE_MANAGER}.execute_query")
+def test_execute_parallel_stops_on_error(mock_execute, mock_cursor, runner):
+    mock_execute.side_effect = _execute_query_by_file(mock_cursor, "s1.sql")
+
+    result = runner.invoke(["stage", "execute", "exe", "--parallel", "2"])
+
+    assert result.exit_code == 1
+    assert "Error" in result.output
+    # Only s2.sql may have started before s1.sql failed, other files are skipped.
+    executed = {call.args[0] for call in mock_execute.call_args_list[1:]}
+    assert "execute immediate from @exe/s1.sql" in executed
+    assert executed <= {
+        "execute immediate from @exe/s1.sql",
+        "execute immediate from @exe/s2.sql",
+    }
+
+
+def test_execute_parallel_must_be_positive(runner):
+    result = runner.invoke(["stage", "execute", "exe", "--parallel", "0"])
+
+    assert result.exit_code == 2, result.output
 
 
 @mock.patch("snowflake.connector.connect")
@@ -1479,39 +1889,24 @@ class RecursiveUploadTester:
                     )
                 return super().__call__(*args, **kwargs)
 
-        class MockTemporaryDirectory(TemporaryDirectory):
-            current_name: str
-
-            def __enter__(self):
-                MockTemporaryDirectory.current_name = self.name
-                return super().__enter__()
-
         with mock.patch(f"{STAGE_MANAGER}.put", new_callable=MockPut):
-            with mock.patch(
-                "snowflake.cli._plugins.stage.manager.TemporaryDirectory",
-                MockTemporaryDirectory,
-            ):
-                if self.temp_directory is not None:
-                    MockTemporaryDirectory.current_name = self.temp_directory.name
-                # Force a single upload worker so PUTs are recorded in a
-                # deterministic order (assertions below are order-insensitive
-                # regardless, but this keeps the mock bookkeeping simple).
-                with mock.patch.dict(os.environ, {STAGE_UPLOAD_WORKERS_ENV_VAR: "1"}):
-                    generator = StageManager().put_recursive(
-                        Path(local_path),
-                        "stageName",
-                        temp_directory=self.temp_directory,
-                    )
-                    list(generator)
-
-        return Path(MockTemporaryDirectory.current_name)
+            # Force a single upload worker so PUTs are recorded in a
+            # deterministic order (assertions below are order-insensitive
+            # regardless, but this keeps the mock bookkeeping simple).
+            with mock.patch.dict(os.environ, {STAGE_UPLOAD_WORKERS_ENV_VAR: "1"}):
+                generator = StageManager().put_recursive(
+                    Path(local_path),
+                    "stageName",
+                    temp_directory=self.temp_directory,
+                )
+                list(generator)
 
 
 def _uploaded_destinations(tester: RecursiveUploadTester) -> list:
     """Stage destinations of the PUTs the tester recorded, order-insensitive.
 
-    ``put_recursive`` uploads each directory through an isolated view, so a
-    recorded ``local_path`` is an opaque temp dir; the ``stage_path``
+    ``put_recursive`` uploads a directory either directly or through an
+    isolated view, so a recorded ``local_path`` may be an opaque temp dir; the ``stage_path``
     (destination) is the meaningful, deterministic output. One PUT is issued
     per directory that directly contains files.
     """
@@ -1757,6 +2152,173 @@ def test_recursive_upload_with_provided_temp_directory():
         tester.execute(local_path=source_directory)
 
 
+def test_recursive_upload_puts_leaf_directories_directly(temporary_directory):
+    tester = RecursiveUploadTester(temporary_directory)
+    tester.prepare(structure=NESTED_STRUCTURE)
+    (Path(temporary_directory) / "dir3" / "dir32" / ".hidden").write_text("x")
+    tester.execute(local_path=temporary_directory)
+
+    root = Path(temporary_directory).resolve()
+    local_paths = {
+        str(call["stage_path"]): Path(call["local_path"]) for call in tester.calls
+    }
+    # Directories holding only the files to upload are put with `<dir>/*`.
+    for leaf in ["dir1/dir12", "dir2/dir21/dir211/dir2111", "dir3/dir32"]:
+        assert local_paths[f"@stageName/{leaf}"] == root / leaf
+    # A `<dir>/*` glob would also select the subdirectories of these.
+    for parent in ["", "/dir1", "/dir2", "/dir3"]:
+        isolated = local_paths[f"@stageName{parent}"]
+        assert not isolated.is_relative_to(root)
+
+
+def test_recursive_upload_isolates_partially_selected_directory(
+    temporary_directory,
+):
+    tester = RecursiveUploadTester(temporary_directory)
+    tester.prepare(structure=NESTED_STRUCTURE)
+    tester.execute(local_path=f"{temporary_directory}/**/*.py")
+
+    root = Path(temporary_directory).resolve()
+    local_paths = {
+        str(call["stage_path"]): Path(call["local_path"]) for call in tester.calls
+    }
+    # dir12 also holds file122.md, which the pattern does not select.
+    assert not local_paths["@stageName/dir1/dir12"].is_relative_to(root)
+    assert (
+        local_paths["@stageName/dir2/dir21/dir211/dir2111"]
+        == root / "dir2/dir21/dir211/dir2111"
+    )
+
+
+def test_recursive_upload_skips_hidden_files(temporary_directory):
+    tester = RecursiveUploadTester(temporary_directory)
+    tester.prepare(
+        structure={".git": {"config": "x"}, ".env": "x", "dir": {"file": "x"}}
+    )
+    tester.execute(local_path=temporary_directory)
+
+    assert _uploaded_destinations(tester) == _expected_destinations("@stageName/dir")
+
+
+def test_put_recursive_resume_skips_uploaded_directories(temporary_directory):
+    src = Path(temporary_directory) / "src"
+    src.mkdir()
+    RecursiveUploadTester(str(src)).prepare(structure=NESTED_STRUCTURE)
+    journal_dir = SecurePath(temporary_directory) / "journal"
+    uploaded: list = []
+
+    def fake_put(*args, fail_on=None, **kwargs):
+        if str(kwargs["stage_path"]) == fail_on:
+            raise ProgrammingError("Connection lost")
+        uploaded.append(str(kwargs["stage_path"]))
+        return MagicMock(fetchall=MagicMock(return_value=[]))
+
+    def upload(resume: bool, fail_on: Optional[str] = None):
+        journal = UploadJournal(
+            src, "@stageName", resume=resume, journal_dir=journal_dir
+        )
+        put_mock = MagicMock(side_effect=lambda *a, **k: fake_put(fail_on=fail_on, **k))
+        with mock.patch.object(StageManager, "put", new=put_mock), mock.patch.dict(
+            os.environ, {STAGE_UPLOAD_WORKERS_ENV_VAR: "1"}
+        ):
+            return list(
+                StageManager().put_recursive(
+                    local_path=src, stage_path="@stageName", journal=journal
+                )
+            )
+
+    with pytest.raises(ProgrammingError):
+        upload(resume=False, fail_on="@stageName/dir2")
+    assert list(journal_dir.iterdir())
+
+    uploaded.clear()
+    result = upload(resume=True)
+
+    skipped = {
+        str(Path(row["target"]).parent) for row in result if row["status"] == "SKIPPED"
+    }
+    assert skipped
+    assert "@stageName/dir2" in uploaded
+    assert skipped.isdisjoint(uploaded)
+    assert sorted(skipped.union(uploaded)) == [
+        str(d)
+        for d in _expected_destinations(
+            "@stageName",
+            "@stageName/dir1",
+            "@stageName/dir1/dir12",
+            "@stageName/dir2",
+            "@stageName/dir2/dir21/dir211/dir2111",
+            "@stageName/dir3",
+            "@stageName/dir3/dir32",
+        )
+    ]
+    assert not list(journal_dir.iterdir())
+
+
+def test_put_recursive_without_resume_uploads_everything_again(temporary_directory):
+    src = Path(temporary_directory) / "src"
+    src.mkdir()
+    RecursiveUploadTester(str(src)).prepare(structure=NESTED_STRUCTURE)
+    journal_dir = SecurePath(temporary_directory) / "journal"
+    journal = UploadJournal(src, "@stageName", journal_dir=journal_dir)
+    journal.complete(
+        journal.unit_key(StagePath.from_stage_str("@stageName"), [src / "file4.foo"])
+    )
+
+    put_mock = MagicMock(return_value=MagicMock(fetchall=MagicMock(return_value=[])))
+    with mock.patch.object(StageManager, "put", new=put_mock):
+        list(
+            StageManager().put_recursive(
+                local_path=src,
+                stage_path="@stageName",
+                journal=UploadJournal(src, "@stageName", journal_dir=journal_dir),
+            )
+        )
+
+    assert put_mock.call_count == 7
+
+
+def test_upload_journal_detects_changed_directory(temporary_directory):
+    file = Path(temporary_directory) / "file.txt"
+    file.write_text("content")
+    destination = StagePath.from_stage_str("@stageName")
+    key = UploadJournal.unit_key(destination, [file])
+
+    os.utime(file, ns=(0, 0))
+
+    assert UploadJournal.unit_key(destination, [file]) != key
+
+
+@pytest.mark.parametrize("resume", [True, False])
+@mock.patch("snowflake.cli._plugins.stage.commands.UploadJournal")
+@mock.patch(f"{STAGE_MANAGER}.put_recursive", return_value=iter([]))
+def test_copy_keeps_journal_only_with_resume(
+    mock_put_recursive, mock_journal, runner, temporary_directory, resume
+):
+    result = runner.invoke(
+        ["stage", "copy", temporary_directory, "@stageName", "--recursive"]
+        + (["--resume"] if resume else [])
+    )
+
+    assert result.exit_code == 0, result.output
+    journal = mock_put_recursive.call_args.kwargs["journal"]
+    if resume:
+        assert journal is mock_journal.return_value
+    else:
+        assert journal is None
+        mock_journal.assert_not_called()
+
+
+@pytest.mark.parametrize(
+    "args", [["@stageName", "local_dir", "--recursive"], ["local_dir", "@stageName"]]
+)
+def test_copy_resume_requires_recursive_upload(runner, args):
+    result = runner.invoke(["stage", "copy", *args, "--resume"])
+
+    assert result.exit_code == 1, result.output
+    assert "Option --resume can only be used with recursive uploads." in result.output
+
+
 @mock.patch(f"{STAGE_MANAGER}.execute_query")
 def test_stage_create_enable_directory(mock_execute, runner, mock_cursor):
     mock_execute.return_value = mock_cursor(["row"], [])
@@ -1908,3 +2470,253 @@ class TestStageUploadWorkers:
         monkeypatch.setenv(STAGE_UPLOAD_WORKERS_ENV_VAR, raw)
         with pytest.raises(CliError, match="expected a positive integer"):
             _resolve_upload_workers()
+
+    @pytest.mark.parametrize("raw", ["auto", "AUTO", " auto "])
+    def test_auto_uses_default_budget(self, monkeypatch, raw):
+        monkeypatch.setenv(STAGE_UPLOAD_WORKERS_ENV_VAR, raw)
+        assert _resolve_upload_workers() == 16
+
+
+class TestAdaptiveUploadConcurrency:
+    @staticmethod
+    def _run_rounds(concurrency, clock, rounds, latency, size=1024**2):
+        for _ in range(rounds):
+            limit = concurrency.limit
+            # `limit` uploads of `latency` seconds each, all running at once.
+            clock.return_value += latency
+            for _ in range(limit):
+                concurrency.record(size, latency)
+
+    def test_grows_while_latency_stays_flat(self):
+        clock = MagicMock(return_value=0.0)
+        concurrency = AdaptiveUploadConcurrency(max_limit=8, clock=clock)
+
+        self._run_rounds(concurrency, clock, rounds=10, latency=0.5)
+
+        assert concurrency.limit == 8
+        assert concurrency.decreases == 0
+
+    def test_halves_when_uploads_only_queue(self):
+        clock = MagicMock(return_value=0.0)
+        concurrency = AdaptiveUploadConcurrency(
+            max_limit=16, initial_limit=8, clock=clock
+        )
+        self._run_rounds(concurrency, clock, rounds=1, latency=0.5)
+        assert concurrency.limit == 9
+
+        # Each PUT now takes as long as the whole round: throughput is flat.
+        clock.return_value += 9 * 0.5
+        for _ in range(9):
+            concurrency.record(1024**2, 9 * 0.5)
+
+        assert concurrency.limit == 4
+        assert concurrency.decreases == 1
+        assert concurrency.peak_limit == 9
+
+    def test_report_records_metrics(self):
+        concurrency = AdaptiveUploadConcurrency(max_limit=4)
+        concurrency.report()
+
+        metrics = get_cli_context().metrics
+        assert metrics.get_counter(CLICounterField.STAGE_UPLOAD_WORKERS_AUTO) == 1
+        # only the use of the feature is counted; the tuning is logged
+        assert [name for name in metrics.counters if "upload_workers" in name] == [
+            CLICounterField.STAGE_UPLOAD_WORKERS_AUTO
+        ]
+
+
+def test_put_recursive_auto_upload_workers(temporary_directory):
+    from snowflake.cli._plugins.stage import manager as stage_manager
+
+    src = Path(temporary_directory) / "src"
+    src.mkdir()
+    RecursiveUploadTester(str(src)).prepare(structure=NESTED_STRUCTURE)
+
+    put_mock = MagicMock(return_value=MagicMock(fetchall=MagicMock(return_value=[])))
+    captured_max_workers: list = []
+    real_executor = stage_manager.ThreadPoolExecutor
+
+    def recording_executor(*args, **kwargs):
+        captured_max_workers.append(kwargs.get("max_workers"))
+        return real_executor(*args, **kwargs)
+
+    with mock.patch.object(StageManager, "put", new=put_mock), mock.patch.object(
+        stage_manager, "ThreadPoolExecutor", side_effect=recording_executor
+    ), mock.patch.object(
+        stage_manager.AdaptiveUploadConcurrency, "report"
+    ) as report, mock.patch.dict(
+        os.environ, {STAGE_UPLOAD_WORKERS_ENV_VAR: "auto"}
+    ):
+        list(
+            StageManager().put_recursive(
+                local_path=src, stage_path="@stageName", parallel=4
+            )
+        )
+
+    assert put_mock.call_count == 7
+    assert {call.kwargs["parallel"] for call in put_mock.call_args_list} == {4}
+    assert captured_max_workers == [MAX_AUTO_UPLOAD_WORKERS // 4]
+    report.assert_called_once()
+
+
+STAGE_COMMANDS = "snowflake.cli._plugins.stage.commands"
+
+
+@pytest.mark.parametrize("prune", [True, False])
+@mock.patch(f"{STAGE_COMMANDS}.sync_local_diff_with_stage")
+@mock.patch(f"{STAGE_COMMANDS}.compute_stage_diff")
+def test_stage_sync(mock_diff, mock_sync, runner, temporary_directory, prune):
+    mock_diff.return_value = DiffResult(
+        different=[StagePathType("a.py")],
+        only_local=[StagePathType("b.py")],
+        only_on_stage=[StagePathType("c.py")],
+    )
+
+    result = runner.invoke(
+        ["stage", "sync", temporary_directory, "@stageName/app"]
+        + (["--prune"] if prune else [])
+    )
+
+    assert result.exit_code == 0, result.output
+    assert "modified: a.py" in result.output
+    assert ("deleted:  c.py" in result.output) == prune
+    assert f"Folder {temporary_directory} uploaded to @stageName/app." in result.output
+    assert mock_diff.call_args.kwargs["stage_path"].full_path == "@stageName/app"
+    diff = mock_sync.call_args.kwargs["diff_result"]
+    assert diff.only_on_stage == ([StagePathType("c.py")] if prune else [])
+    assert mock_sync.call_args.kwargs["stage_full_path"] == "@stageName/app"
+
+
+@mock.patch(f"{STAGE_COMMANDS}.sync_local_diff_with_stage")
+@mock.patch(f"{STAGE_COMMANDS}.compute_stage_diff")
+def test_stage_sync_up_to_date(mock_diff, mock_sync, runner, temporary_directory):
+    mock_diff.return_value = DiffResult(identical=1)
+
+    result = runner.invoke(["stage", "sync", temporary_directory, "@stageName"])
+
+    assert result.exit_code == 0, result.output
+    assert "Your stage is up-to-date" in result.output
+    mock_sync.assert_not_called()
+
+
+def test_stage_sync_requires_directory(runner, temporary_directory):
+    file = Path(temporary_directory) / "file.py"
+    file.touch()
+
+    result = runner.invoke(["stage", "sync", str(file), "@stageName"])
+
+    assert result.exit_code == 1
+    assert "is not a directory" in result.output
+
+
+@mock.patch(f"{STAGE_COMMANDS}.sync_changes_with_stage")
+@mock.patch(f"{STAGE_COMMANDS}.LocalChangeWatcher")
+@mock.patch(f"{STAGE_COMMANDS}.sync_local_diff_with_stage")
+@mock.patch(f"{STAGE_COMMANDS}.compute_stage_diff")
+def test_stage_sync_watch(
+    mock_diff, mock_sync, mock_watcher, mock_sync_changes, runner, temporary_directory
+):
+    mock_diff.return_value = DiffResult()
+    watcher = mock_watcher.return_value
+    watcher.wait_for_changes.side_effect = [
+        (["a.py"], ["b.py"]),
+        KeyboardInterrupt(),
+    ]
+    mock_sync_changes.return_value = DiffResult(different=[StagePathType("a.py")])
+
+    result = runner.invoke(
+        ["stage", "sync", temporary_directory, "@stageName", "--watch", "--prune"]
+    )
+
+    assert result.exit_code == 0, result.output
+    assert f"Watching {temporary_directory} for changes" in result.output
+    assert "modified: a.py" in result.output
+    assert "Stopped watching for changes." in result.output
+    mock_sync.assert_not_called()
+    mock_sync_changes.assert_called_once()
+    assert mock_sync_changes.call_args.kwargs["changed"] == ["a.py"]
+    assert mock_sync_changes.call_args.kwargs["deleted"] == ["b.py"]
+    assert mock_sync_changes.call_args.kwargs["prune"]
+    watcher.close.assert_called_once()
+
+
+@pytest.mark.parametrize("prune", [True, False])
+@mock.patch(f"{STAGE_COMMANDS}.mirror_stage_diff")
+@mock.patch(f"{STAGE_COMMANDS}.compute_stage_to_stage_diff")
+def test_stage_mirror(mock_diff, mock_mirror, runner, prune):
+    mock_diff.return_value = DiffResult(
+        identical=1,
+        different=[StagePathType("a.py")],
+        only_local=[StagePathType("b.py")],
+        only_on_stage=[StagePathType("c.py")],
+    )
+
+    result = runner.invoke(
+        ["stage", "mirror", "@dev/app", "@prod/app", "--format", "json"]
+        + (["--prune"] if prune else [])
+    )
+
+    assert result.exit_code == 0, result.output
+    assert json.loads(result.output) == [
+        {"file": "b.py", "status": "ADDED"},
+        {"file": "a.py", "status": "MODIFIED"},
+    ] + ([{"file": "c.py", "status": "DELETED"}] if prune else [])
+    assert mock_diff.call_args.kwargs["source"].full_path == "@dev/app"
+    assert mock_diff.call_args.kwargs["destination"].full_path == "@prod/app"
+    mock_mirror.assert_called_once_with(
+        diff_result=mock_diff.return_value,
+        source_full_path="@dev/app",
+        destination_full_path="@prod/app",
+    )
+
+
+@mock.patch(f"{STAGE_COMMANDS}.mirror_stage_diff")
+@mock.patch(f"{STAGE_COMMANDS}.compute_stage_to_stage_diff")
+def test_stage_mirror_up_to_date(mock_diff, mock_mirror, runner):
+    mock_diff.return_value = DiffResult(
+        identical=1, only_on_stage=[StagePathType("c.py")]
+    )
+
+    result = runner.invoke(["stage", "mirror", "@dev", "@prod"])
+
+    assert result.exit_code == 0, result.output
+    assert "1 files are already up to date." in result.output
+    mock_mirror.assert_not_called()
+
+
+@pytest.mark.parametrize(
+    "source, destination, error",
+    [
+        ("local_dir", "@prod", "Both source and destination must be stage paths."),
+        ("@dev", "@~/app", "Destination path cannot be a user stage."),
+    ],
+)
+def test_stage_mirror_invalid_paths(runner, source, destination, error):
+    result = runner.invoke(["stage", "mirror", source, destination])
+
+    assert result.exit_code == 1
+    assert error in result.output
+
+
+@mock.patch(f"{STAGE_MANAGER}.execute_query")
+def test_stage_du(mock_execute, runner, mock_cursor):
+    mock_execute.return_value = mock_cursor(
+        [
+            {"name": "stagename/a/b/file1.txt", "size": 5},
+            {"name": "stagename/a/c/file2.txt", "size": 7},
+            {"name": "stagename/d/file3.txt", "size": 20},
+            {"name": "stagename/file4.txt", "size": 1},
+        ],
+        [],
+    )
+
+    result = runner.invoke(
+        ["stage", "du", "@stageName", "--depth", "2", "--top", "2", "--format", "json"]
+    )
+
+    assert result.exit_code == 0, result.output
+    mock_execute.assert_called_once_with("ls @stageName", cursor_class=DictCursor)
+    assert json.loads(result.output) == [
+        {"prefix": "d/", "size": 20, "files": 1},
+        {"prefix": "a/c/", "size": 7, "files": 1},
+    ]
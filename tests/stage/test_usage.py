@@ -0,0 +1,67 @@
+# Copyright (c) 2024 Snowflake Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+from snowflake.cli._plugins.stage.manager import DefaultStagePathParts
+from snowflake.cli._plugins.stage.usage import (
+    StageUsage,
+    aggregate_stage_usage,
+    prefix_at_depth,
+)
+
+
+@pytest.mark.parametrize(
+    "path, depth, expected",
+    [
+        ("file.txt", 1, "/"),
+        ("a/file.txt", 0, "/"),
+        ("a/file.txt", 1, "a/"),
+        ("a/b/c/file.txt", 1, "a/"),
+        ("a/b/c/file.txt", 2, "a/b/"),
+        ("a/b/file.txt", 5, "a/b/"),
+    ],
+)
+def test_prefix_at_depth(path, depth, expected):
+    assert prefix_at_depth(path, depth) == expected
+
+
+def test_aggregate_stage_usage_streams_rows():
+    def listing():
+        for name, size in [
+            ("stage/app/README.md", 10),
+            ("stage/app/ui/a.py", 100),
+            ("stage/app/ui/pages/b.py", 200),
+            ("stage/app/lib/c.jar", 1000),
+        ]:
+            yield {"name": name, "size": size}
+
+    usage = aggregate_stage_usage(listing(), DefaultStagePathParts("db.s.stage/app"), 1)
+
+    assert (usage.files, usage.size) == (4, 1310)
+    assert usage.top(10) == [
+        {"prefix": "lib/", "size": 1000, "files": 1},
+        {"prefix": "ui/", "size": 300, "files": 2},
+        {"prefix": "/", "size": 10, "files": 1},
+    ]
+
+
+def test_stage_usage_top_limits_and_breaks_ties_by_prefix():
+    usage = StageUsage()
+    for prefix, size in [("a/", 5), ("b/", 7), ("c/", 5), ("a/", 2)]:
+        usage.add(prefix, size)
+
+    assert usage.top(2) == [
+        {"prefix": "b/", "size": 7, "files": 1},
+        {"prefix": "a/", "size": 7, "files": 2},
+    ]
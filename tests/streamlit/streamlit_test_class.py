@@ -1,7 +1,11 @@
+import os
+from pathlib import Path
 from re import match
-from typing import List
+from typing import Dict, List
 from unittest import mock
 
+from snowflake.cli._plugins.stage.manager import StageManager
+
 from tests.conftest import MockCursor
 
 STREAMLIT_NAME = "test_streamlit"
@@ -12,6 +16,8 @@ EXECUTE_QUERY = (
 
 TYPER = "snowflake.cli._plugins.streamlit.commands.typer"
 
+_LINK_OR_COPY_FILE = StageManager._link_or_copy_file  # noqa: SLF001
+
 
 class StreamlitTestClass:
     def setup_method(self):
@@ -35,7 +41,15 @@ class StreamlitTestClass:
         ).start()
 
         self.mock_put = mock.patch(
-            "snowflake.cli._plugins.stage.manager.StageManager.put"
+            "snowflake.cli._plugins.stage.manager.StageManager.put",
+            side_effect=self._record_put,
+        ).start()
+        self.put_paths: List[str] = []
+
+        self._view_sources: Dict[Path, Path] = {}
+        mock.patch(
+            "snowflake.cli._plugins.stage.manager.StageManager._link_or_copy_file",
+            side_effect=self._record_view_link,
         ).start()
 
         self.mock_get_account = mock.patch(
@@ -63,6 +77,26 @@ class StreamlitTestClass:
         }
         self.mock_describe.return_value = mock_cursor
 
+    def _record_view_link(self, src: Path, dst: Path):
+        self._view_sources[dst] = Path(os.path.abspath(src))
+        _LINK_OR_COPY_FILE(src, dst)
+
+    def _record_put(self, *args, **kwargs):
+        # Directories are uploaded with a single `<dir>/*` PUT, either of the
+        # directory itself or of a temporary view linking to the uploaded files
+        # (see StageManager.put_files), which only exists while the call is
+        # made. Like the connector's glob, skip hidden entries.
+        local_path = kwargs.get("local_path")
+        if local_path and Path(local_path).is_dir():
+            self.put_paths.extend(
+                self._view_sources.get(f, f).as_posix()
+                for f in sorted(Path(local_path).iterdir())
+                if not f.name.startswith(".")
+            )
+        elif local_path:
+            self.put_paths.append(Path(local_path).as_posix())
+        return mock.MagicMock()
+
     def teardown_method(self):
         mock.patch.stopall()
 
@@ -75,10 +109,9 @@ class StreamlitTestClass:
 
         re_local_path = f".*/{streamlit_name}/(?P<filename>.*)"
         uploaded_files = set()
-        for call in self.mock_put.call_args_list:
-            if path := call.kwargs.get("local_path"):
-                matched_path = match(re_local_path, path.as_posix())
-                if matched_path:
-                    uploaded_files.add(matched_path.group("filename"))
+        for path in self.put_paths:
+            matched_path = match(re_local_path, path)
+            if matched_path:
+                uploaded_files.add(matched_path.group("filename"))
 
         assert set(put_files) == uploaded_files, uploaded_files